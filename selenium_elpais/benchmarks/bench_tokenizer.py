@@ -0,0 +1,70 @@
+"""
+Benchmark the batched tokenizer against the original TextAnalyzer path.
+
+Usage:
+    python benchmarks/bench_tokenizer.py [--titles 100000] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import sys
+import timeit
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.tokenizer import Tokenizer
+
+WORDS = (
+    "el la de los gobierno España opinión política económica Europa futuro democracia "
+    "crisis reforma elecciones sánchez congreso justicia educación sanidad vivienda "
+    "the future of Europe's democracy: a new crisis? reform, elections & justice"
+).split()
+
+def make_titles(n, seed=42):
+    """Synthetic mixed Spanish/English titles with accents and punctuation."""
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) + rng.choice(['', '.', '?', '!']) for _ in range(n)]
+
+def original_count(texts):
+    """The tokenization TextAnalyzer used before the batched tokenizer."""
+    counts = Counter()
+    for text in texts:
+        text = text.lower()
+        text = re.sub(r'[^\w\s]', ' ', text)
+        text = ' '.join(text.split())
+        counts.update(text.split())
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tokenizer benchmark")
+    parser.add_argument('--titles', type=int, default=100000, help="Number of synthetic titles")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing repetitions (best is reported)")
+    args = parser.parse_args(argv)
+    
+    titles = make_titles(args.titles)
+    plain = Tokenizer()
+    folding = Tokenizer(fold=True)
+    assert plain.count(titles) == original_count(titles)
+    
+    cases = [
+        ('original clean_text + split', lambda: original_count(titles)),
+        ('Tokenizer.tokenize_many', lambda: Counter(t for tokens in plain.tokenize_many(titles) for t in tokens)),
+        ('Tokenizer.count', lambda: plain.count(titles)),
+        ('Tokenizer.tokenize_many (fold)', lambda: folding.tokenize_many(titles)),
+        ('Tokenizer.count (fold)', lambda: folding.count(titles)),
+    ]
+    
+    print(f"Tokenizing {len(titles):,} titles (best of {args.repeat})\n")
+    baseline = None
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(f"  {name:<30} {best * 1000:9.1f} ms  {baseline / best:5.2f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
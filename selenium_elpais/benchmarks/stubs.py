@@ -0,0 +1,131 @@
+"""Local stand-in for El País and the translation API, used by the benchmark suite."""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PNG = b'\x89PNG\r\n\x1a\n' + bytes(4096)
+
+PARAGRAPH = ("El debate sobre la reforma de la vivienda vuelve al Congreso con posiciones enfrentadas "
+             "entre el Gobierno y la oposición, mientras los precios siguen subiendo en las grandes ciudades. ")
+
+def make_listing(titles, content_in_listing=False):
+    """Opinion listing page with one <article> per title."""
+    items = []
+    for i, title in enumerate(titles):
+        summary = f'<p class="c_d">{PARAGRAPH}</p>' if content_in_listing else ''
+        items.append(
+            f'<article class="c"><h2 class="c_h"><a href="/opinion/2025-10-{i % 28 + 1:02d}/articulo-{i}.html">{title}</a></h2>'
+            f'<span class="c_a_a">Autor {i}</span><time>2025-10-{i % 28 + 1:02d}</time>{summary}'
+            f'<figure><img src="/img/{i}.png"></figure></article>'
+        )
+    return '<html><head><title>Opinión | EL PAÍS</title></head><body><main>' + ''.join(items) + '</main></body></html>'
+
+def make_article_page(index):
+    """Article page with a few body paragraphs."""
+    body = ''.join(f'<p>{PARAGRAPH} ({index}.{n})</p>' for n in range(6))
+    return f'<html><body><article><h1>Artículo {index}</h1><div class="a_c">{body}</div></article></body></html>'
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; with Nagle on, keep-alive clients stall on delayed ACKs
+    disable_nagle_algorithm = True
+    
+    def _reply(self, content_type, body):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        if self.path == '/opinion/':
+            self._reply('text/html; charset=utf-8', self.server.listing)
+        elif self.path.startswith('/opinion/'):
+            index = self.path.rsplit('-', 1)[-1].split('.')[0]
+            self._reply('text/html; charset=utf-8', make_article_page(index).encode('utf-8'))
+        elif self.path.startswith('/img/'):
+            self._reply('image/png', PNG)
+        else:
+            self.send_error(404)
+    
+    def do_POST(self):
+        texts = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['q']
+        translated = ['EN:' + t for t in texts] if isinstance(texts, list) else ['EN:' + texts]
+        self._reply('application/json', json.dumps(translated).encode('utf-8'))
+    
+    def log_message(self, format, *args):
+        pass
+
+class StubSite:
+    """Threaded local server for a synthetic Opinion section and translation endpoint.
+    
+    Every response is delayed by ``latency`` seconds to stand in for network
+    round trips, so concurrency shows up in the numbers as it would live.
+    """
+    
+    def __init__(self, titles, latency=0.0, content_in_listing=False):
+        """
+        Args:
+            titles (list): Article titles on the listing page
+            latency (float): Seconds added to every response
+            content_in_listing (bool): Put a summary paragraph in the listing so no article pages are fetched
+        """
+        self.titles = titles
+        self.latency = latency
+        self.content_in_listing = content_in_listing
+        self._httpd = None
+    
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._httpd.server_port}"
+    
+    @property
+    def listing_url(self):
+        return self.url + '/opinion/'
+    
+    @property
+    def translate_url(self):
+        return self.url + '/translate'
+    
+    def start(self):
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.latency = self.latency
+        self._httpd.listing = make_listing(self.titles, self.content_in_listing).encode('utf-8')
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+    
+    def close(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+def make_articles(titles, seed=7):
+    """Fully processed article records, shaped like the ones written by main.py."""
+    rng = random.Random(seed)
+    return [
+        {
+            'index': i,
+            'title': title,
+            'content': PARAGRAPH * rng.randint(1, 3),
+            'author': f'Autor {i}',
+            'date': '2025-10-17',
+            'url': f'https://elpais.com/opinion/2025-10-17/articulo-{i}.html',
+            'image_url': f'https://imagenes.elpais.com/{i}.jpg',
+            'image_path': f'output/images/article_{i}.jpg',
+            'title_english': 'EN:' + title,
+        }
+        for i, title in enumerate(titles, 1)
+    ]
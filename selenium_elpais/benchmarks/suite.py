@@ -0,0 +1,357 @@
+"""
+Benchmark suite for the scraping, translation, analysis and export hot paths.
+
+Everything runs against local stub servers (or a recorded fixture archive),
+so numbers are repeatable. Results are written as JSON and can be kept as a
+baseline that later runs are compared against.
+
+Usage:
+    python benchmarks/suite.py run [--quick] [--only scrape,translate,analysis,export]
+                                   [--browser chrome] [--fixtures DIR] [--output PATH]
+                                   [--baseline PATH [--update-baseline]] [--tolerance 0.2]
+    python benchmarks/suite.py compare BASELINE CURRENT [--tolerance 0.2]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+import main as app
+from utils import ElPaisScraper, HttpScraper, RapidTranslator, AsyncRapidTranslator, TextAnalyzer
+from utils.async_translator import AdaptiveRateLimiter
+from utils.fixtures import FixtureArchive, FixtureServer
+
+from bench_tokenizer import make_titles
+from stubs import StubSite, make_articles
+
+# Bump when the results layout changes
+RESULTS_VERSION = 1
+
+GROUPS = ('scrape', 'translate', 'analysis', 'export')
+
+# Workload sizes per profile
+SIZES = {
+    'quick': {'articles': 20, 'selenium_articles': 5, 'titles': 20, 'corpora': (1000, 10000), 'export': 1000, 'repeat': 3},
+    'full': {'articles': 100, 'selenium_articles': 10, 'titles': 100, 'corpora': (1000, 10000, 100000), 'export': 10000, 'repeat': 5},
+}
+
+@contextmanager
+def overridden(**values):
+    """Temporarily set config attributes."""
+    previous = {name: getattr(config, name) for name in values}
+    for name, value in values.items():
+        setattr(config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(config, name, value)
+
+def measure(fn, items, repeat, unit, setup=None, **params):
+    """
+    Best-of-repeat throughput of a workload.
+    
+    Args:
+        fn (callable): Workload; receives the value returned by ``setup`` if one is given
+        items (int): Items processed per call, e.g. articles
+        repeat (int): Timed calls; the fastest counts
+        unit (str): Throughput unit, e.g. 'articles/s'
+        setup (callable): Untimed preparation run before every call
+        **params: Workload parameters recorded with the result
+    
+    Returns:
+        dict: Result with 'value', 'unit', 'higher_is_better', 'seconds' and 'params'
+    """
+    best = None
+    for _ in range(repeat):
+        state = setup() if setup else None
+        with redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            fn(state) if setup else fn()
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        'value': round(items / best, 2),
+        'unit': unit,
+        'higher_is_better': True,
+        'seconds': round(best, 4),
+        'params': dict(params, items=items, repeat=repeat),
+    }
+
+def bench_scrape(sizes, latency, browser=None, fixtures=None):
+    """Articles per second for the HTTP engine and, with a browser, the Selenium 'js' and 'python' engines."""
+    results = {}
+    titles = make_titles(sizes['articles'], seed=1)
+    site = StubSite(titles, latency=latency).start() if fixtures is None else None
+    server = FixtureServer(FixtureArchive(fixtures), mode='replay', port=0).start() if fixtures else None
+    listing_url = site.listing_url if site else server.local_url(config.ELPAIS_OPINION_URL)
+    count = sizes['articles'] if site else config.MAX_ARTICLES
+    source = 'stub' if site else 'fixtures'
+    try:
+        with overridden(ELPAIS_OPINION_URL=listing_url):
+            scraper = HttpScraper()
+            scraper.setup_driver()
+            try:
+                def scrape_http():
+                    scraper.navigate_to_opinion_section()
+                    list(scraper.iter_articles(count))
+                results['scrape.http'] = measure(scrape_http, count, sizes['repeat'], 'articles/s',
+                                                 source=source, latency=latency)
+            finally:
+                scraper.close()
+            
+            if browser:
+                count = min(count, sizes['selenium_articles'])
+                for engine in ('js', 'python'):
+                    with overridden(EXTRACTION_ENGINE=engine, FULL_ARTICLE_WORKERS=1):
+                        scraper = ElPaisScraper(browser=browser, headless=True)
+                        try:
+                            scraper.setup_driver()
+                        except Exception as e:
+                            print(f"\u26a0 Skipping Selenium benchmarks, {browser} did not start: {str(e).strip().splitlines()[0]}")
+                            break
+                        try:
+                            def scrape_selenium():
+                                scraper.navigate_to_opinion_section()
+                                list(scraper.iter_articles(count))
+                            results['scrape.selenium_' + engine] = measure(
+                                scrape_selenium, count, sizes['repeat'], 'articles/s',
+                                source=source, latency=latency, browser=browser
+                            )
+                        finally:
+                            with redirect_stdout(io.StringIO()):
+                                scraper.close()
+    finally:
+        if site:
+            site.close()
+        if server:
+            server.close()
+    return results
+
+def bench_translate(sizes, latency):
+    """Titles per second for the per-item, batched and async translation clients, without the cache."""
+    results = {}
+    count = sizes['titles']
+    runs = iter(range(1, 1000))
+    
+    def fresh_articles():
+        # New titles every call so nothing is answered from memory
+        run = next(runs)
+        return [{'index': i, 'title': f"{title} ({run})"} for i, title in enumerate(make_titles(count, seed=run), 1)]
+    
+    with StubSite([], latency=latency) as site, overridden(RAPID_TRANSLATE_API_URL=site.translate_url,
+                                                           TRANSLATION_CACHE_ENABLED=False, TRANSLATE_BATCH_DELAY=0):
+        sync = RapidTranslator()
+        results['translate.sync'] = measure(
+            lambda articles: [sync.translate_article(a) for a in articles], count, sizes['repeat'], 'titles/s',
+            setup=fresh_articles, latency=latency
+        )
+        results['translate.batch'] = measure(
+            lambda articles: sync.translate_articles(articles, batch=True), count, sizes['repeat'], 'titles/s',
+            setup=fresh_articles, latency=latency, batch_size=config.TRANSLATE_BATCH_SIZE
+        )
+        # The rate limiter is opened up so the client's own concurrency is what gets measured
+        async_client = AsyncRapidTranslator(rate_limiter=AdaptiveRateLimiter(rate=1e6))
+        results['translate.async'] = measure(
+            lambda articles: async_client.translate_articles(articles), count, sizes['repeat'], 'titles/s',
+            setup=fresh_articles, latency=latency, concurrency=async_client.concurrency
+        )
+        async_client.close()
+    return results
+
+def bench_analysis(sizes):
+    """TextAnalyzer.analyze_articles throughput on synthetic corpora of increasing size."""
+    results = {}
+    for size in sizes['corpora']:
+        articles = [{'title_english': title} for title in make_titles(size, seed=size)]
+        results[f'analysis.batch_{size}'] = measure(
+            lambda: TextAnalyzer.analyze_articles(articles), size, sizes['repeat'], 'titles/s', corpus=size
+        )
+    return results
+
+def bench_export(sizes):
+    """save_results_json / save_results_csv throughput."""
+    count = sizes['export']
+    articles = make_articles(make_titles(count, seed=3))
+    analysis = {'word_frequency': {'future': 12, 'europe': 9}, 'total_articles': count, 'total_words_analyzed': 10 * count}
+    with tempfile.TemporaryDirectory() as tmp, overridden(RESULTS_DIR=Path(tmp)):
+        return {
+            'export.json': measure(lambda: app.save_results_json(articles, analysis, 'bench.json'),
+                                   count, sizes['repeat'], 'articles/s'),
+            'export.csv': measure(lambda: app.save_results_csv(articles, 'bench.csv'),
+                                  count, sizes['repeat'], 'articles/s'),
+        }
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def run_suite(groups=GROUPS, profile='full', latency=0.005, browser=None, fixtures=None, sizes=None):
+    """
+    Run benchmark groups.
+    
+    Args:
+        groups (iterable): Any of 'scrape', 'translate', 'analysis', 'export'
+        profile (str): 'quick' or 'full' workload sizes
+        latency (float): Seconds of simulated network latency per stub response
+        browser (str): Also benchmark the Selenium engines with this browser
+        fixtures (str): Scrape a recorded fixture archive instead of the stub site
+        sizes (dict): Workload sizes overriding the profile's
+    
+    Returns:
+        dict: Results document with environment metadata and one entry per benchmark
+    """
+    sizes = dict(SIZES[profile], **(sizes or {}))
+    results = {}
+    for group in groups:
+        print(f"Running {group} benchmarks...")
+        if group == 'scrape':
+            results.update(bench_scrape(sizes, latency, browser, fixtures))
+        elif group == 'translate':
+            results.update(bench_translate(sizes, latency))
+        elif group == 'analysis':
+            results.update(bench_analysis(sizes))
+        elif group == 'export':
+            results.update(bench_export(sizes))
+        else:
+            raise ValueError("Unknown benchmark group: " + group)
+    return {
+        'version': RESULTS_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'profile': profile,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'revision': _git_revision(),
+        },
+        'results': results,
+    }
+
+def compare(baseline, current, tolerance=0.2):
+    """
+    Compare two results documents.
+    
+    Args:
+        baseline (dict): Reference results
+        current (dict): New results
+        tolerance (float): Relative slowdown allowed before a benchmark counts as a regression
+    
+    Returns:
+        list: (name, baseline value, current value, relative change, status) rows, where status is
+            'ok', 'regression', 'improved', 'new' or 'missing'
+    """
+    rows = []
+    base_results, current_results = baseline['results'], current['results']
+    for name in sorted(set(base_results) | set(current_results)):
+        base, cur = base_results.get(name), current_results.get(name)
+        if base is None or cur is None:
+            rows.append((name, base and base['value'], cur and cur['value'], None, 'new' if base is None else 'missing'))
+            continue
+        change = (cur['value'] - base['value']) / base['value'] if base['value'] else 0.0
+        if not cur.get('higher_is_better', True):
+            change = -change
+        status = 'regression' if change < -tolerance else 'improved' if change > tolerance else 'ok'
+        rows.append((name, base['value'], cur['value'], change, status))
+    return rows
+
+def print_results(document):
+    print(f"\n{'Benchmark':<28} {'Throughput':>14}  Unit")
+    for name, result in sorted(document['results'].items()):
+        print(f"{name:<28} {result['value']:>14,.2f}  {result['unit']}")
+    print()
+
+def print_comparison(rows, baseline, current):
+    if baseline.get('environment') != current.get('environment'):
+        base_env, cur_env = baseline.get('environment', {}), current.get('environment', {})
+        if (base_env.get('platform'), base_env.get('cpus')) != (cur_env.get('platform'), cur_env.get('cpus')):
+            print("\u26a0 Baseline was recorded on a different machine; differences may not be regressions")
+    print(f"\n{'Benchmark':<28} {'Baseline':>12} {'Current':>12} {'Change':>8}  Status")
+    for name, base, cur, change, status in rows:
+        base_text = f"{base:,.2f}" if base is not None else '-'
+        cur_text = f"{cur:,.2f}" if cur is not None else '-'
+        change_text = f"{change:+.1%}" if change is not None else '-'
+        marker = "\u2717 " if status == 'regression' else "\u2713 " if status == 'improved' else ''
+        print(f"{name:<28} {base_text:>12} {cur_text:>12} {change_text:>8}  {marker}{status}")
+    regressions = sum(1 for row in rows if row[4] == 'regression')
+    print(f"\n{regressions} regression(s) in {len(rows)} benchmark(s)\n")
+    return regressions
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        document = json.load(f)
+    if document.get('version') != RESULTS_VERSION:
+        raise ValueError(f"{path} is not a version {RESULTS_VERSION} benchmark results file")
+    return document
+
+def write(document, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.part')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+def parse_args(argv=None):
+    def csv_list(value):
+        return [v.strip() for v in value.split(',') if v.strip()]
+    
+    parser = argparse.ArgumentParser(description="Benchmark scraping, translation, analysis and export.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run = commands.add_parser('run', help="run the suite and write a results file")
+    run.add_argument('--quick', action='store_true', help="smaller workloads and fewer repetitions")
+    run.add_argument('--only', type=csv_list, default=list(GROUPS),
+                     help="comma-separated groups to run (default: %s)" % ','.join(GROUPS))
+    run.add_argument('--latency', type=float, default=5.0, help="simulated network latency per response in ms (default: 5)")
+    run.add_argument('--browser', default=None, help="also benchmark the Selenium engines with this browser")
+    run.add_argument('--fixtures', type=Path, default=None, help="scrape this recorded fixture archive instead of the stub site")
+    run.add_argument('--output', type=Path, default=None,
+                     help="results file (default: output/results/benchmarks/bench_<timestamp>.json)")
+    run.add_argument('--baseline', type=Path, default=None, help="compare against this results file")
+    run.add_argument('--update-baseline', action='store_true', help="write the results to --baseline instead of comparing")
+    run.add_argument('--tolerance', type=float, default=0.2, help="allowed relative slowdown (default: 0.2)")
+    
+    diff = commands.add_parser('compare', help="compare two results files")
+    diff.add_argument('baseline', type=Path)
+    diff.add_argument('current', type=Path)
+    diff.add_argument('--tolerance', type=float, default=0.2, help="allowed relative slowdown (default: 0.2)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'compare':
+        baseline, current = load(args.baseline), load(args.current)
+        return 1 if print_comparison(compare(baseline, current, args.tolerance), baseline, current) else 0
+    
+    document = run_suite(args.only, 'quick' if args.quick else 'full', args.latency / 1000, args.browser, args.fixtures)
+    print_results(document)
+    output = args.output or config.RESULTS_DIR / 'benchmarks' / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    print(f"\u2713 Results saved to: {write(document, output)}")
+    
+    if args.baseline and (args.update_baseline or not args.baseline.exists()):
+        print(f"\u2713 Baseline saved to: {write(document, args.baseline)}")
+    elif args.baseline:
+        baseline = load(args.baseline)
+        return 1 if print_comparison(compare(baseline, document, args.tolerance), baseline, document) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
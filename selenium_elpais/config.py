@@ -2,6 +2,7 @@
 
 import os
 from pathlib import Path
+from urllib.parse import urljoin
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,12 +16,46 @@ RAPID_TRANSLATE_API_KEY = os.getenv('RAPID_TRANSLATE_API_KEY')
 RAPID_TRANSLATE_API_HOST = os.getenv('RAPID_TRANSLATE_API_HOST')
 RAPID_TRANSLATE_API_URL = os.getenv('RAPID_TRANSLATE_API_URL')
 
+# Translation batching: pack many texts into one request, bounded by item count and payload size
+TRANSLATE_BATCH_MODE = os.getenv('TRANSLATE_BATCH_MODE', 'true').lower() in ('1', 'true', 'yes')
+TRANSLATE_BATCH_SIZE = int(os.getenv('TRANSLATE_BATCH_SIZE', 25))
+TRANSLATE_MAX_PAYLOAD_BYTES = int(os.getenv('TRANSLATE_MAX_PAYLOAD_BYTES', 5000))
+TRANSLATE_BATCH_DELAY = float(os.getenv('TRANSLATE_BATCH_DELAY', 0.5))
+TRANSLATE_CONTENT_SNIPPET = 300
+
+# Translation client: 'sync' (RapidTranslator) or 'async' (AsyncRapidTranslator)
+TRANSLATOR_MODE = os.getenv('TRANSLATOR_MODE', 'sync').lower()
+TRANSLATE_CONCURRENCY = int(os.getenv('TRANSLATE_CONCURRENCY', 4))
+TRANSLATE_RATE_LIMIT = float(os.getenv('TRANSLATE_RATE_LIMIT', 5))
+TRANSLATE_MAX_RETRIES = int(os.getenv('TRANSLATE_MAX_RETRIES', 4))
+TRANSLATE_BACKOFF_BASE = 0.5
+TRANSLATE_BACKOFF_MAX = 30
+
+# Persistent translation memory (SQLite) with an in-process LRU in front
+TRANSLATION_CACHE_ENABLED = os.getenv('TRANSLATION_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+TRANSLATION_CACHE_PATH = PROJECT_ROOT / os.getenv('TRANSLATION_CACHE_PATH', 'output/cache/translations.sqlite')
+TRANSLATION_CACHE_TTL = int(os.getenv('TRANSLATION_CACHE_TTL', 30 * 24 * 3600))
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv('TRANSLATION_CACHE_MAX_ENTRIES', 100000))
+TRANSLATION_MEMORY_SIZE = int(os.getenv('TRANSLATION_MEMORY_SIZE', 2048))
+
 # BrowserStack Configuration
 BROWSERSTACK_USERNAME = os.getenv('BROWSERSTACK_USERNAME')
 BROWSERSTACK_ACCESS_KEY = os.getenv('BROWSERSTACK_ACCESS_KEY')
 
+# Remote WebDriver endpoint for the matrix runner: BrowserStack, a local Selenium Grid or a standalone container
+SELENIUM_REMOTE_URL = os.getenv('SELENIUM_REMOTE_URL') or 'https://hub-cloud.browserstack.com/wd/hub'
+REMOTE_PARALLELISM = int(os.getenv('REMOTE_PARALLELISM', 5))
+
 # El País Website
 ELPAIS_OPINION_URL = os.getenv('ELPAIS_OPINION_URL', 'https://elpais.com/opinion/')
+ELPAIS_BASE_URL = os.getenv('ELPAIS_BASE_URL') or urljoin(ELPAIS_OPINION_URL, '/')
+
+# Multi-section crawl: comma-separated section names or listing URLs (empty for the single Opinion listing)
+CRAWL_SECTIONS = [s.strip() for s in os.getenv('CRAWL_SECTIONS', '').split(',') if s.strip()]
+CRAWL_MAX_DEPTH = int(os.getenv('CRAWL_MAX_DEPTH', 1))
+CRAWL_MAX_ARTICLES = int(os.getenv('CRAWL_MAX_ARTICLES', 100))
+CRAWL_TIME_BUDGET = float(os.getenv('CRAWL_TIME_BUDGET', 0))
+CRAWL_HOST_DELAY = float(os.getenv('CRAWL_HOST_DELAY', 0.5))
 
 # Output Configuration
 OUTPUT_DIR = PROJECT_ROOT / os.getenv('OUTPUT_DIR', 'output')
@@ -28,15 +63,122 @@ IMAGES_DIR = PROJECT_ROOT / os.getenv('IMAGES_DIR', 'output/images')
 RESULTS_DIR = PROJECT_ROOT / os.getenv('RESULTS_DIR', 'output/results')
 MAX_ARTICLES = int(os.getenv('MAX_ARTICLES', 5))
 
+# Result sinks, comma-separated: 'store' (append-only JSONL history), 'json', 'csv' (per-run files)
+RESULTS_SINKS = [s.strip() for s in os.getenv('RESULTS_SINKS', 'json,csv,store').lower().split(',') if s.strip()]
+RESULTS_STORE_DIR = PROJECT_ROOT / os.getenv('RESULTS_STORE_DIR', 'output/results/store')
+RESULTS_SEGMENT_MAX_BYTES = int(os.getenv('RESULTS_SEGMENT_MAX_BYTES', 64 * 1024 * 1024))
+RESULTS_SEGMENT_MAX_RECORDS = int(os.getenv('RESULTS_SEGMENT_MAX_RECORDS', 50000))
+
 # Create output directories if they don't exist
 IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Scraping backend: 'http' (requests + lxml, browser only as fallback) or 'selenium'
+SCRAPER_BACKEND = os.getenv('SCRAPER_BACKEND', 'http').lower()
+
+# HTTP Configuration
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 10))
+HTTP_WORKERS = int(os.getenv('HTTP_WORKERS', 8))
+HTTP_TIMEOUT = 15
+HTTP_USER_AGENT = os.getenv(
+    'HTTP_USER_AGENT',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+)
+
+# Image download concurrency and minimum spacing (seconds) between requests to the same host
+IMAGE_DOWNLOAD_WORKERS = int(os.getenv('IMAGE_DOWNLOAD_WORKERS', 8))
+IMAGE_HOST_INTERVAL = float(os.getenv('IMAGE_HOST_INTERVAL', 0.1))
+
+# On-disk image cache (content-addressed, LRU-evicted above the size cap)
+IMAGE_CACHE_ENABLED = os.getenv('IMAGE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+IMAGE_CACHE_DIR = PROJECT_ROOT / os.getenv('IMAGE_CACHE_DIR', 'output/cache/images')
+IMAGE_CACHE_MAX_BYTES = int(os.getenv('IMAGE_CACHE_MAX_BYTES', 500 * 1024 * 1024))
+
+# Streaming pipeline: bounded queue size between stages and workers per stage
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 16))
+PIPELINE_IMAGE_WORKERS = int(os.getenv('PIPELINE_IMAGE_WORKERS', 4))
+PIPELINE_TRANSLATE_WORKERS = int(os.getenv('PIPELINE_TRANSLATE_WORKERS', 2))
+# The translate stage collects up to TRANSLATE_BATCH_SIZE articles, waiting at most this many
+# seconds after the first, so batch mode still packs titles into few requests while streaming
+PIPELINE_BATCH_WAIT = float(os.getenv('PIPELINE_BATCH_WAIT', 0.25))
+
+# Seen-URL index for incremental runs (unchanged articles skip fetch, download and translation)
+ARTICLE_INDEX_ENABLED = os.getenv('ARTICLE_INDEX_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+ARTICLE_INDEX_PATH = PROJECT_ROOT / os.getenv('ARTICLE_INDEX_PATH', 'output/cache/articles.sqlite')
+
+# Near-duplicate detection (MinHash/LSH over title and content shingles)
+DEDUPE_ENABLED = os.getenv('DEDUPE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+DEDUPE_INDEX_PATH = PROJECT_ROOT / os.getenv('DEDUPE_INDEX_PATH', 'output/cache/dedupe.sqlite')
+DEDUPE_THRESHOLD = float(os.getenv('DEDUPE_THRESHOLD', 0.8))
+DEDUPE_NUM_PERM = int(os.getenv('DEDUPE_NUM_PERM', 64))
+DEDUPE_BANDS = int(os.getenv('DEDUPE_BANDS', 16))
+DEDUPE_MAX_AGE_DAYS = float(os.getenv('DEDUPE_MAX_AGE_DAYS', 30))
+
+# Cross-run corpus counters for trending-term analysis (empty to disable)
+CORPUS_HISTORY_PATH = os.getenv('CORPUS_HISTORY_PATH', 'output/cache/corpus_history.json')
+CORPUS_HISTORY_PATH = PROJECT_ROOT / CORPUS_HISTORY_PATH if CORPUS_HISTORY_PATH else None
+
+# Word frequency counting: 'exact' (Counter) or 'approximate' (bounded-memory heavy hitters)
+WORD_COUNT_MODE = os.getenv('WORD_COUNT_MODE', 'exact').lower()
+# Approximate counts are at most this fraction of all words too high; memory grows with 1 / epsilon
+WORD_COUNT_EPSILON = float(os.getenv('WORD_COUNT_EPSILON', 0.001))
+
+# Record-and-replay fixtures: 'record' captures El País pages, images and translation responses
+# into FIXTURE_DIR through a local server, 'replay' serves them back without network access
+FIXTURE_MODE = os.getenv('FIXTURE_MODE', '').lower()
+FIXTURE_DIR = PROJECT_ROOT / os.getenv('FIXTURE_DIR', 'fixtures/default')
+FIXTURE_PORT = int(os.getenv('FIXTURE_PORT', 0))
+
+# Adaptive selector ordering: candidates are tried by recent hit rate, and selectors that
+# missed SELECTOR_SKIP_AFTER times in a row are skipped except on every SELECTOR_REPROBE_EVERY-th use
+SELECTOR_STATS_ENABLED = os.getenv('SELECTOR_STATS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+SELECTOR_STATS_PATH = PROJECT_ROOT / os.getenv('SELECTOR_STATS_PATH', 'output/cache/selector_stats.json')
+SELECTOR_STATS_DECAY = float(os.getenv('SELECTOR_STATS_DECAY', 0.98))
+SELECTOR_SKIP_AFTER = int(os.getenv('SELECTOR_SKIP_AFTER', 25))
+SELECTOR_REPROBE_EVERY = int(os.getenv('SELECTOR_REPROBE_EVERY', 50))
+
+# Per-phase timers and selector hit/miss counters written at the end of a run
+# ('.json' for JSON, anything else for Prometheus text; empty to disable)
+METRICS_PATH = os.getenv('METRICS_PATH', 'output/results/metrics.prom')
+METRICS_PATH = PROJECT_ROOT / METRICS_PATH if METRICS_PATH else None
+
 # Selenium Configuration
-IMPLICIT_WAIT = 10
+# Implicit waits make every failed selector probe block; readiness is handled by explicit waits instead
+IMPLICIT_WAIT = int(os.getenv('IMPLICIT_WAIT', 0))
 EXPLICIT_WAIT = 15
 PAGE_LOAD_TIMEOUT = 30
 
+# Per-phase deadline budgets (seconds) for explicit readiness waits
+WAIT_BUDGETS = {
+    'listing': float(os.getenv('WAIT_LISTING_SECONDS', 15)),
+    'article': float(os.getenv('WAIT_ARTICLE_SECONDS', 10)),
+    'consent': float(os.getenv('WAIT_CONSENT_SECONDS', 5)),
+}
+
+# Full-article fetching: more than 1 worker fans article pages out over a pool of headless sessions
+FULL_ARTICLE_WORKERS = int(os.getenv('FULL_ARTICLE_WORKERS', 1))
+SESSION_RECYCLE_AFTER = int(os.getenv('SESSION_RECYCLE_AFTER', 50))
+
+# Driver binaries: an explicit path skips resolution; otherwise the path webdriver_manager found is
+# cached for DRIVER_CACHE_TTL seconds and reused, also past the TTL when resolution fails offline
+DRIVER_PATHS = {
+    'chrome': os.getenv('CHROMEDRIVER_PATH', ''),
+    'firefox': os.getenv('GECKODRIVER_PATH', ''),
+}
+DRIVER_CACHE_PATH = PROJECT_ROOT / os.getenv('DRIVER_CACHE_PATH', 'output/cache/drivers.json')
+DRIVER_CACHE_TTL = int(os.getenv('DRIVER_CACHE_TTL', 7 * 24 * 3600))
+
+# Warm browser pool: scraper runs within one process borrow an idle browser, reset its cookies
+# and storage and hand it back instead of quitting; WARM_POOL_SIZE idle browsers are kept per
+# browser/mode and each is replaced after WARM_POOL_MAX_USES runs. Browsers never outlive the
+# process, so the single-run CLI only uses the pool to pre-launch its browser
+WARM_POOL_ENABLED = os.getenv('WARM_POOL_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+WARM_POOL_SIZE = int(os.getenv('WARM_POOL_SIZE', 2))
+WARM_POOL_MAX_USES = int(os.getenv('WARM_POOL_MAX_USES', 20))
+
+# Article field extraction engine: 'js' (single execute_script round trip) or 'python' (per-element)
+EXTRACTION_ENGINE = os.getenv('EXTRACTION_ENGINE', 'js').lower()
+
 def validate_config():
     """Validate that all required configuration is present."""
     errors = []
@@ -2,8 +2,7 @@
 """Main script for El País Opinion section scraping and analysis."""
 
 import sys
-import json
-import csv
+import argparse
 from datetime import datetime
 from pathlib import Path
 
@@ -11,21 +10,31 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 import config
-from utils import ElPaisScraper, RapidTranslator, TextAnalyzer
+from utils import ElPaisScraper, HttpScraper, RapidTranslator, AsyncRapidTranslator
+from utils.analyzer import IncrementalAnalyzer
+from utils.article_index import ArticleIndex
+from utils.dedupe import NearDuplicateIndex
+from utils.fixtures import FixtureArchive, FixtureServer
+from utils.crawler import CrawlScheduler
+from utils.metrics import metrics
+from utils.selector_stats import SelectorStats
+from utils.warm_pool import warm_pool
+from utils.results_store import ResultsStore
+from utils.writers import StreamingJSONWriter, StreamingCSVWriter
+from utils.pipeline import Pipeline, Stage
 
 def save_results_json(articles, analysis, filename='results.json'):
     """Save results to JSON file."""
     output_path = config.RESULTS_DIR / filename
     
-    results = {
-        'timestamp': datetime.now().isoformat(),
-        'total_articles': len(articles),
-        'articles': articles,
-        'analysis': analysis
-    }
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    writer = StreamingJSONWriter(output_path)
+    try:
+        for article in articles:
+            writer.write_article(article)
+        writer.finish(analysis)
+    except BaseException:
+        writer.abort()
+        raise
     
     print(f"\u2713 Results saved to JSON: {output_path}")
 
@@ -37,75 +46,215 @@ def save_results_csv(articles, filename='results.csv'):
         print("\u2717 No articles to save to CSV")
         return
     
-    fieldnames = ['index', 'title', 'title_english', 'author', 'date', 'content', 'url', 'image_url', 'image_path']
-    
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        
+    writer = StreamingCSVWriter(output_path)
+    try:
         for article in articles:
-            row = {k: article.get(k, '') for k in fieldnames}
-            writer.writerow(row)
+            writer.write_article(article)
+        writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
     
     print(f"\u2713 Results saved to CSV: {output_path}")
 
-def print_summary(articles, analysis):
+def new_totals():
+    """Counters for the execution summary, updated as articles leave the pipeline."""
+    return {'articles': 0, 'unchanged': 0, 'images': 0, 'translated': 0}
+
+def count_article(totals, article):
+    """Add one finished article to the summary counters."""
+    totals['articles'] += 1
+    totals['unchanged'] += bool(article.get('unchanged'))
+    totals['images'] += bool(article.get('image_path'))
+    totals['translated'] += bool(article.get('title_english'))
+
+def print_summary(totals, analysis):
     """Print execution summary."""
     print(f"\n{'='*60}")
     print("EXECUTION SUMMARY")
     print(f"{'='*60}\n")
     
-    print(f"Total Articles Scraped: {len(articles)}")
-    print(f"Images Downloaded: {sum(1 for a in articles if a.get('image_path'))}")
-    print(f"Titles Translated: {sum(1 for a in articles if a.get('title_english'))}")
+    print(f"Total Articles Scraped: {totals['articles']}")
+    print(f"Unchanged Since Last Run: {totals['unchanged']}")
+    print(f"Images Downloaded: {totals['images']}")
+    print(f"Titles Translated: {totals['translated']}")
     print(f"Words Analyzed: {analysis.get('total_words_analyzed', 0)}")
     print(f"Repeated Words (>2 times): {len(analysis.get('word_frequency', {}))}")
     print()
+    
+    slowest = metrics.slowest(5)
+    if slowest:
+        print("Slowest Phases (total time):")
+        for name, labels, total, count, longest in slowest:
+            label = name + ''.join(f" [{v}]" for v in labels.values())
+            print(f"  - {label}: {total:.2f}s over {count} call(s), max {longest:.2f}s")
+        miss_rates = metrics.selector_miss_rates()
+        if miss_rates:
+            print("Selector Miss Rate: " + ', '.join(f"{field} {rate:.0%}" for field, rate in miss_rates.items()))
+        print()
     print(f"Output Directory: {config.OUTPUT_DIR}")
     print(f"  - Images: {config.IMAGES_DIR}")
     print(f"  - Results: {config.RESULTS_DIR}")
     print()
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Scrape, translate and analyze El País Opinion articles.")
+    parser.add_argument('--full', action='store_true',
+                        help="ignore the article index and reprocess every article")
+    parser.add_argument('--sections', type=lambda v: [s.strip() for s in v.split(',') if s.strip()],
+                        default=config.CRAWL_SECTIONS,
+                        help="crawl these comma-separated sections or listing URLs instead of the Opinion listing")
+    parser.add_argument('--fixtures', choices=('record', 'replay'), default=config.FIXTURE_MODE or None,
+                        help="record live traffic into the fixture archive, or replay it without network access")
+    parser.add_argument('--fixture-dir', type=Path, default=config.FIXTURE_DIR,
+                        help="fixture archive directory (default: %(default)s)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main execution function."""
+    args = parse_args(argv)
+    
     print("\n" + "="*60)
     print("EL PAÍS OPINION SECTION SCRAPER")
     print("Technical Assignment: Selenium + API Integration")
     print("="*60)
     
+    fixture_server = None
+    store = None
+    translator = None
+    writers = {}
     try:
         config.validate_config()
         print("\u2713 Configuration validated\n")
         
+        if args.fixtures:
+            fixture_server = FixtureServer(FixtureArchive(args.fixture_dir), mode=args.fixtures).start()
+            fixture_server.redirect_config()
+            print(f"\u2713 Fixture {args.fixtures} server at {fixture_server.url} (archive: {args.fixture_dir})")
+        
         browser_choice = 'firefox'
         
-        print(f"\nUsing browser: {browser_choice.upper()}\n")
-        with ElPaisScraper(browser=browser_choice, headless=True) as scraper:
-            scraper.navigate_to_opinion_section()
-            articles = scraper.scrape_articles(max_articles=config.MAX_ARTICLES)
+        scraper_class = ElPaisScraper if config.SCRAPER_BACKEND == 'selenium' else HttpScraper
+        if scraper_class is ElPaisScraper:
+            # Boot the browser while the indexes and caches below are opened; this process makes
+            # a single run, so the browser is quit afterwards rather than reset for reuse
+            warm_pool.prelaunch(browser_choice)
+            warm_pool.drain()
+        
+        print(f"\nUsing backend: {config.SCRAPER_BACKEND.upper()} (browser: {browser_choice.upper()})\n")
+        translator = AsyncRapidTranslator() if config.TRANSLATOR_MODE == 'async' else RapidTranslator()
+        analyzer = IncrementalAnalyzer(
+            min_count=3,
+            history_path=config.CORPUS_HISTORY_PATH,
+            approximate=config.WORD_COUNT_MODE == 'approximate',
+            epsilon=config.WORD_COUNT_EPSILON
+        )
+        article_index = ArticleIndex(full_refresh=args.full) if config.ARTICLE_INDEX_ENABLED else None
+        dedupe_index = NearDuplicateIndex() if config.DEDUPE_ENABLED else None
+        selector_stats = SelectorStats(config.SELECTOR_STATS_PATH) if config.SELECTOR_STATS_ENABLED else None
+        store = ResultsStore() if 'store' in config.RESULTS_SINKS else None
+        run_started = datetime.now()
+        run_ts = run_started.isoformat()
+        timestamp = run_started.strftime('%Y%m%d_%H%M%S')
+        totals = new_totals()
+        
+        # Per-run files are written record by record as articles leave the pipeline; they are
+        # opened with the first article, so a run that finds nothing leaves no files behind
+        def open_writers():
+            if 'json' in config.RESULTS_SINKS:
+                writers['json'] = StreamingJSONWriter(config.RESULTS_DIR / f'elpais_results_{timestamp}.json',
+                                                      timestamp=run_ts)
+            if 'csv' in config.RESULTS_SINKS:
+                writers['csv'] = StreamingCSVWriter(config.RESULTS_DIR / f'elpais_results_{timestamp}.csv')
+        
+        def sink(article):
+            if fixture_server:
+                fixture_server.restore_urls(article)
+            if article_index:
+                article_index.record(article)
+            if store:
+                store.append(article, run_ts)
+            if not writers and not totals['articles']:
+                open_writers()
+            for writer in writers.values():
+                writer.write_article(article)
+            # Articles are printed and counted as they finish, not kept for the end of the run
+            count_article(totals, article)
+            scraper.print_article(article)
+            translator.print_translated_title(article)
+        
+        with scraper_class(browser=browser_choice, headless=True, article_index=article_index,
+                           dedupe_index=dedupe_index, selector_stats=selector_stats) as scraper:
+            crawler = None
+            if args.sections:
+                crawler = CrawlScheduler(scraper, seeds=args.sections)
+                source = crawler.crawl()
+            else:
+                scraper.navigate_to_opinion_section()
+                source = scraper.iter_articles(max_articles=config.MAX_ARTICLES)
+            downloader = scraper.create_image_downloader()
             
-            if not articles:
+            # Each article flows scrape -> image -> translate -> analyze -> sink as soon as it is ready
+            pipeline = Pipeline([
+                Stage('image', downloader.download, workers=config.PIPELINE_IMAGE_WORKERS),
+                Stage('translate', translator.translate_article_batch, workers=config.PIPELINE_TRANSLATE_WORKERS,
+                      batch_size=config.TRANSLATE_BATCH_SIZE, batch_wait=config.PIPELINE_BATCH_WAIT),
+                Stage('analyze', analyzer.add),
+            ])
+            
+            print(f"\n{'='*60}")
+            if crawler:
+                print(f"CRAWLING {len(crawler.seeds)} SECTION(S): SCRAPE \u2192 IMAGE \u2192 TRANSLATE \u2192 ANALYZE")
+            else:
+                print(f"STREAMING {config.MAX_ARTICLES} ARTICLES: SCRAPE \u2192 IMAGE \u2192 TRANSLATE \u2192 ANALYZE")
+            print(f"{'='*60}\n")
+            try:
+                pipeline.run(source, sink=sink)
+            finally:
+                downloader.close()
+                if crawler:
+                    print("\n\u2713 Crawl: " + crawler.summary())
+                    crawler.close()
+                if article_index:
+                    print("\n\u2713 Article index: " + article_index.summary())
+                    article_index.close()
+                if dedupe_index:
+                    print("\u2713 Near-duplicate index: " + dedupe_index.summary())
+                    dedupe_index.close()
+                if selector_stats:
+                    print("\u2713 Selector statistics: " + selector_stats.summary())
+                    selector_stats.close()
+            
+            if not totals['articles']:
+                if store:
+                    store.append_run(run_ts, 0, {})
                 print("\u2717 No articles found. Exiting.")
                 return
-            
-            scraper.print_articles()
-            scraper.download_images()
         
-        translator = RapidTranslator()
-        articles = translator.translate_articles(articles)
-        translator.print_translated_titles(articles)
+        translator.report_cache()
+        print("Pipeline stages:")
+        pipeline.print_stats()
         
-        analysis = TextAnalyzer.analyze_articles(articles)
+        analysis = analyzer.analysis()
         print(f"\n{'='*60}")
         print("SAVING RESULTS")
         print(f"{'='*60}\n")
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        save_results_json(articles, analysis, f'elpais_results_{timestamp}.json')
-        save_results_csv(articles, f'elpais_results_{timestamp}.csv')
+        if store:
+            store.append_run(run_ts, totals['articles'], analysis)
+            print(f"\u2713 Results appended to store: {store.root}")
+        
+        if 'json' in writers:
+            print(f"\u2713 Results saved to JSON: {writers['json'].finish(analysis)}")
+        if 'csv' in writers:
+            print(f"\u2713 Results saved to CSV: {writers['csv'].finish()}")
+        
+        if config.METRICS_PATH:
+            print(f"\u2713 Metrics saved to: {metrics.export(config.METRICS_PATH)}")
         
         # Print summary
-        print_summary(articles, analysis)
+        print_summary(totals, analysis)
         
         print("="*60)
         print("\u2713 EXECUTION COMPLETED SUCCESSFULLY!")
@@ -119,6 +268,17 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        # Unfinished per-run files (the run failed or was interrupted) are kept as .partial and closed
+        for writer in writers.values():
+            writer.abort()
+        if translator:
+            translator.close()
+        if store:
+            store.close()
+        if fixture_server:
+            print("\u2713 Fixtures: " + fixture_server.summary())
+            fixture_server.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
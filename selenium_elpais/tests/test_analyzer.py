@@ -0,0 +1,108 @@
+"""Offline tests for TextAnalyzer and the corpus analytics engine."""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import TextAnalyzer
+from utils.analyzer import IncrementalAnalyzer
+from utils.corpus import CorpusAnalytics
+from utils.tokenizer import Tokenizer, fold_accents
+
+ARTICLES = [
+    {'index': 1, 'url': 'u1', 'title_english': 'The future of Europe', 'content': 'El futuro de Europa y la guerra'},
+    {'index': 2, 'url': 'u2', 'title_english': 'The future of the climate', 'content': 'El clima, el futuro'},
+    {'index': 3, 'url': 'u3', 'title_english': 'Europe and the future!', 'content': ''},
+]
+
+def test_analyze_articles_counts_repeated_words():
+    analysis = TextAnalyzer.analyze_articles(ARTICLES)
+    
+    assert analysis['word_frequency'] == {'the': 4, 'future': 3}
+    assert analysis['total_articles'] == 3
+    assert analysis['total_words_analyzed'] == 13
+
+def test_tokenizer_matches_clean_text_and_batches():
+    texts = ["¿Qué futuro tiene Europa? ¡Ninguno!", "  The future—of   Europe's_past... ", "", None]
+    tokenizer = Tokenizer()
+    
+    assert tokenizer.tokenize_many(texts) == [TextAnalyzer.clean_text(t or '').split() for t in texts]
+    assert tokenizer.count(texts) == TextAnalyzer.count_words(texts)
+    assert TextAnalyzer.count_words(texts)['s_past'] == 1
+
+def test_tokenizer_folds_accents_and_stopwords():
+    decomposed = "Opinio\u0301n y poli\u0301tica"
+    tokenizer = Tokenizer(fold=True, stopwords=['más', 'y'])
+    
+    assert fold_accents("Política de España, año más") == "Politica de Espana, ano mas"
+    assert [fold_accents(c) for c in 'ĳǆǉŀ'] == ['ij', 'dz', 'lj', 'l·']
+    assert tokenizer.tokenize(decomposed) == ['opinion', 'politica']
+    assert tokenizer.count(["Opinión MÁS opinion", decomposed]) == {'opinion': 3, 'politica': 1}
+
+def test_corpus_ngrams_stopwords_and_tfidf():
+    corpus = CorpusAnalytics(fields='both', ngram_range=(1, 2), stopwords=('es', 'en'), keep_documents=True)
+    for article in ARTICLES:
+        corpus.add(article)
+    
+    assert corpus.term_counts['future'] == 3
+    assert corpus.term_counts['futuro'] == 2
+    assert 'the' not in corpus.term_counts
+    assert 'el futuro' not in corpus.term_counts
+    assert corpus.term_counts['europe future'] == 0
+    assert corpus.top_k(2) == {'future': 3, 'europe': 2}
+    assert list(corpus.top_k(3, by='tfidf'))[0] == 'future'
+    assert set(corpus.document_tfidf('u1', k=2)) == {'europa', 'guerra'}
+
+def test_corpus_counters_merge_and_round_trip(tmp_path):
+    first, second = CorpusAnalytics(), CorpusAnalytics()
+    first.add(ARTICLES[0])
+    second.add(ARTICLES[1])
+    second.add(ARTICLES[2])
+    first.save(tmp_path / 'corpus.json')
+    
+    merged = CorpusAnalytics.load(tmp_path / 'corpus.json').merge(second)
+    
+    everything = CorpusAnalytics()
+    for article in ARTICLES:
+        everything.add(article)
+    assert merged.to_dict() == everything.to_dict()
+
+def test_heavy_hitters_bounded_memory_and_error():
+    import random
+    
+    rng = random.Random(7)
+    # Zipf-like stream: a few frequent words and a long tail of unique ones
+    stream = [f"w{min(int(rng.paretovariate(1.2)), 50)}" for _ in range(20000)] + [f"tail{i}" for i in range(20000)]
+    rng.shuffle(stream)
+    exact = Counter(stream)
+    counts = TextAnalyzer.heavy_hitters(epsilon=0.01)
+    counts.update(stream)
+    
+    assert len(counts) <= 100
+    for word, true_count in exact.most_common(5):
+        assert true_count <= counts[word] <= true_count + counts.error_bound()
+    assert [w for w, _ in counts.most_common(3)] == [w for w, _ in exact.most_common(3)]
+
+def test_approximate_mode_matches_exact_shape():
+    exact = TextAnalyzer.analyze_word_frequency(ARTICLES)
+    approximate = TextAnalyzer.analyze_word_frequency(ARTICLES, approximate=True)
+    
+    assert approximate == exact == {'the': 4, 'future': 3}
+
+def test_approximate_history_stays_bounded(tmp_path):
+    history_path = tmp_path / 'history.json'
+    for run in range(3):
+        analyzer = IncrementalAnalyzer(history_path=history_path, approximate=True, epsilon=0.1)
+        for i in range(200):
+            analyzer.add({'title_english': f"Europe budget unique{run}x{i}", 'content': ''})
+            assert len(analyzer.new_terms.term_counts) <= 2 * analyzer.history_max_terms
+        history = analyzer.save_history()
+    
+    saved = CorpusAnalytics.load(history_path)
+    assert len(saved.term_counts) <= 10
+    assert saved.doc_count == 600
+    assert saved.term_counts['europe'] == saved.term_counts['budget'] == 600
+    assert history.top_k(2) == {'budget': 600, 'europe': 600}
@@ -0,0 +1,62 @@
+"""Offline tests for the incremental-run article index."""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.article_index import ArticleIndex
+from utils.scraper import ElPaisScraper
+
+URL = 'https://elpais.com/opinion/2025-10-25/uno.html'
+
+def listing(title='El futuro de Europa'):
+    """Listing fields as the scraper sees them, before content is fetched."""
+    return {'title': title, 'url': URL, 'author': 'Ana', 'date': '25 oct 2025', 'image_url': ''}
+
+def run(index_path, fields, full=False):
+    """One scraper run over a single listed article; returns the article and the pages fetched."""
+    fetched = []
+    index = ArticleIndex(path=index_path, full_refresh=full)
+    scraper = ElPaisScraper(article_index=index)
+    scraper._scrape_full_article = lambda url: fetched.append(url) or 'Cuerpo completo.'
+    article = scraper.complete_article(fields, 1)
+    article['title_english'] = 'Translated: ' + article['title']
+    index.record(article)
+    summary = index.summary()
+    index.close()
+    return article, fetched, summary
+
+def test_unchanged_article_reuses_stored_record(tmp_path):
+    path = tmp_path / 'index.sqlite'
+    first, fetched, summary = run(path, listing())
+    assert fetched == [URL] and summary == '1 new, 0 changed, 0 unchanged'
+    
+    again, fetched, summary = run(path, listing())
+    assert fetched == []
+    assert again['unchanged'] is True
+    assert again['content'] == 'Cuerpo completo.'
+    assert again['title_english'] == first['title_english']
+    assert summary == '0 new, 0 changed, 1 unchanged'
+
+def test_changed_article_is_fetched_again(tmp_path):
+    path = tmp_path / 'index.sqlite'
+    run(path, listing())
+    
+    changed, fetched, summary = run(path, listing(title='El futuro de Europa, revisado'))
+    assert fetched == [URL]
+    assert not changed.get('unchanged')
+    assert summary == '0 new, 1 changed, 0 unchanged'
+
+def test_full_refresh_reprocesses_but_updates_the_index(tmp_path):
+    path = tmp_path / 'index.sqlite'
+    run(path, listing())
+    
+    forced, fetched, summary = run(path, listing(), full=True)
+    assert fetched == [URL]
+    assert not forced.get('unchanged')
+    assert summary == '0 new, 1 changed, 0 unchanged'
+    
+    _, fetched, summary = run(path, listing())
+    assert fetched == [] and summary == '0 new, 0 changed, 1 unchanged'
@@ -0,0 +1,35 @@
+"""Offline tests for the benchmark suite's runner and baseline comparison."""
+
+import sys
+from pathlib import Path
+
+# Add project root and the benchmarks directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+from suite import compare, load, run_suite, write
+
+def _document(**values):
+    return {'version': 1, 'results': {name: {'value': value, 'unit': 'items/s', 'higher_is_better': True}
+                                      for name, value in values.items()}}
+
+def test_compare_flags_slowdowns_beyond_tolerance():
+    baseline = _document(**{'scrape.http': 100.0, 'export.json': 1000.0, 'translate.sync': 50.0})
+    current = _document(**{'scrape.http': 70.0, 'export.json': 1300.0, 'analysis.batch_1000': 10.0})
+    
+    rows = {row[0]: row for row in compare(baseline, current, tolerance=0.2)}
+    assert rows['scrape.http'][4] == 'regression'
+    assert round(rows['scrape.http'][3], 2) == -0.3
+    assert rows['export.json'][4] == 'improved'
+    assert rows['translate.sync'][4] == 'missing'
+    assert rows['analysis.batch_1000'][4] == 'new'
+    assert compare(baseline, baseline)[0][4] == 'ok'
+
+def test_run_suite_writes_a_loadable_results_file(tmp_path):
+    sizes = {'corpora': (200,), 'export': 50, 'repeat': 1}
+    document = run_suite(groups=('analysis', 'export'), profile='quick', sizes=sizes)
+    
+    assert set(document['results']) == {'analysis.batch_200', 'export.json', 'export.csv'}
+    assert all(result['value'] > 0 for result in document['results'].values())
+    assert document['results']['export.csv']['params'] == {'items': 50, 'repeat': 1}
+    assert load(write(document, tmp_path / 'bench.json')) == document
@@ -1,13 +1,38 @@
 """BrowserStack test for El País Opinion scraper - Selenium 4+ compatible."""
 
+import argparse
 import json
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+
+BROWSERSTACK_YML = Path(__file__).parent.parent / 'browserstack.yml'
+
+# Options classes by lowercase browserName; mobile platforms use the browser they run
+BROWSER_OPTIONS = {
+    'chrome': webdriver.ChromeOptions,
+    'firefox': webdriver.FirefoxOptions,
+    'safari': webdriver.SafariOptions,
+    'edge': webdriver.EdgeOptions,
+}
+
+# Platform keys that belong in bstack:options rather than top-level W3C capabilities
+BSTACK_PLATFORM_KEYS = ('os', 'osVersion', 'deviceName', 'deviceOrientation')
+
 def test_elpais_opinion_scraper():
     """
     Test El País Opinion section scraping on BrowserStack.
@@ -16,7 +41,7 @@ def test_elpais_opinion_scraper():
     # BrowserStack SDK will handle browser capabilities automatically
     # Using Selenium 4+ compatible format
     driver = webdriver.Remote(
-        command_executor='https://hub-cloud.browserstack.com/wd/hub',
+        command_executor=config.SELENIUM_REMOTE_URL,
         options=webdriver.ChromeOptions()
     )
     
@@ -122,5 +147,233 @@ def test_elpais_opinion_scraper():
         driver.quit()
         print("Test completed")
 
+@contextmanager
+def _step(timings, name):
+    """Record the wall-clock duration of a step in seconds."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round(time.perf_counter() - start, 3)
+
+def load_platforms(path=BROWSERSTACK_YML):
+    """
+    Read the platform matrix and credentials from browserstack.yml.
+    
+    Args:
+        path (Path): YAML file in BrowserStack SDK format
+        
+    Returns:
+        tuple: (list of platform dicts, settings dict without 'platforms')
+    """
+    # Imported here so the module (and its offline helpers) loads without PyYAML
+    import yaml
+    
+    with open(path, encoding='utf-8') as f:
+        settings = yaml.safe_load(f) or {}
+    platforms = settings.pop('platforms', None) or []
+    return platforms, settings
+
+def platform_name(platform):
+    """Readable label such as 'Chrome on Windows 10' or 'safari on iPhone 13 Pro'."""
+    where = platform.get('deviceName') or f"{platform.get('os', '')} {platform.get('osVersion', '')}".strip()
+    return f"{platform.get('browserName', 'browser')} on {where}"
+
+def is_browserstack(remote_url):
+    """True if the endpoint is BrowserStack's hub rather than a local Grid or container."""
+    return 'browserstack.com' in remote_url
+
+def build_options(platform, remote_url, settings=None, build_name=None):
+    """
+    Selenium options for one platform.
+    
+    BrowserStack gets the platform details and credentials as bstack:options;
+    a local Grid or standalone container only gets the browser name, since it
+    cannot provide specific operating systems, devices or 'latest' versions.
+    
+    Args:
+        platform (dict): Entry from the browserstack.yml platforms list
+        remote_url (str): Remote WebDriver endpoint
+        settings (dict): Remaining browserstack.yml settings (userName, accessKey, ...)
+        build_name (str): Build to group BrowserStack sessions under
+        
+    Returns:
+        ArgOptions: Options for webdriver.Remote
+    """
+    browser = platform.get('browserName', 'chrome').lower()
+    if browser not in BROWSER_OPTIONS:
+        raise ValueError("Unsupported browser: " + browser)
+    options = BROWSER_OPTIONS[browser]()
+    if not is_browserstack(remote_url):
+        return options
+    
+    settings = settings or {}
+    if platform.get('browserVersion'):
+        options.browser_version = str(platform['browserVersion'])
+    bstack = {key: str(platform[key]) for key in BSTACK_PLATFORM_KEYS if key in platform}
+    bstack.update({
+        'userName': config.BROWSERSTACK_USERNAME or settings.get('userName'),
+        'accessKey': config.BROWSERSTACK_ACCESS_KEY or settings.get('accessKey'),
+        'buildName': build_name or settings.get('buildName', 'elpais-opinion-scraper-matrix'),
+        'sessionName': 'El Pais Opinion Scraping Test - ' + platform_name(platform),
+    })
+    options.set_capability('bstack:options', bstack)
+    return options
+
+def _set_status(driver, remote_url, passed, reason):
+    """Report the outcome to BrowserStack; other endpoints have no session status."""
+    if not is_browserstack(remote_url):
+        return
+    status = 'passed' if passed else 'failed'
+    try:
+        driver.execute_script(
+            'browserstack_executor: {"action": "setSessionStatus", "arguments": {"status":"' + status + '", "reason": ' + json.dumps(reason) + '}}'
+        )
+    except Exception:
+        pass
+
+def run_platform(platform, remote_url, settings=None, build_name=None, min_articles=5):
+    """
+    Run the Opinion scraping check on one remote platform, timing each step.
+    
+    Args:
+        platform (dict): Entry from the browserstack.yml platforms list
+        remote_url (str): Remote WebDriver endpoint
+        settings (dict): Remaining browserstack.yml settings
+        build_name (str): BrowserStack build name
+        min_articles (int): Articles the listing must show to pass
+        
+    Returns:
+        dict: Platform label, 'success', 'articles', 'sample_title', 'session_start', 'steps' and 'error'
+    """
+    result = {'platform': platform_name(platform), 'success': False, 'articles': 0, 'sample_title': '',
+              'session_start': None, 'steps': {}, 'error': ''}
+    steps = result['steps']
+    driver = None
+    try:
+        options = build_options(platform, remote_url, settings, build_name)
+        started = time.perf_counter()
+        driver = webdriver.Remote(command_executor=remote_url, options=options)
+        result['session_start'] = round(time.perf_counter() - started, 3)
+        
+        with _step(steps, 'navigation'):
+            driver.get(config.ELPAIS_OPINION_URL)
+        with _step(steps, 'consent'):
+            try:
+                WebDriverWait(driver, 5).until(
+                    EC.element_to_be_clickable((By.ID, "didomi-notice-agree-button"))
+                ).click()
+            except (TimeoutException, NoSuchElementException):
+                pass
+        with _step(steps, 'articles_ready'):
+            WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "article")))
+        with _step(steps, 'extraction'):
+            articles = driver.find_elements(By.TAG_NAME, "article")
+            result['articles'] = len(articles)
+            for selector in ['h2', 'h2 a', 'h3', '.c_h']:
+                titles = articles[0].find_elements(By.CSS_SELECTOR, selector) if articles else []
+                if titles and titles[0].text.strip():
+                    result['sample_title'] = titles[0].text.strip()[:50]
+                    break
+        
+        result['success'] = result['articles'] >= min_articles
+        reason = f"Found {result['articles']} articles. Sample title: {result['sample_title']}"
+        _set_status(driver, remote_url, result['success'], reason)
+    except Exception as e:
+        result['error'] = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+        if driver:
+            _set_status(driver, remote_url, False, "Test error: " + result['error'])
+    finally:
+        if driver:
+            with _step(steps, 'quit'):
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+    return result
+
+def run_remote_matrix(platforms, remote_url=None, parallel=None, settings=None):
+    """
+    Run every platform concurrently, at most ``parallel`` sessions at a time.
+    
+    Args:
+        platforms (list): Platform dicts from browserstack.yml
+        remote_url (str): Remote WebDriver endpoint (default: config.SELENIUM_REMOTE_URL)
+        parallel (int): Concurrent sessions (default: config.REMOTE_PARALLELISM)
+        settings (dict): Remaining browserstack.yml settings
+        
+    Returns:
+        dict: Report with endpoint, parallelism, wall time and per-platform results
+    """
+    remote_url = remote_url or config.SELENIUM_REMOTE_URL
+    parallel = max(1, min(parallel or config.REMOTE_PARALLELISM, len(platforms) or 1))
+    build_name = (settings or {}).get('buildName', 'elpais-opinion-scraper-matrix') + '-' + datetime.now().strftime('%Y%m%d_%H%M%S')
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        results = list(executor.map(lambda p: run_platform(p, remote_url, settings, build_name), platforms))
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'remote_url': remote_url.split('@')[-1],
+        'parallel': parallel,
+        'wall_seconds': round(time.perf_counter() - started, 3),
+        'results': results,
+    }
+
+def print_report(report):
+    """Print one line per platform with session-start latency and step timings."""
+    print(f"\n{'='*60}")
+    print(f"REMOTE MATRIX SUMMARY ({report['remote_url']}, {report['parallel']} parallel)")
+    print(f"{'='*60}\n")
+    for r in report['results']:
+        status = "\u2713 PASSED" if r['success'] else "\u2717 FAILED"
+        start = f"{r['session_start']:.2f}s" if r['session_start'] is not None else 'n/a'
+        steps = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in r['steps'].items())
+        print(f"{r['platform']}: {status} - session start {start}" + (f", {steps}" if steps else ''))
+        if r['error']:
+            print(f"  Error: {r['error']}")
+    print(f"\nWall time: {report['wall_seconds']:.2f}s\n")
+
+def parse_args(argv=None):
+    """Parse command-line options for the built-in matrix runner."""
+    parser = argparse.ArgumentParser(description="Run the Opinion scraping check on a remote browser matrix.")
+    parser.add_argument('--matrix', action='store_true',
+                        help="run all browserstack.yml platforms with the built-in runner instead of the SDK")
+    parser.add_argument('--remote-url', default=None,
+                        help="remote WebDriver endpoint, e.g. http://localhost:4444/wd/hub (default: SELENIUM_REMOTE_URL)")
+    parser.add_argument('--parallel', type=int, default=None,
+                        help="maximum concurrent sessions (default: REMOTE_PARALLELISM)")
+    parser.add_argument('--browsers', default='',
+                        help="only run platforms with these comma-separated browser names")
+    parser.add_argument('--config', type=Path, default=BROWSERSTACK_YML,
+                        help="platform matrix in browserstack.yml format")
+    parser.add_argument('--report', type=Path, default=None,
+                        help="JSON report path (default: output/results/remote_matrix_<timestamp>.json)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the built-in matrix runner, or the single SDK-driven test without --matrix."""
+    args = parse_args(argv)
+    if not args.matrix:
+        test_elpais_opinion_scraper()
+        return 0
+    
+    platforms, settings = load_platforms(args.config)
+    wanted = {b.strip().lower() for b in args.browsers.split(',') if b.strip()}
+    if wanted:
+        platforms = [p for p in platforms if p.get('browserName', '').lower() in wanted]
+    if not platforms:
+        print("\u2717 No platforms to run")
+        return 1
+    
+    report = run_remote_matrix(platforms, args.remote_url, args.parallel, settings)
+    print_report(report)
+    
+    report_path = args.report or config.RESULTS_DIR / f"remote_matrix_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\u2713 Report saved to: {report_path}\n")
+    return 0 if all(r['success'] for r in report['results']) else 1
+
 if __name__ == '__main__':
-    test_elpais_opinion_scraper()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""Offline tests for the multi-section crawl scheduler against a local HTML server."""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import HttpScraper
+from utils.crawler import CrawlScheduler, parse_listing
+
+def listing(section, page, days, next_page=True):
+    items = ''.join(
+        f'<article><h2><a href="/{section}/2025-10-{day:02d}/p{page}-{day}.html">{section} {page} {day}</a></h2></article>'
+        for day in days
+    )
+    nav = f'<a rel="next" href="/{section}/{page + 1}/">Siguiente</a>' if next_page else ''
+    return f"<html><body><main>{items}</main>{nav}</body></html>"
+
+PAGES = {
+    '/opinion/': listing('opinion', 1, [10, 20]),
+    '/opinion/2/': listing('opinion', 2, [5]),
+    '/opinion/3/': listing('opinion', 3, [1]),
+    '/economia/': listing('economia', 1, [15], next_page=False),
+}
+
+class _Handler(BaseHTTPRequestHandler):
+    requested = []
+    
+    def do_GET(self):
+        self.requested.append(self.path)
+        if self.path in PAGES:
+            body = PAGES[self.path]
+        elif self.path.endswith('.html'):
+            body = f"<article><p>Cuerpo de {self.path}</p></article>"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def site():
+    _Handler.requested = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+def test_parse_listing_finds_articles_and_next_page():
+    articles, next_url = parse_listing(PAGES['/opinion/'], 'https://elpais.com/opinion/')
+    
+    assert [a['url'] for a in articles] == [
+        'https://elpais.com/opinion/2025-10-10/p1-10.html',
+        'https://elpais.com/opinion/2025-10-20/p1-20.html',
+    ]
+    assert next_url == 'https://elpais.com/opinion/2/'
+
+def test_crawl_follows_pagination_within_depth(site):
+    with HttpScraper() as scraper:
+        crawler = CrawlScheduler(scraper, seeds=[site + '/opinion/', site + '/economia/'],
+                                 max_depth=1, host_delay=0, workers=1)
+        articles = list(crawler.crawl())
+    
+    # Page 3 is beyond the depth limit; each depth's freshest articles come first, across sections
+    assert '/opinion/3/' not in _Handler.requested
+    assert [a['url'].split('/', 3)[3] for a in articles] == [
+        'opinion/2025-10-20/p1-20.html',
+        'economia/2025-10-15/p1-15.html',
+        'opinion/2025-10-10/p1-10.html',
+        'opinion/2025-10-05/p2-5.html',
+    ]
+    assert [a['index'] for a in articles] == [1, 2, 3, 4]
+    assert {a['section'] for a in articles} == {'opinion', 'economia'}
+    assert articles[0]['content'] == 'Cuerpo de /opinion/2025-10-20/p1-20.html'
+    assert crawler.summary() == "3 listing page(s), 4 article(s), 0 failed, 1 beyond depth limit"
+
+def test_crawl_stops_at_article_budget(site):
+    with HttpScraper() as scraper:
+        crawler = CrawlScheduler(scraper, seeds=[site + '/opinion/'], max_articles=2, host_delay=0, workers=4)
+        articles = list(crawler.crawl())
+    
+    assert len(articles) == 2
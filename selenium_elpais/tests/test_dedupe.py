@@ -0,0 +1,49 @@
+"""Offline tests for the MinHash/LSH near-duplicate index."""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import TextAnalyzer
+from utils.dedupe import NearDuplicateIndex
+
+BODY = ("El Gobierno presentó ayer su plan de reforma de la vivienda, que incluye ayudas al alquiler "
+        "para jóvenes, un parque público de pisos y nuevas limitaciones a los precios en zonas tensionadas. ")
+
+def article(url, title, content=BODY * 3, **extra):
+    return dict(url=url, title=title, content=content, **extra)
+
+def test_near_duplicates_within_and_across_runs(tmp_path):
+    path = tmp_path / 'dedupe.sqlite'
+    index = NearDuplicateIndex(path)
+    
+    assert index.check(article('https://x/a', 'La vivienda, otra vez')) is None
+    assert index.check(article('https://x/b', 'Un asunto distinto', 'Texto sin relación alguna con nada ' * 10)) is None
+    repost = article('https://x/seccion/a', 'La vivienda, otra vez', BODY * 3 + 'Actualizado.')
+    assert index.check(repost) == 'https://x/a'
+    assert repost['duplicate_of'] == 'https://x/a'
+    # Same URL listed twice in one run
+    assert index.check(article('https://x/b', 'Un asunto distinto', 'Texto sin relación alguna con nada ' * 10)) == 'https://x/b'
+    assert index.summary() == "2 unique, 2 near-duplicate(s) skipped"
+    index.close()
+    
+    reopened = NearDuplicateIndex(path)
+    assert reopened.check(article('https://x/a', 'La vivienda, otra vez')) is None
+    assert reopened.check(article('https://y/copia', 'La vivienda, otra vez')) == 'https://x/a'
+    assert reopened.prune(max_age_days=-1) == 2
+    assert reopened.check(article('https://z/otra', 'La vivienda, otra vez')) is None
+    reopened.close()
+
+def test_analyzer_collapses_duplicates():
+    articles = [
+        article('u1', 'La vivienda', title_english='Housing and the future'),
+        article('u2', 'La vivienda', title_english='Housing and the future'),
+        article('u3', 'Otra cosa', 'Nada que ver ' * 20, title_english='Something else'),
+    ]
+    
+    assert TextAnalyzer.analyze_articles(articles)['total_words_analyzed'] == 10
+    analysis = TextAnalyzer.analyze_articles(articles, dedupe=True)
+    assert analysis['total_articles'] == 2
+    assert analysis['total_words_analyzed'] == 6
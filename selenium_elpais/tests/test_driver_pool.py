@@ -0,0 +1,113 @@
+"""Offline tests for the pooled WebDriver sessions, using a fake warm pool."""
+
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import driver_pool
+from utils.driver_pool import DriverPool
+
+class FakeWarmPool:
+    """Hands out numbered fake drivers and records what happens to them."""
+    
+    def __init__(self):
+        self.launched = []
+        self.discarded = []
+        self.released = []
+        self._lock = threading.Lock()
+    
+    def acquire(self, browser, headless=True):
+        with self._lock:
+            driver = 'driver-' + str(len(self.launched))
+            self.launched.append(driver)
+        return driver
+    
+    def discard(self, driver):
+        self.discarded.append(driver)
+    
+    def release(self, driver):
+        self.released.append(driver)
+
+def use_fake_pool(monkeypatch):
+    fake = FakeWarmPool()
+    monkeypatch.setattr(driver_pool, 'warm_pool', fake)
+    return fake
+
+def test_map_returns_results_in_order_within_the_worker_cap(monkeypatch):
+    fake = use_fake_pool(monkeypatch)
+    rng = random.Random(3)
+    delays = [rng.uniform(0, 0.02) for _ in range(20)]
+    
+    def load(session, index):
+        time.sleep(delays[index])
+        return (index, session.driver)
+    
+    with DriverPool(workers=3, recycle_after=100) as pool:
+        results = pool.map(load, range(20))
+    
+    assert [index for index, _ in results] == list(range(20))
+    assert len(fake.launched) <= 3
+    assert sorted(fake.released) == sorted(fake.launched)
+    assert fake.discarded == []
+
+def test_sessions_are_recycled_after_n_pages(monkeypatch):
+    fake = use_fake_pool(monkeypatch)
+    
+    with DriverPool(workers=1, recycle_after=2) as pool:
+        drivers = pool.map(lambda session, item: session.driver, range(5))
+    
+    assert drivers == ['driver-0', 'driver-0', 'driver-1', 'driver-1', 'driver-2']
+    assert fake.discarded == ['driver-0', 'driver-1']
+    assert fake.released == ['driver-2']
+
+def test_failed_session_is_replaced(monkeypatch):
+    fake = use_fake_pool(monkeypatch)
+    
+    def load(session, item):
+        if item == 'crash':
+            raise RuntimeError('tab crashed')
+        return item + '@' + session.driver
+    
+    with DriverPool(workers=1, recycle_after=100) as pool:
+        results = pool.map(load, ['uno', 'crash', 'dos'])
+        assert pool.run(load, 'tres') == 'tres@driver-1'
+    
+    assert results == ['uno@driver-0', None, 'dos@driver-1']
+    assert fake.discarded == ['driver-0']
+    assert fake.released == ['driver-1']
+
+def test_session_start_failure_returns_none(monkeypatch):
+    fake = use_fake_pool(monkeypatch)
+    attempts = []
+    
+    def flaky_acquire(browser, headless=True):
+        attempts.append(browser)
+        if len(attempts) == 1:
+            raise RuntimeError('SessionNotCreatedException')
+        return FakeWarmPool.acquire(fake, browser, headless)
+    fake.acquire = flaky_acquire
+    
+    with DriverPool(browser='firefox', workers=1) as pool:
+        assert pool.map(lambda session, item: session.driver, ['a', 'b']) == [None, 'driver-0']
+
+def test_callers_browser_fills_the_first_slot_and_is_never_quit(monkeypatch):
+    fake = use_fake_pool(monkeypatch)
+    
+    def load(session, item):
+        if item == 'crash':
+            raise RuntimeError('tab crashed')
+        return session.driver
+    
+    with DriverPool(workers=1, recycle_after=1, driver='scraper-driver') as pool:
+        assert pool.run(load, 'uno') == 'scraper-driver'
+        assert pool.run(load, 'dos') == 'scraper-driver'
+        assert pool.run(load, 'crash') is None
+        assert pool.run(load, 'tres') == 'driver-0'
+    
+    assert 'scraper-driver' not in fake.discarded + fake.released
+    assert fake.discarded == ['driver-0']
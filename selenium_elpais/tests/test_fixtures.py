@@ -0,0 +1,124 @@
+"""Offline tests for the record-and-replay fixture server."""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+from utils.fixtures import ISOLATED_STATE, FixtureArchive, FixtureServer, request_key
+
+class _Upstream(BaseHTTPRequestHandler):
+    """Stands in for elpais.com (GET) and the translation API (POST)."""
+    
+    def do_GET(self):
+        if self.path == '/opinion/':
+            origin = f"http://127.0.0.1:{self.server.server_port}"
+            body = (f'<a href="{origin}/opinion/a.html">A</a><img src="{origin}/img/1.png">'
+                    '<svg xmlns="http://www.w3.org/2000/svg"></svg>').encode('utf-8')
+            self._reply(200, 'text/html; charset=utf-8', body)
+        else:
+            self._reply(404, 'text/plain', b'nope')
+    
+    def do_POST(self):
+        texts = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['q']
+        translated = ['en: ' + t for t in texts] if isinstance(texts, list) else ['en: ' + texts]
+        self._reply(200, 'application/json', json.dumps(translated).encode('utf-8'))
+    
+    def _reply(self, status, content_type, body):
+        self.server.hits += 1
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+def _start_upstream():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Upstream)
+    httpd.hits = 0
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+def test_request_key_canonicalizes_json_bodies():
+    first = request_key('post', 'https://api/t', b'{"q": "hola", "from": "es"}')
+    assert first == request_key('POST', 'https://api/t', b'{"from":"es","q":"hola"}')
+    assert first != request_key('POST', 'https://api/t', b'{"from":"es","q":"adios"}')
+    assert request_key('GET', 'https://elpais.com/opinion/') == 'GET https://elpais.com/opinion/'
+
+def test_record_then_replay_without_upstream(tmp_path):
+    upstream = _start_upstream()
+    origin = f"http://127.0.0.1:{upstream.server_port}"
+    api_url = f"http://127.0.0.1:{upstream.server_port}/t"
+    
+    with FixtureServer(FixtureArchive(tmp_path), mode='record', origin=origin, port=0) as recorder:
+        recorder_url = recorder.url
+        page = requests.get(recorder.url + '/opinion/').text
+        assert f'href="{recorder.url}/opinion/a.html"' in page
+        assert 'xmlns="http://www.w3.org/2000/svg"' in page
+        translated = requests.post(recorder.local_url(api_url), json={'from': 'es', 'q': 'hola'}).json()
+        assert requests.get(recorder.url + '/opinion/missing.html').status_code == 404
+        # Already recorded requests are not fetched again
+        requests.get(recorder.url + '/opinion/')
+    assert upstream.hits == 3
+    upstream.shutdown()
+    upstream.server_close()
+    
+    with FixtureServer(FixtureArchive(tmp_path), mode='replay', port=0) as replayer:
+        replayed = requests.get(replayer.url + '/opinion/')
+        assert replayed.headers['Content-Type'] == 'text/html; charset=utf-8'
+        assert replayed.text == page.replace(recorder_url, replayer.url)
+        assert requests.post(replayer.local_url(api_url), json={'q': 'hola', 'from': 'es'}).json() == translated
+        assert requests.get(replayer.url + '/opinion/missing.html').status_code == 404
+        assert requests.get(replayer.url + '/opinion/never-recorded.html').status_code == 404
+        assert replayer.stats == {'served': 3, 'recorded': 0, 'missing': 1, 'errors': 0}
+
+def test_batches_replay_from_per_text_entries(tmp_path):
+    upstream = _start_upstream()
+    api_url = f"http://127.0.0.1:{upstream.server_port}/t"
+    
+    with FixtureServer(FixtureArchive(tmp_path), mode='record', origin='https://elpais.com', port=0) as recorder:
+        requests.post(recorder.local_url(api_url), json={'from': 'es', 'q': ['uno', 'dos', 'tres']})
+    upstream.shutdown()
+    upstream.server_close()
+    
+    with FixtureServer(FixtureArchive(tmp_path), mode='replay', port=0) as replayer:
+        # Same texts, batched differently than when they were recorded
+        assert requests.post(replayer.local_url(api_url), json={'from': 'es', 'q': ['tres', 'uno']}).json() == [
+            'en: tres', 'en: uno']
+        assert requests.post(replayer.local_url(api_url), json={'from': 'es', 'q': 'dos'}).json() == ['en: dos']
+        assert requests.post(replayer.local_url(api_url), json={'from': 'es', 'q': ['uno', 'cuatro']}).status_code == 404
+
+def test_redirect_config_points_urls_at_the_server(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'ELPAIS_OPINION_URL', 'https://elpais.com/opinion/')
+    monkeypatch.setattr(config, 'ELPAIS_BASE_URL', 'https://elpais.com/')
+    monkeypatch.setattr(config, 'RAPID_TRANSLATE_API_URL', 'https://translate.example.com/t')
+    for name, target in ISOLATED_STATE.items():
+        monkeypatch.setattr(config, name, tmp_path / 'state' / target)
+    monkeypatch.setattr(config, 'CORPUS_HISTORY_PATH', None)
+    
+    with FixtureServer(FixtureArchive(tmp_path), mode='replay', port=0) as server:
+        server.redirect_config()
+        state_dir = config.ARTICLE_INDEX_PATH.parent
+        assert config.CORPUS_HISTORY_PATH is None
+        assert all(getattr(config, name).parent == state_dir for name in ISOLATED_STATE if name != 'CORPUS_HISTORY_PATH')
+        assert state_dir != tmp_path / 'state'
+        article = {'url': server.url + '/opinion/a.html', 'image_url': server.url + '/_fixture/https/imagenes.elpais.com/1.jpg',
+                   'title': 'A'}
+        assert server.restore_urls(article) == {'url': 'https://elpais.com/opinion/a.html',
+                                                'image_url': 'https://imagenes.elpais.com/1.jpg', 'title': 'A'}
+        assert config.ELPAIS_OPINION_URL == server.url + '/opinion/'
+        assert config.ELPAIS_BASE_URL == server.url + '/'
+        assert config.RAPID_TRANSLATE_API_URL == server.url + '/_fixture/https/translate.example.com/t'
+        assert server.upstream_url('/_fixture/https/translate.example.com/t?x=1') == 'https://translate.example.com/t?x=1'
+        assert server.rewrite(b'<img src="https://imagenes.elpais.com/a.jpg">', 'text/html') == (
+            f'<img src="{server.url}/_fixture/https/imagenes.elpais.com/a.jpg">'.encode('utf-8'))
+    assert not state_dir.exists()
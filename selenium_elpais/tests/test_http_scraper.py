@@ -0,0 +1,140 @@
+"""Offline tests for the HTTP-first scraper against a local HTML server."""
+
+import hashlib
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import HttpScraper
+from utils import downloader as downloader_module
+from utils.downloader import ImageDownloader
+from utils.image_cache import ImageCache
+
+LISTING_HTML = """<html><head><title>Opinión | EL PAÍS</title></head><body><main>
+<article><header><h2><a href="/opinion/2025-10-25/uno.html">Primer título</a></h2></header>
+<span class="c_a_a">Autora Uno</span><time>25 oct 2025</time>
+<figure><img src="/img/uno.jpg"></figure></article>
+<article><h2><a href="/opinion/2025-10-25/dos.html">Segundo título</a></h2>
+<p class="c_d">Resumen del segundo artículo.</p><img src="/img/logo.svg"></article>
+</main></body></html>"""
+
+PNG_BYTES = b'\x89PNG\r\n\x1a\n' + b'\x00' * 200000
+
+ARTICLE_HTML = """<html><body><article><p>Primer párrafo.</p><p> </p><p>Segundo párrafo.</p></article></body></html>"""
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path in ('/img/uno.jpg', '/img/uno-copia.jpg'):
+            if self.headers.get('If-None-Match') == '"uno"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', '"uno"')
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(len(PNG_BYTES)))
+            self.end_headers()
+            self.wfile.write(PNG_BYTES)
+            return
+        if self.path == '/opinion/':
+            body = LISTING_HTML
+        elif self.path.startswith('/opinion/2025-10-25/'):
+            body = ARTICLE_HTML
+        else:
+            self.send_error(404)
+            return
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+def test_http_scraper_parses_listing_and_article_pages(site):
+    with HttpScraper() as scraper:
+        scraper.listing_url = site + '/opinion/'
+        scraper.navigate_to_opinion_section()
+        articles = scraper.scrape_articles(max_articles=2)
+        assert scraper.driver is None
+    
+    assert [a['index'] for a in articles] == [1, 2]
+    first, second = articles
+    assert first['title'] == 'Primer título'
+    assert first['author'] == 'Autora Uno'
+    assert first['date'] == '25 oct 2025'
+    assert first['url'] == site + '/opinion/2025-10-25/uno.html'
+    assert first['image_url'] == site + '/img/uno.jpg'
+    assert first['content'] == 'Primer párrafo. Segundo párrafo.'
+    assert second['content'] == 'Resumen del segundo artículo.'
+    assert second['image_url'] == ''
+
+def test_image_downloader_streams_with_content_type_extension(site, tmp_path):
+    articles = [
+        {'index': 1, 'image_url': site + '/img/uno.jpg', 'image_path': ''},
+        {'index': 2, 'image_url': site + '/img/missing.jpg', 'image_path': ''},
+        {'index': 3, 'image_url': '', 'image_path': ''},
+    ]
+    
+    paths = ImageDownloader(workers=3, host_interval=0, target_dir=tmp_path).download_all(articles)
+    
+    published = tmp_path / (hashlib.sha256(PNG_BYTES).hexdigest()[:16] + '.png')
+    assert paths == [str(published), '', '']
+    assert published.read_bytes() == PNG_BYTES
+    assert articles[0]['image_path'] == paths[0]
+    assert [p.name for p in tmp_path.iterdir()] == [published.name]
+
+def test_image_downloader_closes_only_its_own_session(tmp_path, monkeypatch):
+    closed = []
+    
+    class FakeSession:
+        def close(self):
+            closed.append(self)
+    
+    monkeypatch.setattr(downloader_module, 'create_http_session', lambda pool_size=None: FakeSession())
+    shared = FakeSession()
+    ImageDownloader(session=shared, target_dir=tmp_path).close()
+    assert closed == []
+    
+    owned = ImageDownloader(target_dir=tmp_path)
+    owned.close()
+    assert closed == [owned.session]
+
+def test_image_cache_revalidates_and_deduplicates(site, tmp_path):
+    cache = ImageCache(cache_dir=tmp_path / 'cache', max_bytes=10 * len(PNG_BYTES))
+    downloader = ImageDownloader(workers=1, host_interval=0, target_dir=tmp_path / 'images', cache=cache)
+    articles = [
+        {'index': 1, 'image_url': site + '/img/uno.jpg', 'image_path': ''},
+        {'index': 2, 'image_url': site + '/img/uno-copia.jpg', 'image_path': ''},
+    ]
+    
+    first_run = downloader.download_all(articles)
+    assert first_run[0] == first_run[1]
+    assert cache.lookup(site + '/img/uno.jpg')['etag'] == '"uno"'
+    assert cache.total_bytes() == len(PNG_BYTES)
+    
+    status, path = downloader._fetch(site + '/img/uno.jpg')
+    assert status == 304
+    assert str(path) == first_run[0]
+    
+    cache.max_bytes = 0
+    downloader.close()
+    assert not any(path.is_file() for path in cache.objects_dir.rglob('*'))
+    # Earlier results still reference the published copy
+    assert Path(first_run[0]).read_bytes() == PNG_BYTES
@@ -1,6 +1,13 @@
 """Local testing script for Chrome and Firefox."""
 
+import argparse
+import itertools
+import json
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 
 # Add project root to path
@@ -32,36 +39,149 @@ def test_browser(browser_name):
         print(f"✗ Error testing {browser_name}: {str(e)}")
         return False
 
-def main():
-    """Test locally with both Chrome and Firefox."""
-    print("\n" + "="*60)
-    print("LOCAL BROWSER TESTING")
-    print("Testing Chrome and Firefox compatibility")
-    print("="*60)
-    
-    # Validate config
-    config.validate_config()
-    
-    results = {}
+@contextmanager
+def _phase(timings, name):
+    """Record the wall-clock duration of a phase in seconds."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round(time.perf_counter() - start, 3)
+
+def build_matrix(browsers=('chrome', 'firefox'), headless_modes=(True,), article_counts=(2,)):
+    """
+    Expand browsers x headless modes x article counts into run cases.
     
-    # Test Chrome
-    results['chrome'] = test_browser('chrome')
+    Args:
+        browsers (iterable): Browser names understood by ElPaisScraper
+        headless_modes (iterable): Headless flags to try
+        article_counts (iterable): Numbers of articles to scrape
+        
+    Returns:
+        list: Case dictionaries with 'browser', 'headless' and 'articles'
+    """
+    return [
+        {'browser': browser, 'headless': headless, 'articles': count}
+        for browser, headless, count in itertools.product(browsers, headless_modes, article_counts)
+    ]
+
+def run_case(case):
+    """
+    Run one matrix case in the current process, timing each phase.
     
-    # Test Firefox
-    results['firefox'] = test_browser('firefox')
+    Args:
+        case (dict): Case from build_matrix
+        
+    Returns:
+        dict: The case with 'success', 'scraped', 'sample_title', 'timings' and 'error'
+    """
+    result = dict(case, success=False, scraped=0, sample_title='', timings={}, error='')
+    timings = result['timings']
+    scraper = ElPaisScraper(browser=case['browser'], headless=case['headless'])
+    started = time.perf_counter()
+    try:
+        with _phase(timings, 'driver_start'):
+            scraper.setup_driver()
+        with _phase(timings, 'navigation'):
+            scraper.navigate_to_opinion_section()
+        with _phase(timings, 'extraction'):
+            articles = scraper.scrape_articles(max_articles=case['articles'])
+        result['scraped'] = len(articles)
+        result['sample_title'] = articles[0]['title'][:50] if articles else ''
+        result['success'] = len(articles) > 0
+    except Exception as e:
+        result['error'] = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+    finally:
+        with _phase(timings, 'teardown'):
+            scraper.close()
+        timings['total'] = round(time.perf_counter() - started, 3)
+    return result
+
+def run_matrix(cases, workers=None):
+    """
+    Run cases in a process pool, each with its own browser.
     
-    # Summary
+    Args:
+        cases (list): Cases from build_matrix
+        workers (int): Parallel processes (default: one per case)
+        
+    Returns:
+        dict: Report with the run timestamp, wall time and per-case results
+    """
+    started = time.perf_counter()
+    workers = max(1, min(workers or len(cases), len(cases)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run_case, cases))
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'workers': workers,
+        'wall_seconds': round(time.perf_counter() - started, 3),
+        'results': results,
+    }
+
+def print_report(report):
+    """Print one line per case with its per-phase timings."""
     print(f"\n{'='*60}")
     print("TEST SUMMARY")
     print(f"{'='*60}\n")
     
-    for browser, success in results.items():
-        status = "\u2713 PASSED" if success else "\u2717 FAILED"
-        print(f"{browser.capitalize()}: {status}")
+    for r in report['results']:
+        status = "\u2713 PASSED" if r['success'] else "\u2717 FAILED"
+        mode = 'headless' if r['headless'] else 'headed'
+        phases = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in r['timings'].items())
+        print(f"{r['browser'].capitalize()} ({mode}, {r['articles']} articles): {status} - {phases}")
+        if r['error']:
+            print(f"  Error: {r['error']}")
+    
+    serial = sum(r['timings'].get('total', 0) for r in report['results'])
+    print(f"\nWall time: {report['wall_seconds']:.2f}s with {report['workers']} process(es) "
+          f"(sum of case times: {serial:.2f}s)\n")
+
+def parse_args(argv=None):
+    """Parse command-line options for the local matrix run."""
+    def csv_list(value):
+        return [v.strip() for v in value.split(',') if v.strip()]
+    
+    parser = argparse.ArgumentParser(description="Run the scraper on a local browser matrix in parallel.")
+    parser.add_argument('--browsers', type=csv_list, default=['chrome', 'firefox'],
+                        help="comma-separated browsers (default: chrome,firefox)")
+    parser.add_argument('--headless', type=csv_list, default=['true'],
+                        help="comma-separated headless modes, e.g. true,false (default: true)")
+    parser.add_argument('--articles', type=csv_list, default=['2'],
+                        help="comma-separated article counts (default: 2)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="parallel processes (default: one per case)")
+    parser.add_argument('--report', type=Path, default=None,
+                        help="JSON report path (default: output/results/local_matrix_<timestamp>.json)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Test locally on a browser matrix (Chrome and Firefox by default), in parallel."""
+    args = parse_args(argv)
+    cases = build_matrix(
+        args.browsers,
+        [mode.lower() in ('1', 'true', 'yes') for mode in args.headless],
+        [int(count) for count in args.articles]
+    )
+    
+    print("\n" + "="*60)
+    print("LOCAL BROWSER TESTING")
+    print(f"Testing {len(cases)} case(s): {', '.join(sorted(set(args.browsers)))}")
+    print("="*60)
+    
+    # Validate config
+    config.validate_config()
+    
+    report = run_matrix(cases, workers=args.workers)
+    print_report(report)
     
-    print()
+    report_path = args.report or config.RESULTS_DIR / f"local_matrix_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\u2713 Report saved to: {report_path}\n")
     
-    if all(results.values()):
+    if all(r['success'] for r in report['results']):
         print("\u2713 All local tests passed! Ready for BrowserStack.\n")
         return 0
     else:
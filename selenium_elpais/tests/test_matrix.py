@@ -0,0 +1,117 @@
+"""Offline tests for the local and remote browser matrix runners."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+import test_browserstack
+import test_local
+
+class FakeScraper:
+    """Stands in for ElPaisScraper; fails at the phase named in ``fail_at``."""
+    
+    instances = []
+    fail_at = None
+    
+    def __init__(self, browser='chrome', headless=True):
+        self.browser = browser
+        self.headless = headless
+        self.closed = False
+        FakeScraper.instances.append(self)
+    
+    def _phase(self, name):
+        if FakeScraper.fail_at == name:
+            raise RuntimeError(name + ' failed\nStacktrace: ...')
+    
+    def setup_driver(self):
+        self._phase('driver_start')
+    
+    def navigate_to_opinion_section(self):
+        self._phase('navigation')
+    
+    def scrape_articles(self, max_articles=5):
+        self._phase('extraction')
+        return [{'title': 'Un titular bastante largo para recortar a cincuenta caracteres'}] * max_articles
+    
+    def close(self):
+        self.closed = True
+
+def test_build_matrix_expands_every_combination():
+    cases = test_local.build_matrix(browsers=('chrome', 'firefox'), headless_modes=(True, False), article_counts=(2, 5))
+    
+    assert len(cases) == 8
+    assert cases[0] == {'browser': 'chrome', 'headless': True, 'articles': 2}
+    assert cases[-1] == {'browser': 'firefox', 'headless': False, 'articles': 5}
+    assert test_local.build_matrix() == [
+        {'browser': 'chrome', 'headless': True, 'articles': 2},
+        {'browser': 'firefox', 'headless': True, 'articles': 2},
+    ]
+
+def test_run_case_times_each_phase_and_reports_errors(monkeypatch):
+    monkeypatch.setattr(test_local, 'ElPaisScraper', FakeScraper)
+    case = {'browser': 'firefox', 'headless': False, 'articles': 3}
+    
+    FakeScraper.fail_at = None
+    result = test_local.run_case(case)
+    assert result['success'] and result['scraped'] == 3 and result['error'] == ''
+    assert len(result['sample_title']) == 50
+    assert list(result['timings']) == ['driver_start', 'navigation', 'extraction', 'teardown', 'total']
+    assert FakeScraper.instances[-1].headless is False
+    
+    FakeScraper.fail_at = 'navigation'
+    result = test_local.run_case(case)
+    assert not result['success'] and result['scraped'] == 0
+    assert result['error'] == 'navigation failed'
+    assert 'extraction' not in result['timings'] and 'teardown' in result['timings']
+    assert FakeScraper.instances[-1].closed
+    assert case == {'browser': 'firefox', 'headless': False, 'articles': 3}
+
+def test_load_platforms_splits_matrix_from_settings(tmp_path):
+    path = tmp_path / 'browserstack.yml'
+    path.write_text(
+        "userName: ana\n"
+        "buildName: nightly\n"
+        "platforms:\n"
+        "  - os: Windows\n"
+        "    osVersion: 10\n"
+        "    browserName: Chrome\n"
+        "  - deviceName: iPhone 13 Pro\n"
+        "    osVersion: 15.0\n"
+        "    browserName: safari\n",
+        encoding='utf-8'
+    )
+    
+    platforms, settings = test_browserstack.load_platforms(path)
+    
+    assert settings == {'userName': 'ana', 'buildName': 'nightly'}
+    assert [test_browserstack.platform_name(p) for p in platforms] == ['Chrome on Windows 10', 'safari on iPhone 13 Pro']
+    
+    (tmp_path / 'empty.yml').write_text('', encoding='utf-8')
+    assert test_browserstack.load_platforms(tmp_path / 'empty.yml') == ([], {})
+
+def test_build_options_for_browserstack_and_local_grid(monkeypatch):
+    monkeypatch.setattr(config, 'BROWSERSTACK_USERNAME', '')
+    monkeypatch.setattr(config, 'BROWSERSTACK_ACCESS_KEY', 'env-key')
+    platform = {'os': 'Windows', 'osVersion': 10, 'browserName': 'Firefox', 'browserVersion': 'latest'}
+    settings = {'userName': 'ana', 'accessKey': 'yml-key'}
+    
+    options = test_browserstack.build_options(platform, 'https://hub.browserstack.com/wd/hub', settings, 'build-1')
+    capabilities = options.to_capabilities()
+    assert capabilities['browserName'] == 'firefox'
+    assert capabilities['browserVersion'] == 'latest'
+    assert capabilities['bstack:options'] == {
+        'os': 'Windows', 'osVersion': '10', 'userName': 'ana', 'accessKey': 'env-key',
+        'buildName': 'build-1', 'sessionName': 'El Pais Opinion Scraping Test - Firefox on Windows 10',
+    }
+    
+    local = test_browserstack.build_options(platform, 'http://localhost:4444/wd/hub', settings).to_capabilities()
+    assert local['browserName'] == 'firefox'
+    assert 'bstack:options' not in local and 'browserVersion' not in local
+    
+    with pytest.raises(ValueError, match='opera'):
+        test_browserstack.build_options({'browserName': 'Opera'}, 'http://localhost:4444/wd/hub')
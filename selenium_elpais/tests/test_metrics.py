@@ -0,0 +1,67 @@
+"""Offline tests for the timing and selector metrics registry."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.http_scraper import parse_article_fields
+from utils.metrics import MetricsRegistry, metrics
+
+def test_timers_counters_and_slowest():
+    registry = MetricsRegistry()
+    registry.observe('navigation', 2.0, backend='http')
+    registry.observe('navigation', 1.0, backend='http')
+    registry.observe('image_download', 0.5)
+    with pytest.raises(RuntimeError):
+        with registry.timer('translation_call', mode='single'):
+            raise RuntimeError("boom")
+    
+    name, labels, total, count, longest = registry.slowest(1)[0]
+    assert (name, labels, total, count, longest) == ('navigation', {'backend': 'http'}, 3.0, 2, 2.0)
+    assert registry.counters[('translation_call_errors', (('mode', 'single'),))] == 1
+    assert len(registry.slowest()) == 3
+
+def test_selector_hits_and_misses():
+    registry = MetricsRegistry()
+    registry.record_selectors('title', ['h2 a', 'h2', 'h3'], 'h2')
+    registry.record_selectors('title', ['h2 a', 'h2', 'h3'], 'h2 a')
+    registry.record_selectors('author', ['.a_by', '.author'], None)
+    
+    probes = {(dict(labels)['selector'], dict(labels)['result']): value
+              for (name, labels), value in registry.counters.items() if dict(labels)['field'] == 'title'}
+    assert probes == {('h2 a', 'miss'): 1, ('h2', 'hit'): 1, ('h2 a', 'hit'): 1}
+    assert registry.selector_miss_rates() == {'author': 1.0, 'title': 0.333}
+
+def test_export_prometheus_and_json(tmp_path):
+    registry = MetricsRegistry()
+    registry.observe('article_fetch', 0.25, backend='http')
+    registry.inc('selector_probes', field='title', selector='h2 "a"', result='hit')
+    
+    text = registry.export(tmp_path / 'metrics.prom').read_text()
+    assert '# TYPE elpais_article_fetch_seconds summary' in text
+    assert 'elpais_article_fetch_seconds_sum{backend="http"} 0.250000' in text
+    assert 'elpais_article_fetch_seconds_count{backend="http"} 1' in text
+    assert 'elpais_selector_probes_total{field="title",result="hit",selector="h2 \\"a\\""} 1' in text
+    
+    data = json.loads(registry.export(tmp_path / 'metrics.json').read_text())
+    assert data['timers'] == [{'name': 'article_fetch', 'labels': {'backend': 'http'}, 'count': 1, 'sum': 0.25, 'max': 0.25}]
+    assert data['counters'][0]['value'] == 1
+    assert not list(tmp_path.glob('*.part'))
+
+def test_http_parsing_records_selector_probes():
+    metrics.reset()
+    node = BeautifulSoup('<article><h2><a href="/opinion/x.html">Un título</a></h2></article>', 'lxml').article
+    parse_article_fields(node, 'https://elpais.com/opinion/')
+    
+    title_hits = sum(value for (name, labels), value in metrics.counters.items()
+                     if dict(labels).get('field') == 'title' and dict(labels)['result'] == 'hit')
+    assert title_hits == 1
+    assert metrics.selector_miss_rates()['author'] == 1.0
+    assert any(name == 'selector_probe' for name, *_ in metrics.slowest(k=100))
+    metrics.reset()
@@ -0,0 +1,67 @@
+"""Offline tests for the streaming article pipeline."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.pipeline import Pipeline, Stage
+
+def test_batching_stage_collects_up_to_batch_size():
+    batches = []
+    stage = Stage('batch', lambda batch: batches.append([a['index'] for a in batch]), batch_size=3, batch_wait=1.0)
+    
+    delivered = []
+    assert Pipeline([stage], queue_size=10).run(({'index': i} for i in range(7)), sink=delivered.append) == 7
+    
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+    assert [a['index'] for a in delivered] == list(range(7))
+    assert stage.processed == 7
+
+def test_stage_and_sink_errors_are_counted_and_the_stream_keeps_going():
+    def fail_on_two(article):
+        if article['index'] == 2:
+            raise ValueError('boom')
+        article['first'] = True
+    
+    def mark(article):
+        article['second'] = True
+    
+    def sink(article):
+        if article['index'] == 3:
+            raise RuntimeError('disk full')
+        delivered.append(article)
+    
+    delivered = []
+    pipeline = Pipeline([Stage('first', fail_on_two, workers=2), Stage('second', mark)], queue_size=2)
+    assert pipeline.run(({'index': i} for i in range(1, 6)), sink=sink) == 4
+    
+    assert pipeline.errors == 2
+    assert sorted(a['index'] for a in delivered) == [1, 2, 4, 5]
+    # The failed article is passed on as is and later stages still see it
+    failed = next(a for a in delivered if a['index'] == 2)
+    assert failed == {'index': 2, 'second': True}
+
+def test_full_queues_hold_the_source_back():
+    release = threading.Event()
+    produced = []
+    
+    def source():
+        for i in range(50):
+            produced.append(i)
+            yield {'index': i}
+    
+    pipeline = Pipeline([Stage('slow', lambda article: release.wait())], queue_size=2)
+    delivered = []
+    runner = threading.Thread(target=pipeline.run, args=(source(), delivered.append))
+    runner.start()
+    time.sleep(0.3)
+    
+    # Two queued, one in the worker's hands and one blocked in put()
+    assert len(produced) <= 4
+    release.set()
+    runner.join(timeout=5)
+    assert len(delivered) == 50
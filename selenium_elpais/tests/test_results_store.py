@@ -0,0 +1,105 @@
+"""Offline tests for the append-only results store and streaming result writers."""
+
+import csv
+import json
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.results_store import ResultsStore
+from utils.writers import StreamingJSONWriter, StreamingCSVWriter
+
+def test_results_store_rotates_segments_and_queries_by_time_and_url(tmp_path):
+    store = ResultsStore(root=tmp_path, max_segment_records=3)
+    for run_ts in ['2025-10-01T10:00:00', '2025-10-02T10:00:00']:
+        for i in range(2):
+            store.append({'index': i + 1, 'url': f'https://elpais.com/opinion/{i}.html', 'title': f'T{i} {run_ts}'}, run_ts)
+        store.append_run(run_ts, 2, {'word_frequency': {}})
+    store.close()
+    
+    reopened = ResultsStore(root=tmp_path, max_segment_records=3)
+    reopened.append({'index': 1, 'url': 'https://elpais.com/opinion/0.html', 'title': 'T0 late'}, '2025-10-03T10:00:00')
+    
+    assert len(list((tmp_path / 'segments').iterdir())) == 2
+    assert [r['title'] for r in reopened.query(start='2025-10-02', end='2025-10-02T23:59:59')] == [
+        'T0 2025-10-02T10:00:00', 'T1 2025-10-02T10:00:00'
+    ]
+    assert [r['run_ts'] for r in reopened.query(url='https://elpais.com/opinion/0.html')] == [
+        '2025-10-01T10:00:00', '2025-10-02T10:00:00', '2025-10-03T10:00:00'
+    ]
+    assert [r['run_ts'] for r in reopened.runs(start='2025-10-02')] == ['2025-10-02T10:00:00']
+    reopened.close()
+
+def test_results_store_recovers_from_a_crash_mid_segment(tmp_path):
+    # Append in a child process that dies without closing the segment
+    script = (
+        "import os, sys; sys.path.insert(0, sys.argv[1]);"
+        "from utils.results_store import ResultsStore;"
+        "store = ResultsStore(root=sys.argv[2]);"
+        "[store.append({'url': 'u%d' % i, 'title': 'before'}, '2025-10-01T10:00:00') for i in range(200)];"
+        "os._exit(0)"
+    )
+    subprocess.run([sys.executable, '-c', script, str(Path(__file__).parent.parent), str(tmp_path)], check=True)
+    
+    store = ResultsStore(root=tmp_path)
+    store.append({'url': 'u0', 'title': 'after'}, '2025-10-02T10:00:00')
+    records = list(store.query())
+    assert len(records) == 201
+    assert [r['title'] for r in store.query(url='u0')] == ['before', 'after']
+    assert len(list((tmp_path / 'segments').iterdir())) == 2
+    store.close()
+
+def test_results_store_drops_index_rows_past_the_end_of_the_file(tmp_path):
+    store = ResultsStore(root=tmp_path)
+    for i in range(3):
+        store.append({'url': f'u{i}'}, '2025-10-01T10:00:00')
+    store.close()
+    # An index that ran ahead of the file, as older versions could leave after a crash
+    db = sqlite3.connect(str(tmp_path / 'index.sqlite'))
+    with db:
+        segment = db.execute("SELECT name FROM segments").fetchone()[0]
+        db.execute("INSERT INTO records (url, run_ts, segment, line) VALUES ('ghost', '2025-10-01T10:00:00', ?, 3)",
+                    (segment,))
+        db.execute("UPDATE segments SET records = 4")
+    db.close()
+    
+    store = ResultsStore(root=tmp_path)
+    store.append({'url': 'u3'}, '2025-10-02T10:00:00')
+    assert [r['url'] for r in store.query()] == ['u0', 'u1', 'u2', 'u3']
+    assert list(store.query(url='ghost')) == []
+    store.close()
+
+def test_streaming_writers_publish_atomically_and_keep_partial_output(tmp_path):
+    articles = [{'index': 1, 'title': 'Título', 'url': 'u1'}, {'index': 2, 'title': 'Otro', 'url': 'u2'}]
+    
+    json_writer = StreamingJSONWriter(tmp_path / 'run.json', timestamp='2025-10-01T10:00:00')
+    csv_writer = StreamingCSVWriter(tmp_path / 'run.csv')
+    for article in articles:
+        json_writer.write_article(article)
+        csv_writer.write_article(article)
+    assert not (tmp_path / 'run.json').exists()
+    json_writer.finish({'word_frequency': {'otro': 3}})
+    csv_writer.finish()
+    
+    assert json.loads((tmp_path / 'run.json').read_text(encoding='utf-8')) == {
+        'timestamp': '2025-10-01T10:00:00',
+        'articles': articles,
+        'total_articles': 2,
+        'analysis': {'word_frequency': {'otro': 3}},
+    }
+    with open(tmp_path / 'run.csv', encoding='utf-8', newline='') as f:
+        assert [row['title'] for row in csv.DictReader(f)] == ['Título', 'Otro']
+    
+    empty = StreamingJSONWriter(tmp_path / 'empty.json')
+    empty.finish({})
+    assert json.loads((tmp_path / 'empty.json').read_text())['articles'] == []
+    
+    crashed = StreamingCSVWriter(tmp_path / 'crashed.csv')
+    crashed.write_article(articles[0])
+    crashed.abort()
+    assert not (tmp_path / 'crashed.csv').exists()
+    assert 'Título' in (tmp_path / 'crashed.csv.partial').read_text(encoding='utf-8')
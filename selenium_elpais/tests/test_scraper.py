@@ -0,0 +1,164 @@
+"""Offline tests for the Selenium scraper's field extraction, using fake drivers."""
+
+import sys
+import time
+from pathlib import Path
+
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+from test_driver_pool import FakeWarmPool
+from utils import driver_pool
+from utils.dedupe import NearDuplicateIndex
+from utils.scraper import EXTRACT_ARTICLES_JS, ElPaisScraper
+
+class FakeElement:
+    """An article element whose children are looked up by exact CSS selector."""
+    
+    def __init__(self, text='', attributes=None, children=None):
+        self.text = text
+        self.attributes = attributes or {}
+        self.children = children or {}
+    
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+    
+    def find_element(self, by, selector):
+        if selector not in self.children:
+            raise NoSuchElementException(selector)
+        return self.children[selector]
+
+class FakeDriver:
+    """Returns the given listing elements and answers execute_script from a callable."""
+    
+    def __init__(self, elements, script_result):
+        self.elements = elements
+        self.script_result = script_result
+        self.scripts = []
+    
+    def find_elements(self, by, selector):
+        return self.elements if selector == 'article' else []
+    
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        return self.script_result(*args)
+
+def article_element(title, url, content='', image=''):
+    children = {'a': FakeElement(attributes={'href': url})}
+    if title:
+        children['h2'] = FakeElement(title)
+    if content:
+        children['p'] = FakeElement(content)
+    if image:
+        children['img'] = FakeElement(attributes={'src': image})
+    return FakeElement(children=children)
+
+ELEMENTS = [
+    article_element('Primero', 'https://elpais.com/opinion/uno.html', 'Resumen uno', 'https://img/uno.jpg'),
+    article_element('', 'https://elpais.com/opinion/sin-titulo.html'),
+    article_element('Tercero', 'https://elpais.com/opinion/tres.html', 'Resumen tres'),
+]
+
+def js_result(elements, table):
+    """What EXTRACT_ARTICLES_JS returns for ELEMENTS."""
+    results = []
+    for element in elements:
+        data = {'title': '', 'content': '', 'author': '', 'date': '', 'url': '', 'image_url': '', 'matched': {}}
+        for field, key in (('title', 'h2'), ('content', 'p')):
+            if key in element.children:
+                data[field] = element.children[key].text
+                data['matched'][field] = key
+        data['url'] = element.children['a'].attributes['href']
+        if 'img' in element.children:
+            data['image_url'] = element.children['img'].attributes['src']
+        results.append(data)
+    return results
+
+def scrape(driver, monkeypatch):
+    monkeypatch.setattr(config, 'EXTRACTION_ENGINE', 'js')
+    monkeypatch.setattr(config, 'FULL_ARTICLE_WORKERS', 1)
+    scraper = ElPaisScraper()
+    scraper.driver = driver
+    scraper._scrape_full_article = lambda url: 'Cuerpo de ' + url
+    return list(scraper.iter_articles(max_articles=3))
+
+def test_js_extraction_reads_every_article_in_one_script(monkeypatch):
+    driver = FakeDriver(ELEMENTS, js_result)
+    
+    articles = scrape(driver, monkeypatch)
+    
+    assert driver.scripts == [EXTRACT_ARTICLES_JS]
+    assert [a['index'] for a in articles] == [1, 3]
+    assert articles[0] == {
+        'index': 1, 'title': 'Primero', 'content': 'Resumen uno', 'author': '', 'date': '',
+        'url': 'https://elpais.com/opinion/uno.html', 'image_url': 'https://img/uno.jpg', 'image_path': '',
+    }
+    assert articles[1]['image_url'] == ''
+
+def test_failed_or_malformed_script_falls_back_to_python_engine(monkeypatch):
+    def broken(elements, table):
+        raise WebDriverException('javascript error: querySelector is not a function')
+    
+    for script_result in (broken, lambda elements, table: js_result(elements, table)[:1]):
+        driver = FakeDriver(ELEMENTS, script_result)
+        
+        articles = scrape(driver, monkeypatch)
+        
+        assert len(driver.scripts) == 1
+        assert articles == scrape(FakeDriver(ELEMENTS, js_result), monkeypatch)
+
+def test_missing_fields_default_to_empty_and_content_is_fetched():
+    scraper = ElPaisScraper()
+    scraper._scrape_full_article = lambda url: 'Cuerpo de ' + url
+    
+    assert scraper.complete_article({'url': 'https://elpais.com/x.html'}, 1) is None
+    article = scraper.complete_article({'title': 'Sólo título', 'url': 'https://elpais.com/x.html', 'author': None}, 2)
+    assert article['author'] == '' and article['date'] == '' and article['image_url'] == ''
+    assert article['content'] == 'Cuerpo de https://elpais.com/x.html'
+    assert scraper.complete_article({'title': 'Sin enlace'}, 3, fetch_content=False)['content'] == ''
+
+def test_pooled_full_article_fetches_keep_index_order(monkeypatch):
+    monkeypatch.setattr(driver_pool, 'warm_pool', FakeWarmPool())
+    monkeypatch.setattr(config, 'EXTRACTION_ENGINE', 'js')
+    monkeypatch.setattr(config, 'FULL_ARTICLE_WORKERS', 4)
+    elements = [
+        article_element('Primero', 'https://elpais.com/opinion/uno.html', 'Resumen uno'),
+        article_element('Segundo', 'https://elpais.com/opinion/dos.html'),
+        article_element('Tercero', 'https://elpais.com/opinion/tres.html', 'Resumen tres'),
+    ]
+    scraper = ElPaisScraper()
+    scraper.driver = FakeDriver(elements, js_result)
+    
+    def slow_page(session, url):
+        time.sleep(0.2)
+        return 'Cuerpo de ' + url
+    scraper._load_full_article = slow_page
+    
+    articles = list(scraper.iter_articles(max_articles=3))
+    
+    assert [a['index'] for a in articles] == [1, 2, 3]
+    assert articles[1]['content'] == 'Cuerpo de https://elpais.com/opinion/dos.html'
+
+def test_near_duplicate_listing_items_are_skipped_before_the_page_fetch(monkeypatch):
+    monkeypatch.setattr(config, 'EXTRACTION_ENGINE', 'js')
+    monkeypatch.setattr(config, 'FULL_ARTICLE_WORKERS', 1)
+    teaser = 'El Gobierno presenta su plan de vivienda con ayudas al alquiler para jóvenes'
+    elements = [
+        article_element('La vivienda, otra vez', 'https://elpais.com/opinion/uno.html'),
+        article_element('La vivienda, otra vez', 'https://elpais.com/espana/uno.html'),
+        article_element('Un asunto distinto', 'https://elpais.com/opinion/tres.html'),
+    ]
+    elements[0].children['p'] = elements[1].children['p'] = FakeElement(teaser)
+    scraper = ElPaisScraper()
+    scraper.driver = FakeDriver(elements, js_result)
+    scraper.dedupe_index = NearDuplicateIndex(':memory:')
+    fetched = []
+    scraper._scrape_full_article = lambda url: fetched.append(url) or 'Cuerpo de ' + url
+    
+    articles = list(scraper.iter_articles(max_articles=3))
+    
+    assert [a['index'] for a in articles] == [1, 3]
+    assert fetched == ['https://elpais.com/opinion/tres.html']
@@ -0,0 +1,67 @@
+"""Offline tests for adaptive selector ordering."""
+
+import sys
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.http_scraper import parse_article_fields
+from utils.selector_stats import SelectorStats
+from utils.selector_tables import ARTICLE_FIELD_SELECTORS
+
+TITLES = ['h2', 'h2.c_h', 'h2 a', 'h3']
+
+def test_orders_by_hit_rate_and_keeps_table_order_for_ties():
+    stats = SelectorStats(skip_after=0)
+    assert stats.order('title', TITLES) == TITLES
+    
+    for _ in range(5):
+        stats.record('title', TITLES, 'h3')
+    assert stats.order('title', TITLES) == ['h3', 'h2', 'h2.c_h', 'h2 a']
+    
+    # Selectors after the match were not tried and keep their neutral score
+    stats.record('date', ['time', '.date'], 'time')
+    assert list(stats.hit_rates('date')) == ['time']
+    assert stats.order('date', ['time', '.date']) == ['time', '.date']
+
+def test_skips_consistent_misses_and_reprobes():
+    stats = SelectorStats(skip_after=3, reprobe_every=4)
+    for _ in range(3):
+        stats.record('title', TITLES, 'h2 a')
+    
+    orders = [stats.order('title', TITLES) for _ in range(4)]
+    assert orders[0] == ['h2 a', 'h3']
+    assert orders[3][0] == 'h2 a' and set(orders[3]) == set(TITLES)
+    assert stats.skipped == 6
+    
+    # A field missing from every article is never skipped entirely
+    for _ in range(5):
+        stats.record('author', ['.c_a_a', '.author'], None)
+    assert stats.order('author', ['.c_a_a', '.author']) == ['.c_a_a', '.author']
+
+def test_statistics_persist_across_runs(tmp_path):
+    path = tmp_path / 'selector_stats.json'
+    stats = SelectorStats(path, skip_after=0)
+    for _ in range(3):
+        stats.record('body', ['article p', '.a_c p'], '.a_c p')
+    stats.close()
+    
+    reloaded = SelectorStats(path, skip_after=0)
+    assert reloaded.order('body', ['article p', '.a_c p']) == ['.a_c p', 'article p']
+    assert "body '.a_c p'" in reloaded.summary()
+    
+    path.write_text('not json')
+    assert SelectorStats(path).fields == {}
+
+def test_http_parsing_learns_the_matching_selector():
+    stats = SelectorStats(skip_after=2, reprobe_every=100)
+    node = BeautifulSoup('<article><h3>Sólo un h3</h3><a href="/opinion/x.html">x</a></article>', 'lxml').article
+    for _ in range(3):
+        assert parse_article_fields(node, 'https://elpais.com/', stats)['title'] == 'Sólo un h3'
+    assert stats.order('title', ARTICLE_FIELD_SELECTORS['title'])[0] == 'h3'
+    # Once 'h3' leads, the selectors that missed on the first article are no longer probed
+    assert stats.fields['title']['h2']['tries'] == 1
+    assert stats.fields['title']['h3']['hits'] > 2
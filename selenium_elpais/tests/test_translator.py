@@ -0,0 +1,199 @@
+"""Offline tests for RapidTranslator against a local stub translation server."""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+from utils import RapidTranslator, AsyncRapidTranslator
+from utils.async_translator import AdaptiveRateLimiter
+from utils.pipeline import Pipeline, Stage
+from utils.translation_cache import TranslationCache
+
+class StubTranslationHandler(BaseHTTPRequestHandler):
+    """Translates by prefixing 'EN:'.
+    
+    Any batch containing 'FALLA' is rejected with a 500, 'LIMITE' is throttled
+    with a 429 on its first request, and 'ROTO' is always a 400.
+    """
+    
+    calls = []
+    throttled = set()
+    
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.calls.append(payload['q'])
+        texts = payload['q']
+        if isinstance(texts, list) and len(texts) > 1 and any('FALLA' in t for t in texts):
+            self.send_response(500)
+            self.end_headers()
+            return
+        if isinstance(texts, str) and 'LIMITE' in texts and texts not in self.throttled:
+            self.throttled.add(texts)
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+        if isinstance(texts, str) and 'ROTO' in texts:
+            self.send_response(400)
+            self.end_headers()
+            return
+        if isinstance(texts, list):
+            body = ['EN:' + t for t in texts]
+        else:
+            body = ['EN:' + texts]
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def translator(monkeypatch, tmp_path):
+    StubTranslationHandler.calls = []
+    StubTranslationHandler.throttled = set()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubTranslationHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(config, 'TRANSLATE_BATCH_DELAY', 0)
+    translator = RapidTranslator(cache=TranslationCache(path=tmp_path / 'translations.sqlite'))
+    translator.api_url = f"http://127.0.0.1:{server.server_port}/translate"
+    yield translator
+    translator.cache.close()
+    server.shutdown()
+
+def test_plan_batches_respects_item_and_payload_limits():
+    texts = ['a' * 10, 'b' * 10, 'c' * 10, 'd' * 100, 'e']
+    
+    assert RapidTranslator.plan_batches(texts, max_items=2, max_bytes=1000) == [[0, 1], [2, 3], [4]]
+    assert RapidTranslator.plan_batches(texts, max_items=10, max_bytes=40) == [[0, 1, 2], [3], [4]]
+
+def test_translate_articles_batches_titles_and_content(translator):
+    articles = [
+        {'index': 1, 'title': 'Uno', 'content': 'Contenido uno'},
+        {'index': 2, 'title': '', 'content': ''},
+        {'index': 3, 'title': 'Tres', 'content': ''},
+    ]
+    
+    translator.translate_articles(articles, batch=True, include_content=True)
+    
+    assert StubTranslationHandler.calls == [['Uno', 'Tres', 'Contenido uno']]
+    assert articles[0]['title_english'] == 'EN:Uno'
+    assert articles[0]['content_english'] == 'EN:Contenido uno'
+    assert 'title_english' not in articles[1]
+    assert articles[2]['title_english'] == 'EN:Tres'
+    assert 'content_english' not in articles[2]
+
+def test_streaming_translate_stage_packs_titles_into_batch_requests(translator, monkeypatch):
+    monkeypatch.setattr(config, 'TRANSLATE_BATCH_MODE', True)
+    articles = [{'index': i, 'title': f'Titular {i}'} for i in range(1, 7)]
+    stage = Stage('translate', translator.translate_article_batch, batch_size=4, batch_wait=1.0)
+    
+    delivered = []
+    Pipeline([stage], queue_size=8).run(articles, sink=delivered.append)
+    
+    assert [a['title_english'] for a in delivered] == [f'EN:Titular {i}' for i in range(1, 7)]
+    assert StubTranslationHandler.calls == [[f'Titular {i}' for i in range(1, 5)], ['Titular 5', 'Titular 6']]
+
+def test_failed_batch_falls_back_to_per_item_requests(translator, monkeypatch):
+    monkeypatch.setattr(config, 'TRANSLATE_BATCH_SIZE', 2)
+    
+    result = translator.translate_batch(['uno', 'FALLA', 'tres'])
+    
+    assert result == ['EN:uno', 'EN:FALLA', 'EN:tres']
+    assert StubTranslationHandler.calls == [['uno', 'FALLA'], ['tres'], 'uno', 'FALLA']
+    # Each text is looked up in the cache once, retries included
+    assert translator.cache.stats['misses'] == 3
+
+def test_translation_cache_serves_repeats_without_api_calls(translator, tmp_path):
+    assert translator.translate_text('Hola  mundo') == 'EN:Hola  mundo'
+    assert translator.translate_text(' Hola mundo ') == 'EN:Hola  mundo'
+    assert translator.translate_batch(['Hola mundo', 'Adiós']) == ['EN:Hola  mundo', 'EN:Adiós']
+    
+    assert StubTranslationHandler.calls == ['Hola  mundo', ['Adiós']]
+    assert translator.cache.stats == {'memory_hits': 2, 'disk_hits': 0, 'misses': 2}
+    
+    reopened = TranslationCache(path=tmp_path / 'translations.sqlite')
+    assert reopened.get('Adiós') == 'EN:Adiós'
+    assert reopened.stats['disk_hits'] == 1
+    reopened.close()
+
+def test_translation_cache_ttl_and_size_eviction(tmp_path):
+    cache = TranslationCache(path=tmp_path / 'translations.sqlite', ttl=60, max_entries=2, memory_size=1)
+    for word in ['uno', 'dos', 'tres']:
+        cache.put(word, word.upper())
+    cache.get('dos')
+    
+    assert cache.evict() == 1
+    assert cache.get('uno') is None
+    assert cache.get('tres') == 'TRES'
+    
+    cache.ttl = 1e-9
+    assert cache.get('tres') is None
+    cache.close()
+
+def test_async_translator_records_status_and_retries_throttled_items(translator, monkeypatch):
+    monkeypatch.setattr(config, 'TRANSLATE_BACKOFF_BASE', 0.01)
+    translator.cache.put('Guardado', 'EN:Guardado')
+    async_translator = AsyncRapidTranslator(cache=translator.cache, concurrency=3, max_retries=2,
+                                            rate_limiter=AdaptiveRateLimiter(rate=100))
+    async_translator.api_url = translator.api_url
+    articles = [
+        {'index': 1, 'title': 'Uno'},
+        {'index': 2, 'title': 'LIMITE'},
+        {'index': 3, 'title': 'Guardado'},
+        {'index': 4, 'title': 'ROTO'},
+        {'index': 5, 'title': ''},
+    ]
+    
+    async_translator.translate_articles(articles)
+    
+    assert [a.get('translation_status') for a in articles] == ['translated', 'translated', 'cached', 'fallback', None]
+    assert [a.get('title_english') for a in articles] == ['EN:Uno', 'EN:LIMITE', 'EN:Guardado', 'ROTO', None]
+    assert StubTranslationHandler.calls.count('LIMITE') == 2
+    assert StubTranslationHandler.calls.count('ROTO') == 1
+    assert async_translator.rate_limiter.rate < 100
+
+def test_rate_limiter_pauses_on_exhausted_quota_headers():
+    limiter = AdaptiveRateLimiter(rate=10)
+    
+    limiter.observe(200, {'X-RateLimit-Requests-Remaining': '0', 'X-RateLimit-Requests-Reset': '5'})
+    
+    assert limiter.tokens == 0
+    assert limiter.paused_until > time.monotonic() + 4
+
+def test_async_translator_shares_one_loop_across_pipeline_threads(translator):
+    async_translator = AsyncRapidTranslator(cache=translator.cache, concurrency=2,
+                                            rate_limiter=AdaptiveRateLimiter(rate=100))
+    async_translator.api_url = translator.api_url
+    articles = [{'index': i, 'title': f'Hilo {i}'} for i in range(1, 9)]
+    stage = Stage('translate', async_translator.translate_article, workers=4)
+    
+    delivered = []
+    Pipeline([stage], queue_size=4).run(articles, sink=delivered.append)
+    
+    assert sorted(a['title_english'] for a in delivered) == sorted(f'EN:Hilo {i}' for i in range(1, 9))
+    assert async_translator._limit is not None
+    loop = async_translator._loop
+    async_translator.close()
+    assert loop.is_closed()
+
+def test_translate_text_async_can_be_awaited_directly(translator):
+    async_translator = AsyncRapidTranslator(cache=translator.cache, rate_limiter=AdaptiveRateLimiter(rate=100))
+    async_translator.api_url = translator.api_url
+    
+    assert asyncio.run(async_translator.translate_text_async('Directo')) == ('EN:Directo', 'translated')
+    async_translator.session.close()
@@ -0,0 +1,106 @@
+"""Offline tests for the per-phase wait policy, using a fake driver."""
+
+import sys
+import time
+from pathlib import Path
+
+from selenium.common.exceptions import ElementClickInterceptedException, NoSuchElementException
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+from utils.waits import CONSENT_BUTTON, WaitPolicy
+
+class FakeElement:
+    def __init__(self, text='', displayed=True, click_error=None):
+        self.text = text
+        self.displayed = displayed
+        self.click_error = click_error
+        self.clicked = False
+    
+    def is_displayed(self):
+        return self.displayed
+    
+    def is_enabled(self):
+        return True
+    
+    def click(self):
+        if self.click_error:
+            raise self.click_error
+        self.clicked = True
+        self.displayed = False
+
+class FakeDriver:
+    """Serves a scripted sequence of document states, one per poll."""
+    
+    def __init__(self, states=(), consent_button=None):
+        self.states = list(states)
+        self.polls = 0
+        self.consent_button = consent_button
+    
+    def execute_script(self, script):
+        # Each poll starts by checking document.readyState
+        self.state = self.states[min(self.polls, len(self.states) - 1)]
+        self.polls += 1
+        return self.state[0]
+    
+    def find_elements(self, by, selector):
+        return self.state[1]
+    
+    def find_element(self, by, value):
+        if (by, value) != CONSENT_BUTTON or self.consent_button is None:
+            raise NoSuchElementException(value)
+        return self.consent_button
+
+def test_wait_times_out_within_the_phase_budget(monkeypatch):
+    monkeypatch.setattr(config, 'EXPLICIT_WAIT', 0.1)
+    policy = WaitPolicy(FakeDriver([('complete', [])]), budgets={'listing': 0.5})
+    calls = []
+    
+    started = time.monotonic()
+    assert policy.wait_for('listing', lambda driver: calls.append(1)) is None
+    elapsed = time.monotonic() - started
+    
+    assert 0.5 <= elapsed < 1.5
+    assert 2 <= len(calls) <= 4
+    
+    # Phases without a budget fall back to EXPLICIT_WAIT
+    started = time.monotonic()
+    assert policy.wait_for('unknown', lambda driver: False) is None
+    assert time.monotonic() - started < 1
+
+def test_wait_polls_until_the_condition_holds():
+    policy = WaitPolicy(FakeDriver([('complete', [])]), budgets={'listing': 5})
+    calls = []
+    
+    def third_time(driver):
+        calls.append(1)
+        return 'ready' if len(calls) == 3 else None
+    
+    assert policy.wait_for('listing', third_time) == 'ready'
+    assert len(calls) == 3
+
+def test_ready_conditions_wait_for_loaded_document_and_text():
+    body = FakeElement('Primer párrafo.')
+    driver = FakeDriver([
+        ('loading', [body]),
+        ('complete', [FakeElement('  ')]),
+        ('complete', [FakeElement('  '), body]),
+    ])
+    policy = WaitPolicy(driver, budgets={'article': 5, 'listing': 0.3})
+    
+    assert policy.article_body_ready()
+    assert driver.polls == 3
+    
+    assert not WaitPolicy(FakeDriver([('complete', [])]), budgets={'listing': 0.3}).listing_ready()
+
+def test_consent_is_dismissed_only_when_shown_and_clickable():
+    button = FakeElement()
+    assert WaitPolicy(FakeDriver(consent_button=button), budgets={'consent': 1}).dismiss_consent()
+    assert button.clicked and not button.displayed
+    
+    assert not WaitPolicy(FakeDriver(), budgets={'consent': 0.3}).dismiss_consent()
+    
+    blocked = FakeElement(click_error=ElementClickInterceptedException('overlay'))
+    assert not WaitPolicy(FakeDriver(consent_button=blocked), budgets={'consent': 1}).dismiss_consent()
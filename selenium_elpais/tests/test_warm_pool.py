@@ -0,0 +1,125 @@
+"""Offline tests for cached driver resolution and the warm browser pool."""
+
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+from utils import drivers, warm_pool as warm_pool_module
+from utils.warm_pool import WarmPool
+
+class FakeDriver:
+    """Just enough of a WebDriver for the pool: state, reset calls and quit."""
+    
+    def __init__(self, key):
+        self.key = key
+        self.cookies = {'euconsent': 'yes'}
+        self.current_url = 'https://elpais.com/opinion/'
+        self.window_handles = ['main']
+        self.quit_called = False
+        self.broken = False
+        self.switch_to = self
+    
+    def window(self, handle):
+        pass
+    
+    def execute_script(self, script):
+        if self.broken:
+            raise RuntimeError('session deleted because of page crash')
+    
+    def delete_all_cookies(self):
+        self.cookies = {}
+    
+    def get(self, url):
+        self.current_url = url
+    
+    def implicitly_wait(self, seconds):
+        pass
+    
+    def set_page_load_timeout(self, seconds):
+        pass
+    
+    def quit(self):
+        self.quit_called = True
+
+class FakeManager:
+    installs = 0
+    path = None
+    
+    def install(self):
+        FakeManager.installs += 1
+        if FakeManager.path is None:
+            raise ConnectionError('Could not reach host. Are you offline?')
+        return FakeManager.path
+
+def test_driver_path_is_cached_and_reused_offline(tmp_path, monkeypatch):
+    binary = tmp_path / 'chromedriver'
+    binary.write_bytes(b'')
+    monkeypatch.setattr(config, 'DRIVER_CACHE_PATH', tmp_path / 'drivers.json')
+    monkeypatch.setattr(config, 'DRIVER_PATHS', {'chrome': '', 'firefox': ''})
+    monkeypatch.setitem(drivers.DRIVER_MANAGERS, 'chrome', FakeManager)
+    monkeypatch.setattr(FakeManager, 'installs', 0)
+    monkeypatch.setattr(FakeManager, 'path', str(binary))
+    
+    assert drivers.resolve_driver_path('chrome') == str(binary)
+    assert drivers.resolve_driver_path('Chrome') == str(binary)
+    assert FakeManager.installs == 1
+    
+    # Past the TTL resolution is retried; offline, the stale path still works
+    monkeypatch.setattr(config, 'DRIVER_CACHE_TTL', 0)
+    monkeypatch.setattr(FakeManager, 'path', None)
+    assert drivers.resolve_driver_path('chrome') == str(binary)
+    assert FakeManager.installs == 2
+    
+    monkeypatch.setattr(config, 'DRIVER_PATHS', {'chrome': '/opt/chromedriver', 'firefox': ''})
+    assert drivers.resolve_driver_path('chrome') == '/opt/chromedriver'
+    assert FakeManager.installs == 2
+
+def test_released_browsers_are_reset_and_reused(monkeypatch):
+    monkeypatch.setattr(warm_pool_module, 'create_driver', lambda browser, headless: FakeDriver((browser, headless)))
+    pool = WarmPool(size=1, max_uses=2)
+    
+    first = pool.acquire('firefox')
+    assert pool.release(first)
+    assert first.cookies == {} and first.current_url == 'about:blank'
+    assert pool.acquire('firefox') is first
+    assert pool.acquire('firefox', headless=False) is not first
+    
+    # Replaced after max_uses runs, and when the reset fails
+    assert not pool.release(first) and first.quit_called
+    second = pool.acquire('firefox')
+    second.broken = True
+    assert not pool.release(second) and second.quit_called
+    assert pool.idle_count() == 0
+
+def test_prelaunched_browsers_are_handed_out_and_closed(monkeypatch):
+    def slow_create(browser, headless):
+        time.sleep(0.05)
+        return FakeDriver((browser, headless))
+    monkeypatch.setattr(warm_pool_module, 'create_driver', slow_create)
+    pool = WarmPool(size=2)
+    
+    assert pool.prelaunch('chrome', count=5) == 2
+    driver = pool.acquire('chrome')
+    assert driver.key == ('chrome', True)
+    pool.close()
+    assert pool.idle_count() == 0
+    assert not driver.quit_called
+    
+    disabled = WarmPool(size=0)
+    assert disabled.prelaunch('chrome') == 0
+    assert not disabled.release(disabled.acquire('chrome'))
+
+def test_draining_pool_quits_released_browsers_without_reset(monkeypatch):
+    monkeypatch.setattr(warm_pool_module, 'create_driver', lambda browser, headless: FakeDriver((browser, headless)))
+    pool = WarmPool(size=1)
+    
+    driver = pool.acquire('firefox')
+    pool.drain()
+    assert not pool.release(driver)
+    assert driver.quit_called
+    assert driver.cookies == {'euconsent': 'yes'}
+    assert pool.idle_count() == 0
@@ -1,7 +1,9 @@
 """Utility modules for El País scraper."""
 
 from .scraper import ElPaisScraper
+from .http_scraper import HttpScraper
 from .translator import RapidTranslator
+from .async_translator import AsyncRapidTranslator
 from .analyzer import TextAnalyzer
 
-__all__ = ['ElPaisScraper', 'RapidTranslator', 'TextAnalyzer']
\ No newline at end of file
+__all__ = ['ElPaisScraper', 'HttpScraper', 'RapidTranslator', 'AsyncRapidTranslator', 'TextAnalyzer']
\ No newline at end of file
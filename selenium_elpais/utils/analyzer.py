@@ -1,7 +1,13 @@
 """Text analysis module for word frequency analysis."""
 
-import re
-from collections import Counter
+import math
+from pathlib import Path
+
+from .corpus import CorpusAnalytics
+from .dedupe import NearDuplicateIndex
+from .metrics import metrics
+from .sketch import HeavyHitters
+from .tokenizer import DEFAULT_TOKENIZER, WORD_PATTERN, Tokenizer
 
 class TextAnalyzer:
     """Analyzer for text processing and word frequency analysis."""
@@ -17,13 +23,8 @@ class TextAnalyzer:
         Returns:
             str: Cleaned text
         """
-        # Convert to lowercase
-        text = text.lower()
-        # Remove punctuation and special characters
-        text = re.sub(r'[^\w\s]', ' ', text)
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        return text
+        # Lowercase, then keep only runs of word characters (drops punctuation and extra whitespace)
+        return ' '.join(WORD_PATTERN.findall(text.lower()))
     
     @staticmethod
     def get_words(text):
@@ -36,17 +37,34 @@ class TextAnalyzer:
         Returns:
             list: List of words
         """
-        cleaned = TextAnalyzer.clean_text(text)
-        return cleaned.split()
+        return DEFAULT_TOKENIZER.tokenize(text)
+    
+    @staticmethod
+    def count_words(texts, fold=False):
+        """
+        Count words across many texts in one pass.
+        
+        Args:
+            texts (iterable): Input texts
+            fold (bool): Fold accents so 'opinión' and 'opinion' count together
+            
+        Returns:
+            Counter: Word counts
+        """
+        tokenizer = Tokenizer(fold=True) if fold else DEFAULT_TOKENIZER
+        return tokenizer.count(texts)
     
     @staticmethod
-    def analyze_word_frequency(articles, min_count=3):
+    def analyze_word_frequency(articles, min_count=3, corpus=None, approximate=False, epsilon=0.001):
         """
         Analyze word frequency across article titles.
         
         Args:
             articles (list): List of article dictionaries
             min_count (int): Minimum count for a word to be included (default: 3, means >2)
+            corpus (CorpusAnalytics): Corpus already built from the articles, to avoid tokenizing them again
+            approximate (bool): Count with bounded memory (HeavyHitters) instead of an exact Counter
+            epsilon (float): Error bound of approximate counts, as a fraction of all words
             
         Returns:
             dict: Dictionary of words and their counts
@@ -55,17 +73,45 @@ class TextAnalyzer:
         print(f"ANALYZING TRANSLATED HEADERS (Words repeated more than 2 times)")
         print(f"{'='*60}\n")
         
-        # Collect all words from translated titles
-        all_words = []
-        for article in articles:
-            title_en = article.get('title_english', '')
-            if title_en:
-                words = TextAnalyzer.get_words(title_en)
-                all_words.extend(words)
+        if approximate:
+            counts = TextAnalyzer.heavy_hitters(epsilon)
+            for article in articles:
+                counts.update(TextAnalyzer.get_words(article.get('title_english') or ''))
+            return TextAnalyzer.select_repeated(counts, min_count)
+        
+        if corpus is None:
+            corpus = CorpusAnalytics(fields='title')
+            for article in articles:
+                corpus.add(article)
         
-        # Count word frequencies
-        word_counts = Counter(all_words)
+        return TextAnalyzer.select_repeated(corpus.term_counts, min_count)
+    
+    @staticmethod
+    def heavy_hitters(epsilon=0.001):
+        """
+        Bounded-memory word counter that can be fed incrementally.
         
+        Args:
+            epsilon (float): Error bound as a fraction of all counted words;
+                memory grows with 1 / epsilon, not with the vocabulary
+            
+        Returns:
+            HeavyHitters: Counter-like approximate counter
+        """
+        return HeavyHitters(epsilon)
+    
+    @staticmethod
+    def select_repeated(word_counts, min_count=3):
+        """
+        Keep words counted at least min_count times, most frequent first.
+        
+        Args:
+            word_counts (dict): Dictionary (or HeavyHitters) of words and their counts
+            min_count (int): Minimum count for a word to be included
+            
+        Returns:
+            dict: Dictionary of words and their counts
+        """
         # Filter words that appear more than min_count-1 times (i.e., >= min_count)
         repeated_words = {word: count for word, count in word_counts.items() 
                          if count >= min_count}
@@ -98,18 +144,44 @@ class TextAnalyzer:
         print()
     
     @staticmethod
-    def analyze_articles(articles):
+    def collapse_duplicates(articles, index=None):
+        """
+        Drop near-duplicate articles so reposts do not skew word counts.
+        
+        Args:
+            articles (list): List of article dictionaries
+            index (NearDuplicateIndex): Index to consult (default: a fresh in-memory one)
+            
+        Returns:
+            list: Articles that are not near-duplicates of an earlier one
+        """
+        if index is None:
+            index = NearDuplicateIndex(':memory:', max_age_days=0)
+        return [a for a in articles if not a.get('duplicate_of') and index.check(a) is None]
+    
+    @staticmethod
+    def analyze_articles(articles, dedupe=False):
         """
         Complete analysis of articles.
         
         Args:
             articles (list): List of article dictionaries
+            dedupe (bool): Collapse near-duplicates before counting
             
         Returns:
             dict: Analysis results including word frequency
         """
-        # Analyze word frequency (words appearing more than 2 times)
-        word_frequency = TextAnalyzer.analyze_word_frequency(articles, min_count=3)
+        if dedupe:
+            articles = TextAnalyzer.collapse_duplicates(articles)
+        
+        with metrics.timer('analysis', step='batch'):
+            # Tokenize every translated title once; frequency and totals share the result
+            corpus = CorpusAnalytics(fields='title')
+            for article in articles:
+                corpus.add(article)
+            
+            # Analyze word frequency (words appearing more than 2 times)
+            word_frequency = TextAnalyzer.analyze_word_frequency(articles, min_count=3, corpus=corpus)
         
         # Print results
         TextAnalyzer.print_word_frequency(word_frequency)
@@ -117,6 +189,99 @@ class TextAnalyzer:
         return {
             'word_frequency': word_frequency,
             'total_articles': len(articles),
-            'total_words_analyzed': sum(len(TextAnalyzer.get_words(a.get('title_english', ''))) 
-                                       for a in articles)
-        }
\ No newline at end of file
+            'total_words_analyzed': corpus.total_tokens
+        }
+
+# Settings of the cross-run corpus history: Spanish bodies and English titles, accents folded
+HISTORY_OPTIONS = {'fields': 'both', 'stopwords': ('es', 'en'), 'fold': True}
+
+class IncrementalAnalyzer:
+    """Word frequency analysis fed one article at a time.
+    
+    Produces the same result as TextAnalyzer.analyze_articles without holding
+    the articles, so it can sit at the end of a streaming pipeline. With a
+    history path, counters for articles that are new or changed in this run are
+    merged into a saved corpus, so trends across runs never re-read old articles.
+    Articles re-processed because they changed (or with --full) count again.
+    
+    In approximate mode title words go into a HeavyHitters counter and the
+    history corpus keeps only its ceil(1 / epsilon) most frequent terms, so
+    memory and the saved history stay flat however long the analyzer is fed.
+    """
+    
+    def __init__(self, min_count=3, history_path=None, top_k=10, approximate=False, epsilon=0.001):
+        self.min_count = min_count
+        self.top_k = top_k
+        self.history_path = Path(history_path) if history_path else None
+        self.corpus = CorpusAnalytics(fields='title')
+        self.word_counts = TextAnalyzer.heavy_hitters(epsilon) if approximate else self.corpus.term_counts
+        self.history_max_terms = math.ceil(1 / epsilon) if approximate else None
+        self.new_terms = CorpusAnalytics(**HISTORY_OPTIONS, max_terms=self.history_max_terms)
+    
+    def add(self, article):
+        """Count the words of one article's translated title; near-duplicates are skipped."""
+        if article.get('duplicate_of'):
+            return article
+        with metrics.timer('analysis', step='add'):
+            if isinstance(self.word_counts, HeavyHitters):
+                tokens = self.corpus.tokenize(article)
+                self.word_counts.update(tokens)
+                self.corpus.doc_count += 1
+                self.corpus.total_tokens += len(tokens)
+            else:
+                self.corpus.add(article)
+            if not article.get('unchanged'):
+                self.new_terms.add(article)
+        return article
+    
+    def save_history(self):
+        """
+        Merge this run's new articles into the saved corpus history.
+        
+        Returns:
+            CorpusAnalytics: The updated history, or None without a history path
+        """
+        if not self.history_path:
+            return None
+        history = CorpusAnalytics(**HISTORY_OPTIONS, max_terms=self.history_max_terms)
+        if self.history_path.exists():
+            history = CorpusAnalytics.load(self.history_path, max_terms=self.history_max_terms)
+        try:
+            history.merge(self.new_terms)
+        except ValueError:
+            print(f"\u26a0 Corpus history at {self.history_path} uses other settings, starting a new one")
+            history = CorpusAnalytics(**HISTORY_OPTIONS, max_terms=self.history_max_terms).merge(self.new_terms)
+        history.save(self.history_path)
+        return history
+    
+    def analysis(self):
+        """
+        Build the analysis for everything added so far.
+        
+        Returns:
+            dict: Analysis results including word frequency
+        """
+        print(f"\n{'='*60}")
+        print(f"ANALYZING TRANSLATED HEADERS (Words repeated more than 2 times)")
+        print(f"{'='*60}\n")
+        
+        with metrics.timer('analysis', step='report'):
+            word_frequency = TextAnalyzer.select_repeated(self.word_counts, self.min_count)
+        TextAnalyzer.print_word_frequency(word_frequency)
+        
+        analysis = {
+            'word_frequency': word_frequency,
+            'total_articles': self.corpus.doc_count,
+            'total_words_analyzed': self.corpus.total_tokens
+        }
+        
+        with metrics.timer('analysis', step='history'):
+            history = self.save_history()
+        if history is not None:
+            analysis['history_documents'] = history.doc_count
+            analysis['trending_terms'] = history.top_k(self.top_k, by='tfidf')
+            print(f"Trending terms across {history.doc_count} article(s) of history:")
+            for term, score in analysis['trending_terms'].items():
+                print(f"  '{term}': {score}")
+            print()
+        return analysis
@@ -0,0 +1,113 @@
+"""Persistent seen-URL index with content fingerprints for incremental runs."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    record TEXT NOT NULL
+);
+"""
+
+# Listing fields that define whether an article changed
+FINGERPRINT_FIELDS = ('title', 'content', 'author', 'date', 'image_url')
+
+# Per-run fields that are not carried over from a previous run
+TRANSIENT_FIELDS = ('index', 'unchanged', 'fingerprint')
+
+class ArticleIndex:
+    """Index of previously processed articles keyed by URL.
+    
+    Each entry stores a fingerprint of the article's listing fields and the
+    fully processed record (content, image path, translation). When an article
+    comes back with the same fingerprint, the stored record is reused and the
+    expensive stages skip it. With ``full_refresh`` every article is treated as
+    new, but the index is still updated.
+    """
+    
+    def __init__(self, path=None, full_refresh=False):
+        self.path = Path(path or config.ARTICLE_INDEX_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.full_refresh = full_refresh
+        self.stats = {'new': 0, 'changed': 0, 'unchanged': 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+    
+    @staticmethod
+    def fingerprint(article):
+        """SHA-256 over the article's listing fields."""
+        payload = json.dumps([article.get(f, '') for f in FINGERPRINT_FIELDS], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def check(self, article):
+        """
+        Fingerprint an article and restore its stored record if it is unchanged.
+        
+        Sets 'fingerprint' on the article, and 'unchanged' plus the previously
+        processed fields when the URL was seen with the same fingerprint.
+        
+        Args:
+            article (dict): Article with listing fields filled in
+            
+        Returns:
+            bool: True if the article is unchanged since it was last indexed
+        """
+        article['fingerprint'] = self.fingerprint(article)
+        if not article.get('url'):
+            return False
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fingerprint, record FROM articles WHERE url = ?", (article['url'],)
+            ).fetchone()
+        
+        if row is None:
+            status = 'new'
+        elif row[0] != article['fingerprint'] or self.full_refresh:
+            status = 'changed'
+        else:
+            status = 'unchanged'
+        with self._lock:
+            self.stats[status] += 1
+        
+        if status != 'unchanged':
+            return False
+        for key, value in json.loads(row[1]).items():
+            if key not in TRANSIENT_FIELDS and value and not article.get(key):
+                article[key] = value
+        article['unchanged'] = True
+        return True
+    
+    def record(self, article):
+        """Store or refresh the processed record for an article."""
+        if not article.get('url'):
+            return
+        fingerprint = article.get('fingerprint') or self.fingerprint(article)
+        record = {k: v for k, v in article.items() if k not in TRANSIENT_FIELDS}
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO articles (url, fingerprint, first_seen, last_seen, record) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET fingerprint = excluded.fingerprint, "
+                "last_seen = excluded.last_seen, record = excluded.record",
+                (article['url'], fingerprint, now, now, json.dumps(record, ensure_ascii=False))
+            )
+    
+    def summary(self):
+        """One-line new/changed/unchanged summary."""
+        return f"{self.stats['new']} new, {self.stats['changed']} changed, {self.stats['unchanged']} unchanged"
+    
+    def close(self):
+        """Close the index database."""
+        with self._lock:
+            self._db.close()
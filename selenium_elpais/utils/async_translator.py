@@ -0,0 +1,299 @@
+"""Asyncio translation client with adaptive rate limiting and retries."""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+import config
+from .http_session import create_http_session
+from .metrics import metrics
+from .translator import RapidTranslator
+
+# Per-item outcomes recorded on articles as 'translation_status'
+STATUS_TRANSLATED = 'translated'
+STATUS_CACHED = 'cached'
+STATUS_FALLBACK = 'fallback'
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+def _parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def _header(headers, *names):
+    """First present header among several spellings (RapidAPI prefixes vary)."""
+    for name in names:
+        if name in headers:
+            return headers[name]
+    return None
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate adapts to the server's throttling signals.
+    
+    A 429 halves the rate and pauses the bucket for the Retry-After period.
+    X-RateLimit-Remaining of zero pauses it until X-RateLimit-Reset. Each
+    successful response nudges the rate back up towards the configured maximum.
+    
+    The bucket state is guarded by a thread lock that is never held across an
+    await, so one limiter can be shared by coroutines on several event loops.
+    """
+    
+    def __init__(self, rate=None, capacity=None, min_rate=0.2):
+        self.max_rate = rate or config.TRANSLATE_RATE_LIMIT
+        self.rate = self.max_rate
+        self.min_rate = min(min_rate, self.max_rate)
+        self.capacity = capacity or max(1.0, self.max_rate)
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.RLock()
+    
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+            await asyncio.sleep(delay)
+    
+    def pause(self, seconds):
+        """Stop handing out tokens for the given number of seconds."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0
+    
+    def observe(self, status_code, headers):
+        """
+        Adapt to a response.
+        
+        Args:
+            status_code (int): HTTP status of the response
+            headers (Mapping): Response headers
+            
+        Returns:
+            float: Server-requested delay in seconds, or None
+        """
+        retry_after = _parse_retry_after(headers.get('Retry-After'))
+        with self._lock:
+            if status_code == 429:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.pause(retry_after if retry_after is not None else 1 / self.rate)
+                return retry_after
+            
+            remaining = _header(headers, 'X-RateLimit-Remaining', 'X-RateLimit-Requests-Remaining')
+            reset = _header(headers, 'X-RateLimit-Reset', 'X-RateLimit-Requests-Reset')
+            try:
+                if remaining is not None and int(remaining) <= 0 and reset is not None:
+                    self.pause(float(reset))
+            except ValueError:
+                pass
+            if status_code < 400:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+        return retry_after
+
+class AsyncRapidTranslator(RapidTranslator):
+    """Translator that runs many requests concurrently under an adaptive rate limit.
+    
+    Runs alongside the synchronous RapidTranslator and shares its cache,
+    response parsing and output. HTTP calls go through a pooled keep-alive
+    session on worker threads, bounded by a semaphore. Every item ends up
+    with an explicit status instead of silently keeping the original text.
+    
+    The synchronous entry points submit their work to one long-lived event
+    loop on a background thread, so calls from several pipeline workers share
+    the semaphore and the rate limiter instead of each running its own loop.
+    """
+    
+    def __init__(self, cache=None, concurrency=None, max_retries=None, rate_limiter=None):
+        super().__init__(cache=cache)
+        self.concurrency = concurrency or config.TRANSLATE_CONCURRENCY
+        self.max_retries = config.TRANSLATE_MAX_RETRIES if max_retries is None else max_retries
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self._limit = None
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        self.session = create_http_session(pool_size=self.concurrency)
+    
+    def _semaphore(self):
+        """Concurrency bound, created by the first coroutine on the loop that runs every translation."""
+        if self._limit is None:
+            self._limit = asyncio.Semaphore(self.concurrency)
+        return self._limit
+    
+    def _run(self, coro):
+        """Run a coroutine on the translator's event loop from any thread and wait for its result."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name='translator-loop', daemon=True)
+                self._loop_thread.start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff; a server-requested delay is enforced by the rate limiter's pause."""
+        return random.uniform(0, min(config.TRANSLATE_BACKOFF_MAX, config.TRANSLATE_BACKOFF_BASE * (2 ** attempt)))
+    
+    def _post(self, text, source_lang, target_lang):
+        payload = {
+            "from": source_lang,
+            "to": target_lang,
+            "q": text
+        }
+        with metrics.timer('translation_call', mode='async'):
+            return self.session.post(self.api_url, json=payload, headers=self.headers, timeout=10)
+    
+    async def translate_text_async(self, text, source_lang='es', target_lang='en'):
+        """
+        Translate one text with retries.
+        
+        Args:
+            text (str): Text to translate
+            source_lang (str): Source language code (default: 'es' for Spanish)
+            target_lang (str): Target language code (default: 'en' for English)
+            
+        Returns:
+            tuple: (translation or original text, status)
+        """
+        if self.cache:
+            cached = self.cache.get(text, source_lang, target_lang)
+            if cached is not None:
+                return cached, STATUS_CACHED
+        
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            try:
+                async with self._semaphore():
+                    response = await asyncio.get_running_loop().run_in_executor(
+                        None, self._post, text, source_lang, target_lang
+                    )
+            except requests.RequestException as e:
+                error = str(e)
+            else:
+                self.rate_limiter.observe(response.status_code, response.headers)
+                if response.status_code == 200:
+                    try:
+                        translated = self._extract_translation(response.json())
+                    except ValueError:
+                        error = "invalid JSON response"
+                    else:
+                        if self.cache:
+                            self.cache.put(text, translated, source_lang, target_lang)
+                        return translated, STATUS_TRANSLATED
+                elif response.status_code not in RETRYABLE_STATUSES:
+                    print(f"\u2717 Translation API error: {response.status_code}")
+                    return text, STATUS_FALLBACK
+                else:
+                    error = f"HTTP {response.status_code}"
+            
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt))
+        
+        print(f"\u2717 Translation failed after {self.max_retries + 1} attempt(s): {error}")
+        return text, STATUS_FALLBACK
+    
+    async def translate_articles_async(self, articles):
+        """
+        Translate article titles concurrently, recording 'translation_status' on each article.
+        
+        Args:
+            articles (list): List of article dictionaries
+            
+        Returns:
+            list: Articles with translated titles
+        """
+        for article in articles:
+            if article['title'] and not self.needs_translation(article):
+                article.setdefault('translation_status', STATUS_CACHED)
+        
+        titled = [a for a in articles if self.needs_translation(a)]
+        results = await asyncio.gather(*(self.translate_text_async(a['title']) for a in titled))
+        for article, (translated, status) in zip(titled, results):
+            article['title_english'] = translated
+            article['translation_status'] = status
+        return articles
+    
+    def translate_article(self, article):
+        """Translate one article's title in place, for use as a streaming pipeline stage."""
+        self._run(self.translate_articles_async([article]))
+        if article['title']:
+            print(f"\u2713 Translated Article {article['index']} [{article['translation_status']}]: {article['title_english']}")
+        return article
+    
+    def translate_article_batch(self, articles):
+        """Translate a micro-batch of articles concurrently, for a batching pipeline stage."""
+        self._run(self.translate_articles_async(articles))
+        for article in articles:
+            if article['title']:
+                print(f"\u2713 Translated Article {article['index']} [{article['translation_status']}]: {article['title_english']}")
+        return articles
+    
+    def translate_articles(self, articles, batch=None, include_content=False):
+        """
+        Translate article titles from Spanish to English with the async client.
+        
+        Args:
+            articles (list): List of article dictionaries
+            batch (bool): Ignored; requests are issued concurrently instead
+            include_content (bool): Ignored; only titles are translated
+            
+        Returns:
+            list: Articles with translated titles and 'translation_status'
+        """
+        print(f"\n{'='*60}")
+        print("TRANSLATING ARTICLE TITLES (Spanish to English, async)")
+        print(f"{'='*60}\n")
+        
+        self._run(self.translate_articles_async(articles))
+        
+        for article in articles:
+            if article['title']:
+                print(f"Article {article['index']} [{article['translation_status']}]:")
+                print(f"  Original (ES): {article['title']}")
+                print(f"  Translated (EN): {article['title_english']}")
+                print()
+        
+        counts = {}
+        for article in articles:
+            if 'translation_status' in article:
+                counts[article['translation_status']] = counts.get(article['translation_status'], 0) + 1
+        print("\u2713 All titles processed: " + ", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+        self.report_cache()
+        return articles
+    
+    def close(self):
+        """Stop the event loop thread and close the HTTP session and cache."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self.session.close()
+        super().close()
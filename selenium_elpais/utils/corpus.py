@@ -0,0 +1,227 @@
+"""Corpus analytics: single-pass tokenization, n-grams, stopwords, TF-IDF and mergeable counters."""
+
+import heapq
+import json
+import math
+import os
+from collections import Counter
+from pathlib import Path
+
+from .tokenizer import Tokenizer, fold_accents
+
+STOPWORDS = {
+    'en': frozenset("""
+        a about above after again against all am an and any are as at be because been before being below
+        between both but by can could did do does doing down during each few for from further had has have
+        having he her here hers herself him himself his how i if in into is it its itself just me more most
+        my myself no nor not now of off on once only or other our ours ourselves out over own same she
+        should so some such than that the their theirs them themselves then there these they this those
+        through to too under until up very was we were what when where which while who whom why will with
+        would you your yours yourself yourselves
+    """.split()),
+    'es': frozenset("""
+        a al algo algunas algunos ante antes como con contra cual cuando de del desde donde durante e el
+        ella ellas ellos en entre era erais eran eras eres es esa esas ese eso esos esta estaba estado
+        estas este esto estos fue fueron ha han hasta hay la las le les lo los mas me mi mis mucho muchos
+        muy más nada ni no nos nosotros o os otra otras otro otros para pero poco por porque que quien
+        qué se sea ser si sido sin sobre su sus también tan te tiene todo todos tu tus un una unas uno
+        unos y ya yo él
+    """.split()),
+}
+
+# Article keys analyzed for each field selection
+FIELD_PRESETS = {
+    'title': ('title_english',),
+    'content': ('content',),
+    'both': ('title_english', 'content'),
+}
+
+class CorpusAnalytics:
+    """Term statistics over a growing set of documents.
+    
+    Each article is tokenized once when it is added; only its term counts are
+    kept. Corpus-wide counters (term counts, document frequencies, document and
+    token totals) can be merged from other instances or from a saved file, so
+    history accumulates run by run without re-reading old articles.
+    
+    With ``max_terms`` the counters are pruned to the most frequent terms
+    whenever they grow past twice that size, so memory and saved files stay
+    bounded; rare terms dropped this way start again from zero if seen later.
+    """
+    
+    def __init__(self, fields='title', ngram_range=(1, 1), stopwords=None, keep_documents=False, fold=False,
+                 max_terms=None):
+        """
+        Args:
+            fields (str): 'title', 'content' or 'both' (see FIELD_PRESETS)
+            ngram_range (tuple): Smallest and largest n-gram size to count
+            stopwords (iterable): Language codes from STOPWORDS to drop, e.g. ('es', 'en')
+            keep_documents (bool): Keep per-document term counts for document_tfidf
+            fold (bool): Fold accents before counting, so 'política' and 'politica' are one term
+            max_terms (int): Keep at most about this many terms (default: unbounded)
+        """
+        self.fields = fields
+        self.ngram_range = tuple(ngram_range)
+        self.stopword_langs = tuple(stopwords or ())
+        self.fold = fold
+        self.tokenizer = Tokenizer(fold=fold)
+        self.stopwords = frozenset().union(*(STOPWORDS[lang] for lang in self.stopword_langs))
+        if fold:
+            self.stopwords = frozenset(fold_accents(w) for w in self.stopwords)
+        self.keep_documents = keep_documents
+        self.max_terms = max_terms
+        self.term_counts = Counter()
+        self.doc_freq = Counter()
+        self.doc_count = 0
+        self.total_tokens = 0
+        self.documents = {}
+    
+    def tokenize(self, article):
+        """Tokenize the selected fields of an article once."""
+        tokens = []
+        for tokenized in self.tokenizer.tokenize_many(article.get(key) for key in FIELD_PRESETS[self.fields]):
+            tokens.extend(tokenized)
+        return tokens
+    
+    def terms(self, tokens):
+        """Count the n-grams of a token list, skipping stopwords at n-gram edges."""
+        counts = Counter()
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(tokens) - n + 1):
+                if tokens[i] in self.stopwords or tokens[i + n - 1] in self.stopwords:
+                    continue
+                counts[' '.join(tokens[i:i + n]) if n > 1 else tokens[i]] += 1
+        return counts
+    
+    def add(self, article, doc_id=None):
+        """
+        Add one article to the corpus.
+        
+        Args:
+            article (dict): Article dictionary
+            doc_id (str): Key for per-document counts (default: the article URL or index)
+            
+        Returns:
+            list: The article's tokens, so callers never tokenize it again
+        """
+        tokens = self.tokenize(article)
+        counts = self.terms(tokens)
+        self.term_counts.update(counts)
+        self.doc_freq.update(counts.keys())
+        self.doc_count += 1
+        self.total_tokens += len(tokens)
+        if self.keep_documents:
+            self.documents[doc_id or article.get('url') or article.get('index')] = counts
+        self._bound()
+        return tokens
+    
+    def prune(self, max_terms=None):
+        """
+        Drop all but the most frequent terms.
+        
+        Args:
+            max_terms (int): Terms to keep (default: the corpus's max_terms; no-op when unbounded)
+            
+        Returns:
+            CorpusAnalytics: self
+        """
+        limit = max_terms or self.max_terms
+        if limit and len(self.term_counts) > limit:
+            kept = heapq.nlargest(limit, self.term_counts.items(), key=lambda x: (x[1], x[0]))
+            self.term_counts = Counter(dict(kept))
+            self.doc_freq = Counter({term: self.doc_freq[term] for term in self.term_counts})
+        return self
+    
+    def _bound(self):
+        # Prune in bulk so the cost is amortized over max_terms additions
+        if self.max_terms and len(self.term_counts) > 2 * self.max_terms:
+            self.prune()
+    
+    def idf(self, term):
+        """Smoothed inverse document frequency."""
+        return math.log((1 + self.doc_count) / (1 + self.doc_freq[term])) + 1
+    
+    def top_k(self, k=10, by='count', min_count=1):
+        """
+        Highest-ranked terms in the corpus.
+        
+        Args:
+            k (int): Number of terms to return
+            by (str): 'count' for raw frequency or 'tfidf' for frequency weighted by IDF
+            min_count (int): Ignore terms seen fewer times than this
+            
+        Returns:
+            dict: Terms and their scores, best first
+        """
+        candidates = ((t, c) for t, c in self.term_counts.items() if c >= min_count)
+        if by == 'count':
+            scored = candidates
+        elif by == 'tfidf':
+            scored = ((t, round(c * self.idf(t), 4)) for t, c in candidates)
+        else:
+            raise ValueError("Unsupported ranking: " + by)
+        return dict(sorted(scored, key=lambda x: (-x[1], x[0]))[:k])
+    
+    def document_tfidf(self, doc_id, k=10):
+        """Top TF-IDF terms of one kept document."""
+        counts = self.documents[doc_id]
+        total = sum(counts.values()) or 1
+        scored = ((t, round(c / total * self.idf(t), 4)) for t, c in counts.items())
+        return dict(sorted(scored, key=lambda x: (-x[1], x[0]))[:k])
+    
+    def _check_compatible(self, other):
+        if (self.fields, self.ngram_range, self.stopword_langs, self.fold) != (other.fields, other.ngram_range, other.stopword_langs, other.fold):
+            raise ValueError("Cannot merge corpora with different fields, n-gram range, stopwords or folding")
+    
+    def merge(self, other):
+        """Add another corpus's counters into this one."""
+        self._check_compatible(other)
+        self.term_counts.update(other.term_counts)
+        self.doc_freq.update(other.doc_freq)
+        self.doc_count += other.doc_count
+        self.total_tokens += other.total_tokens
+        if self.keep_documents:
+            self.documents.update(other.documents)
+        self._bound()
+        return self
+    
+    def to_dict(self):
+        """Serializable counters (per-document counts are not included)."""
+        return {
+            'fields': self.fields,
+            'ngram_range': list(self.ngram_range),
+            'stopwords': list(self.stopword_langs),
+            'fold': self.fold,
+            'doc_count': self.doc_count,
+            'total_tokens': self.total_tokens,
+            'term_counts': dict(self.term_counts),
+            'doc_freq': dict(self.doc_freq),
+        }
+    
+    @classmethod
+    def from_dict(cls, data, max_terms=None):
+        """Rebuild a corpus from to_dict output, pruned to max_terms if given."""
+        corpus = cls(fields=data['fields'], ngram_range=data['ngram_range'], stopwords=data['stopwords'],
+                     fold=data.get('fold', False), max_terms=max_terms)
+        corpus.doc_count = data['doc_count']
+        corpus.total_tokens = data['total_tokens']
+        corpus.term_counts = Counter(data['term_counts'])
+        corpus.doc_freq = Counter(data['doc_freq'])
+        return corpus.prune()
+    
+    def save(self, path):
+        """Atomically write the counters to a JSON file (pruned to max_terms first)."""
+        self.prune()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.part')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path, max_terms=None):
+        """Load counters saved with save(), pruned to max_terms if given."""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), max_terms=max_terms)
@@ -0,0 +1,241 @@
+"""Multi-section crawl scheduler with a priority frontier, pagination and per-host politeness."""
+
+import heapq
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+import config
+from .downloader import HostRateLimiter
+from .driver_pool import DriverPool
+from .metrics import metrics
+from .http_scraper import HttpScraper, parse_article_body, parse_article_fields
+from .selector_stats import candidates_for, record_probe
+from .selector_tables import ARTICLE_LIST_SELECTORS, PAGINATION_SELECTORS
+
+# Dated El País article URLs, e.g. /opinion/2024-05-17/some-title.html
+URL_DATE_PATTERN = re.compile(r'/(\d{4})-(\d{2})-(\d{2})/')
+
+LISTING = 'listing'
+ARTICLE = 'article'
+
+def section_url(section):
+    """Seed URL for a section name ('opinion', 'internacional') or a full URL."""
+    if '://' in section:
+        return section
+    return urljoin(config.ELPAIS_BASE_URL, section.strip('/') + '/')
+
+def freshness(fields):
+    """Publication timestamp guessed from the article URL (0 if unknown), used to crawl fresh content first."""
+    match = URL_DATE_PATTERN.search(fields.get('url') or '')
+    if not match:
+        return 0.0
+    try:
+        return datetime(*map(int, match.groups())).timestamp()
+    except ValueError:
+        return 0.0
+
+def parse_listing(html, base_url, stats=None):
+    """
+    Parse a section listing page.
+    
+    Args:
+        html (str): Listing page HTML
+        base_url (str): URL of the page, used to resolve relative links
+        stats (SelectorStats): Selector statistics that order and learn from the probes
+    
+    Returns:
+        tuple: (list of article field dicts, URL of the next page or None)
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    nodes = []
+    matched = None
+    candidates = candidates_for(stats, 'listing', ARTICLE_LIST_SELECTORS)
+    for selector in candidates:
+        with metrics.timer('selector_probe', field='listing'):
+            nodes = soup.select(selector)
+        if nodes:
+            matched = selector
+            break
+    record_probe(stats, 'listing', candidates, matched)
+    articles = [fields for fields in (parse_article_fields(node, base_url, stats) for node in nodes) if fields['title']]
+    
+    next_url = None
+    for selector in PAGINATION_SELECTORS:
+        link = soup.select_one(selector)
+        if link is not None and link.get('href'):
+            next_url = urljoin(base_url, link['href'])
+            break
+    return articles, next_url
+
+class CrawlScheduler:
+    """Crawl many sections within a fixed window on top of a scraper.
+    
+    Seeds are section listing pages at depth 0. Each listing page queues its
+    articles at its own depth and its next page one level deeper; nothing
+    deeper than ``max_depth`` pagination hops is fetched. Work is taken from a
+    priority frontier (shallowest first, listings before articles so every
+    section is discovered early, then freshest by URL date) and spread over
+    a pool of workers: HTTP
+    threads sharing the scraper's session, or pooled browser sessions when
+    the scraper is Selenium-based, starting with the scraper's own browser. Requests to the same host are spaced by
+    ``host_delay``. Crawling stops dispatching once ``max_articles`` articles
+    are under way or ``time_budget`` seconds have passed.
+    """
+    
+    def __init__(self, scraper, seeds=None, max_depth=None, max_articles=None, time_budget=None,
+                 host_delay=None, workers=None):
+        """
+        Args:
+            scraper (ElPaisScraper): Set-up scraper providing the session, article index and dedupe index
+            seeds (list): Section names or listing URLs (default: config.CRAWL_SECTIONS)
+            max_depth (int): Pagination hops followed from each seed
+            max_articles (int): Article budget for the crawl
+            time_budget (float): Seconds after which no new work is started (0 for no limit)
+            host_delay (float): Minimum seconds between requests to one host
+            workers (int): Concurrent fetches
+        """
+        self.scraper = scraper
+        self.seeds = [section_url(s) for s in (seeds or config.CRAWL_SECTIONS)]
+        self.max_depth = config.CRAWL_MAX_DEPTH if max_depth is None else max_depth
+        self.max_articles = max_articles or config.CRAWL_MAX_ARTICLES
+        self.time_budget = config.CRAWL_TIME_BUDGET if time_budget is None else time_budget
+        self.rate_limiter = HostRateLimiter(config.CRAWL_HOST_DELAY if host_delay is None else host_delay)
+        
+        self.pool = None
+        if isinstance(scraper, HttpScraper):
+            self.workers = workers or config.HTTP_WORKERS
+        else:
+            self.pool = DriverPool(browser=scraper.browser_type, workers=workers or config.FULL_ARTICLE_WORKERS,
+                                   driver=scraper.driver)
+            self.workers = self.pool.workers
+        
+        self._frontier = []
+        self._seen = set()
+        self._seq = 0
+        self.stats = {'listings': 0, 'articles': 0, 'failed': 0, 'skipped_depth': 0}
+    
+    def _push(self, kind, url, depth, section, fields=None, fresh=0.0):
+        """Queue a page unless it was already queued or is past the depth limit."""
+        if not url or url in self._seen:
+            return
+        if depth > self.max_depth:
+            self.stats['skipped_depth'] += 1
+            return
+        self._seen.add(url)
+        self._seq += 1
+        priority = (depth, kind != LISTING, -fresh, self._seq)
+        heapq.heappush(self._frontier, (priority, kind, url, depth, section, fields))
+    
+    @staticmethod
+    def _browser_page(session, task):
+        """Load a page in a pooled browser session and return its HTML."""
+        url, kind = task
+        session.driver.get(url)
+        if kind == LISTING:
+            session.waits.dismiss_consent()
+            session.waits.listing_ready()
+        else:
+            session.waits.article_body_ready()
+        return session.driver.page_source
+    
+    def _fetch(self, url, kind):
+        """Fetch a page politely over HTTP or a pooled browser; None on failure."""
+        self.rate_limiter.wait(url)
+        if self.pool is not None:
+            return self.pool.run(self._browser_page, (url, kind))
+        return self.scraper.fetch(url)
+    
+    def _crawl_listing(self, url):
+        with metrics.timer('navigation', backend='crawl'):
+            html = self._fetch(url, LISTING)
+        if html is None:
+            return None
+        return parse_listing(html, url, self.scraper.selector_stats)
+    
+    def _crawl_article(self, fields, index, section):
+        """Build an article from listing fields, reusing the index and fetching the page only if needed."""
+        article = self.scraper.complete_article(fields, index, fetch_content=False)
+        if article is None:
+            return None
+        article['section'] = section
+        if not article['content'] and article['url'] and not article.get('duplicate_of'):
+            with metrics.timer('article_fetch', backend='crawl'):
+                html = self._fetch(article['url'], ARTICLE)
+            paragraphs = parse_article_body(html, self.scraper.selector_stats) if html else []
+            article['content'] = ' '.join(paragraphs[:3])
+        return article
+    
+    def crawl(self):
+        """
+        Crawl the seeds and yield articles as each one completes.
+        
+        Yields:
+            dict: Article dictionaries with a 'section' key, numbered in dispatch order
+        """
+        for seed in self.seeds:
+            self._push(LISTING, seed, 0, urlparse(seed).path.strip('/') or seed)
+        
+        deadline = time.monotonic() + self.time_budget if self.time_budget else None
+        dispatched = 0
+        in_flight = {}
+        print(f"\u2713 Crawling {len(self.seeds)} section(s) with {self.workers} worker(s), depth {self.max_depth}, "
+              f"up to {self.max_articles} articles")
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                expired = deadline is not None and time.monotonic() >= deadline
+                while self._frontier and len(in_flight) < self.workers and not expired:
+                    _, kind, url, depth, section, fields = heapq.heappop(self._frontier)
+                    if dispatched >= self.max_articles:
+                        continue
+                    if kind == ARTICLE:
+                        dispatched += 1
+                        future = executor.submit(self._crawl_article, fields, dispatched, section)
+                    else:
+                        future = executor.submit(self._crawl_listing, url)
+                    in_flight[future] = (kind, url, depth, section)
+                
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, url, depth, section = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print("\u2717 Crawl error on " + url + ": " + str(e))
+                        result = None
+                    if result is None:
+                        self.stats['failed'] += 1
+                        continue
+                    
+                    if kind == LISTING:
+                        self.stats['listings'] += 1
+                        articles, next_url = result
+                        print(f"\u2713 Listing {url}: {len(articles)} article(s)")
+                        for fields in articles:
+                            self._push(ARTICLE, fields['url'], depth, section, fields, freshness(fields))
+                        newest = max((freshness(f) for f in articles), default=0.0)
+                        self._push(LISTING, next_url, depth + 1, section, fresh=newest)
+                    elif not result.get('duplicate_of'):
+                        self.stats['articles'] += 1
+                        print("\u2713 Article " + str(result['index']) + " crawled from " + section)
+                        yield result
+        
+        if deadline is not None and time.monotonic() >= deadline:
+            print(f"\u26a0 Crawl window of {self.time_budget}s reached, {len(self._frontier)} page(s) left in the frontier")
+    
+    def summary(self):
+        """One-line crawl summary."""
+        return (f"{self.stats['listings']} listing page(s), {self.stats['articles']} article(s), "
+                f"{self.stats['failed']} failed, {self.stats['skipped_depth']} beyond depth limit")
+    
+    def close(self):
+        """Quit pooled browser sessions, if any."""
+        if self.pool is not None:
+            self.pool.close()
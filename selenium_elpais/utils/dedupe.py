@@ -0,0 +1,240 @@
+"""Persistent MinHash/LSH index for near-duplicate article detection."""
+
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import config
+from .tokenizer import Tokenizer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS signatures (
+    key TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    added REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER NOT NULL,
+    bucket TEXT NOT NULL,
+    key TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (band, bucket);
+CREATE INDEX IF NOT EXISTS buckets_key ON buckets (key);
+"""
+
+# Mersenne prime modulus for the universal hash family (a * x + b) mod p
+MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed seed so signatures stay comparable across runs
+HASH_SEED = 20240517
+
+# Words per shingle, and how much of the content contributes to a signature
+SHINGLE_SIZE = 3
+CONTENT_CHARS = 2000
+
+_tokenizer = Tokenizer(fold=True)
+
+def shingles(article):
+    """
+    Word shingles over an article's title and opening content.
+    
+    Args:
+        article (dict): Article dictionary
+    
+    Returns:
+        set: Shingle strings; texts shorter than a shingle give their words
+    """
+    text = (article.get('title') or '') + '\n' + (article.get('content') or '')[:CONTENT_CHARS]
+    tokens = _tokenizer.tokenize(text)
+    if len(tokens) < SHINGLE_SIZE:
+        return set(tokens)
+    return {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+
+def _stable_hash(text):
+    """64-bit hash that, unlike hash(), is the same in every process."""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class NearDuplicateIndex:
+    """Near-duplicate detector over title and content shingles.
+    
+    Each article gets a MinHash signature; its bands are stored in LSH
+    buckets so only articles sharing a bucket are compared. A candidate is a
+    duplicate when the estimated Jaccard similarity reaches ``threshold``.
+    Entries are stored in SQLite and pruned after ``max_age_days``, so reposts
+    are caught across runs as well as within one listing.
+    """
+    
+    def __init__(self, path=None, threshold=None, num_perm=None, bands=None, max_age_days=None):
+        """
+        Args:
+            path (str): SQLite file, or ':memory:' for a throwaway index (default: config.DEDUPE_INDEX_PATH)
+            threshold (float): Minimum estimated Jaccard similarity of a duplicate
+            num_perm (int): MinHash signature length
+            bands (int): LSH bands; num_perm must be divisible by it
+            max_age_days (float): Forget entries older than this on close (0 keeps everything)
+        """
+        self.threshold = config.DEDUPE_THRESHOLD if threshold is None else threshold
+        self.num_perm = num_perm or config.DEDUPE_NUM_PERM
+        self.bands = bands or config.DEDUPE_BANDS
+        if self.num_perm % self.bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.rows = self.num_perm // self.bands
+        self.max_age_days = config.DEDUPE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        self.stats = {'unique': 0, 'duplicates': 0}
+        self._checked = set()
+        
+        rng = random.Random(HASH_SEED)
+        self._params = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(self.num_perm)]
+        
+        path = str(path or config.DEDUPE_INDEX_PATH)
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._check_params()
+    
+    def _check_params(self):
+        """Start over if the stored signatures were built with other MinHash/LSH settings."""
+        params = json.dumps({'num_perm': self.num_perm, 'bands': self.bands, 'seed': HASH_SEED, 'shingle': SHINGLE_SIZE,
+                             'text': 'listing'})
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'params'").fetchone()
+        if row and row[0] == params:
+            return
+        if row:
+            print(f"\u26a0 Near-duplicate index at {self.path} uses other settings, starting a new one")
+        with self._db:
+            self._db.execute("DELETE FROM signatures")
+            self._db.execute("DELETE FROM buckets")
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('params', ?)", (params,))
+    
+    def signature(self, article):
+        """
+        MinHash signature of an article's shingles.
+        
+        Args:
+            article (dict): Article dictionary
+        
+        Returns:
+            list: num_perm integers, or None if the article has no text
+        """
+        hashes = [_stable_hash(s) for s in shingles(article)]
+        if not hashes:
+            return None
+        return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self._params]
+    
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            values = signature[band * self.rows:(band + 1) * self.rows]
+            yield band, hashlib.blake2b(json.dumps(values).encode('utf-8'), digest_size=8).hexdigest()
+    
+    @staticmethod
+    def similarity(first, second):
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(a == b for a, b in zip(first, second)) / len(first)
+    
+    @staticmethod
+    def key(article):
+        """Identity of an article in the index: its URL, or its title without one."""
+        return article.get('url') or 'title:' + (article.get('title') or '')
+    
+    def find(self, article, signature=None):
+        """
+        Look for an indexed near-duplicate of an article, ignoring the article's own entry.
+        
+        Args:
+            article (dict): Article dictionary
+            signature (list): Precomputed signature
+        
+        Returns:
+            tuple: (key, similarity) of the closest duplicate, or None
+        """
+        signature = signature or self.signature(article)
+        if signature is None:
+            return None
+        own_key = self.key(article)
+        with self._lock:
+            candidates = set()
+            for band, bucket in self._band_keys(signature):
+                rows = self._db.execute("SELECT key FROM buckets WHERE band = ? AND bucket = ?", (band, bucket))
+                candidates.update(key for (key,) in rows if key != own_key)
+            best = None
+            for key in sorted(candidates):
+                row = self._db.execute("SELECT signature FROM signatures WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    continue
+                score = self.similarity(signature, json.loads(row[0]))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (key, score)
+        return best
+    
+    def add(self, article, signature=None):
+        """Index an article (replacing any previous entry under the same key)."""
+        signature = signature or self.signature(article)
+        if signature is None:
+            return
+        key = self.key(article)
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM buckets WHERE key = ?", (key,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO signatures (key, signature, added) VALUES (?, ?, ?)",
+                (key, json.dumps(signature), time.time())
+            )
+            self._db.executemany(
+                "INSERT INTO buckets (band, bucket, key) VALUES (?, ?, ?)",
+                [(band, bucket, key) for band, bucket in self._band_keys(signature)]
+            )
+    
+    def check(self, article):
+        """
+        Mark an article as a duplicate of an indexed one, or index it as unique.
+        
+        Args:
+            article (dict): Article dictionary; gets 'duplicate_of' when a match is found
+        
+        Returns:
+            str: Key (usually the URL) of the original article, or None if the article is unique
+        """
+        key = self.key(article)
+        signature = self.signature(article)
+        # The same URL twice in one run is a duplicate too; across runs it is the article itself
+        match = (key, 1.0) if key in self._checked else self.find(article, signature)
+        with self._lock:
+            self.stats['duplicates' if match else 'unique'] += 1
+            self._checked.add(key)
+        if match:
+            article['duplicate_of'] = match[0]
+            return match[0]
+        self.add(article, signature)
+        return None
+    
+    def prune(self, max_age_days=None):
+        """Drop entries added more than max_age_days ago."""
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        if not max_age_days:
+            return 0
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM buckets WHERE key IN (SELECT key FROM signatures WHERE added < ?)", (cutoff,)
+            )
+            return self._db.execute("DELETE FROM signatures WHERE added < ?", (cutoff,)).rowcount
+    
+    def summary(self):
+        """One-line unique/duplicate summary."""
+        return f"{self.stats['unique']} unique, {self.stats['duplicates']} near-duplicate(s) skipped"
+    
+    def close(self):
+        """Prune old entries and close the index database."""
+        self.prune()
+        with self._lock:
+            self._db.close()
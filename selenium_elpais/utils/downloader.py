@@ -0,0 +1,214 @@
+"""Concurrent, streaming image downloader."""
+
+import hashlib
+import mimetypes
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+import config
+from .http_session import create_http_session
+from .image_cache import ImageCache
+from .metrics import metrics
+
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/pjpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'image/avif': '.avif',
+    'image/svg+xml': '.svg',
+}
+
+CHUNK_SIZE = 64 * 1024
+
+def extension_for(content_type, url=''):
+    """
+    Pick a file extension from a Content-Type header, falling back to the URL path.
+    
+    Args:
+        content_type (str): Content-Type header value, possibly with parameters
+        url (str): Source URL
+        
+    Returns:
+        str: Extension including the leading dot (default: '.jpg')
+    """
+    media_type = (content_type or '').split(';')[0].strip().lower()
+    if media_type in CONTENT_TYPE_EXTENSIONS:
+        return CONTENT_TYPE_EXTENSIONS[media_type]
+    guessed = mimetypes.guess_extension(media_type) if media_type.startswith('image/') else None
+    if guessed:
+        return guessed
+    suffix = Path(urlparse(url).path).suffix.lower()
+    if suffix in CONTENT_TYPE_EXTENSIONS.values():
+        return suffix
+    return '.jpg'
+
+class HostRateLimiter:
+    """Spaces out requests to the same host by a minimum interval."""
+    
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+    
+    def wait(self, url):
+        """Block until the next request slot for the URL's host."""
+        if self.min_interval <= 0:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class ImageDownloader:
+    """Download article images concurrently over a shared connection pool.
+    
+    Bodies are streamed in chunks to a temporary file and hashed on the way,
+    then published under a content-addressed name (``<sha256 prefix><ext>``),
+    so identical images share one file and a failed download never leaves a
+    truncated image behind. With a cache, known URLs are revalidated with a
+    conditional request instead of being transferred again.
+    """
+    
+    def __init__(self, session=None, workers=None, host_interval=None, target_dir=None, cache=None):
+        self.workers = max(1, workers or config.IMAGE_DOWNLOAD_WORKERS)
+        # A session passed in belongs to the caller; one created here is closed with the downloader
+        self._owns_session = session is None
+        self.session = session or create_http_session(pool_size=self.workers)
+        self.rate_limiter = HostRateLimiter(config.IMAGE_HOST_INTERVAL if host_interval is None else host_interval)
+        self.target_dir = Path(target_dir or config.IMAGES_DIR)
+        self.target_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = cache
+    
+    def _stream_to_temp(self, response, directory):
+        """
+        Stream a response body into a temp file while hashing it.
+        
+        Returns:
+            tuple: (temp file path, SHA-256 hex digest)
+        """
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.download-', suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
+                        digest.update(chunk)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return tmp_path, digest.hexdigest()
+    
+    def _publish(self, source, digest, ext, move=False):
+        """Place a file in the images directory under its content-addressed name."""
+        filepath = self.target_dir / (digest[:16] + ext)
+        if filepath.exists():
+            if move:
+                os.remove(source)
+            return filepath
+        if move:
+            os.replace(source, filepath)
+            return filepath
+        # Hard-link out of the cache so eviction never removes published images
+        tmp_path = self.target_dir / ('.' + filepath.name + '.' + str(threading.get_ident()) + '.part')
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, filepath)
+        return filepath
+    
+    def _fetch(self, url):
+        """
+        Fetch an image, revalidating against the cache when possible.
+        
+        Returns:
+            tuple: (HTTP status, published file path or None)
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        headers = ImageCache.conditional_headers(entry)
+        
+        self.rate_limiter.wait(url)
+        with self.session.get(url, stream=True, timeout=10, headers=headers) as response:
+            if response.status_code == 304 and entry:
+                self.cache.touch(url, entry['digest'])
+                return 304, self._publish(entry['path'], entry['digest'], entry['ext'])
+            if response.status_code != 200:
+                return response.status_code, None
+            
+            ext = extension_for(response.headers.get('Content-Type'), url)
+            staging_dir = self.cache.cache_dir if self.cache else self.target_dir
+            tmp_path, digest = self._stream_to_temp(response, staging_dir)
+            if not self.cache:
+                return 200, self._publish(tmp_path, digest, ext, move=True)
+            
+            stored = self.cache.store(
+                url, tmp_path, digest, ext,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+            return 200, self._publish(stored, digest, ext)
+    
+    def download(self, article):
+        """
+        Download the image for one article and record its path on the article.
+        
+        Args:
+            article (dict): Article dictionary with 'index' and 'image_url'
+            
+        Returns:
+            str: Saved file path, or '' if there was nothing to download or it failed
+        """
+        if not article.get('image_url'):
+            print("\u26a0 No image available for Article " + str(article['index']))
+            return ''
+        
+        if article.get('unchanged') and article.get('image_path') and os.path.exists(article['image_path']):
+            print("\u2713 Unchanged Article " + str(article['index']) + ", keeping image: " + Path(article['image_path']).name)
+            return article['image_path']
+        
+        try:
+            with metrics.timer('image_download'):
+                status, filepath = self._fetch(article['image_url'])
+        except (requests.RequestException, OSError) as e:
+            print("\u2717 Error downloading image for Article " + str(article['index']) + ": " + str(e))
+            return ''
+        
+        if filepath is None:
+            print("\u2717 Failed to download image for Article " + str(article['index']) + " (Status: " + str(status) + ")")
+            return ''
+        
+        article['image_path'] = str(filepath)
+        action = "Revalidated cached image" if status == 304 else "Downloaded image"
+        print("\u2713 " + action + " for Article " + str(article['index']) + ": " + filepath.name)
+        return str(filepath)
+    
+    def download_all(self, articles):
+        """Download images for all articles concurrently, returning paths in article order."""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(self.download, articles))
+    
+    def close(self):
+        """Trim the cache to its size cap, close it and close an owned session."""
+        if self.cache:
+            evicted = self.cache.evict()
+            if evicted:
+                print("\u2713 Evicted " + str(evicted) + " cached image(s) over the size cap")
+            self.cache.close()
+        if self._owns_session:
+            self.session.close()
@@ -0,0 +1,173 @@
+"""Bounded pool of reusable headless WebDriver sessions."""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from .waits import WaitPolicy
+from .warm_pool import warm_pool
+
+class PooledSession:
+    """A pooled driver together with its wait policy and usage count.
+    
+    A borrowed session wraps a driver that belongs to the caller, e.g. the
+    scraper's own browser; the pool uses it but never quits or releases it.
+    """
+    
+    def __init__(self, driver, borrowed=False):
+        self.driver = driver
+        self.waits = WaitPolicy(driver)
+        self.pages = 0
+        self.borrowed = borrowed
+    
+    def quit(self):
+        """Quit the underlying driver, ignoring errors from dead sessions."""
+        if not self.borrowed:
+            warm_pool.discard(self.driver)
+    
+    def release(self):
+        """Hand the healthy driver back to the warm pool for later runs."""
+        if not self.borrowed:
+            warm_pool.release(self.driver)
+
+class DriverPool:
+    """Fan page work out over a bounded set of headless browser sessions.
+    
+    Sessions are borrowed from the warm pool lazily up to ``workers`` and reused
+    across pages. A session is quit and replaced after ``recycle_after`` pages,
+    or as soon as a task raises, so a leaking or crashed browser never serves
+    more work; healthy sessions go back to the warm pool on close. A caller's
+    already-running browser can fill the first slot instead of a new session;
+    it is only dropped from the pool, never quit.
+    """
+    
+    def __init__(self, browser='chrome', workers=None, recycle_after=None, driver=None):
+        """
+        Args:
+            browser (str): Browser for new sessions
+            workers (int): Maximum concurrent sessions (default: config.FULL_ARTICLE_WORKERS)
+            recycle_after (int): Pages a session serves before it is replaced (default: config.SESSION_RECYCLE_AFTER)
+            driver (WebDriver): Caller's idle browser to use as the first session
+        """
+        self.browser = browser
+        self.workers = max(1, workers or config.FULL_ARTICLE_WORKERS)
+        self.recycle_after = recycle_after or config.SESSION_RECYCLE_AFTER
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._sessions = []
+        self._size = 0
+        if driver is not None:
+            session = PooledSession(driver, borrowed=True)
+            self._sessions.append(session)
+            self._size = 1
+            self._idle.put(session)
+    
+    def _start_session(self):
+        """Launch a browser for a reserved slot; browsers start outside the lock so they boot in parallel."""
+        try:
+            session = PooledSession(warm_pool.acquire(self.browser, headless=True))
+        except Exception:
+            with self._lock:
+                self._size -= 1
+            raise
+        with self._lock:
+            self._sessions.append(session)
+        return session
+    
+    def _acquire(self):
+        """Borrow an idle session, or start a new one while under the worker cap."""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                reserved = self._size < self.workers
+                if reserved:
+                    self._size += 1
+            if reserved:
+                return self._start_session()
+            # All slots busy: wait briefly for a release, then re-check in case one was recycled
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+    
+    def _discard(self, session):
+        """Quit a session and free its slot for a fresh one."""
+        session.quit()
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+                self._size -= 1
+    
+    def _release(self, session):
+        """Return a session to the pool, recycling it once it has served enough pages."""
+        session.pages += 1
+        if session.pages >= self.recycle_after and not session.borrowed:
+            self._discard(session)
+        else:
+            self._idle.put(session)
+    
+    def _run(self, fn, item):
+        """Run one work item on a borrowed session."""
+        try:
+            session = self._acquire()
+        except Exception as e:
+            print("\u2717 Could not start pooled session: " + str(e))
+            return None
+        try:
+            result = fn(session, item)
+        except Exception as e:
+            print("\u2717 Pooled session failed on " + str(item) + ": " + str(e))
+            self._discard(session)
+            return None
+        self._release(session)
+        return result
+    
+    def run(self, fn, item):
+        """
+        Run ``fn(session, item)`` on a borrowed session from the caller's thread.
+        
+        Args:
+            fn (callable): Work function receiving a PooledSession and an item
+            item: Work item, e.g. a page URL
+            
+        Returns:
+            Result of ``fn``, or None if the task failed
+        """
+        return self._run(fn, item)
+    
+    def map(self, fn, items):
+        """
+        Run ``fn(session, item)`` for every item across the pool.
+        
+        Args:
+            fn (callable): Work function receiving a PooledSession and an item
+            items (list): Work items, e.g. article URLs
+            
+        Returns:
+            list: Results in the same order as ``items``; None where a task failed
+        """
+        items = list(items)
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(lambda item: self._run(fn, item), items))
+    
+    def close(self):
+        """Return every session to the warm pool, which quits those it does not keep."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+            self._size = 0
+        for session in sessions:
+            session.release()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
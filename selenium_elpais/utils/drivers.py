@@ -0,0 +1,155 @@
+"""WebDriver construction and cached driver-binary resolution shared by the scraper and the session pools."""
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.firefox import GeckoDriverManager
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+import config
+from .metrics import metrics
+
+DRIVER_MANAGERS = {'chrome': ChromeDriverManager, 'firefox': GeckoDriverManager}
+DRIVER_BINARIES = {'chrome': 'chromedriver', 'firefox': 'geckodriver'}
+
+_cache_lock = threading.Lock()
+
+def _load_driver_cache():
+    try:
+        with open(config.DRIVER_CACHE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_driver_cache(cache):
+    path = Path(config.DRIVER_CACHE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.part.{os.getpid()}.{threading.get_ident()}")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, path)
+
+def resolve_driver_path(browser, refresh=False):
+    """
+    Find the driver binary for a browser without going to the network when possible.
+    
+    An explicit CHROMEDRIVER_PATH / GECKODRIVER_PATH wins. Otherwise the path
+    webdriver_manager resolved last time is reused until DRIVER_CACHE_TTL runs
+    out; only then (or with ``refresh``) is webdriver_manager asked again. If
+    that fails, e.g. offline, a stale cached path or a driver on PATH is used.
+    
+    Args:
+        browser (str): 'chrome' or 'firefox'
+        refresh (bool): Re-resolve even if the cached path is still fresh
+        
+    Returns:
+        str: Driver binary path, or None to let Selenium Manager locate one
+    """
+    browser = browser.lower()
+    override = config.DRIVER_PATHS.get(browser)
+    if override:
+        return override
+    
+    with _cache_lock:
+        entry = _load_driver_cache().get(browser)
+    cached = entry['path'] if entry and Path(entry['path']).is_file() else None
+    if cached and not refresh and time.time() - entry['resolved_at'] < config.DRIVER_CACHE_TTL:
+        metrics.inc('driver_resolve', browser=browser, source='cache')
+        return cached
+    
+    try:
+        path = DRIVER_MANAGERS[browser]().install()
+    except Exception as e:
+        fallback = cached or shutil.which(DRIVER_BINARIES[browser])
+        print("\u26a0 Driver resolution failed for " + browser + ": " + (str(e).strip() or type(e).__name__).splitlines()[0]
+              + ("; using " + fallback if fallback else "; leaving it to Selenium Manager"))
+        metrics.inc('driver_resolve', browser=browser, source='fallback')
+        return fallback
+    
+    with _cache_lock:
+        cache = _load_driver_cache()
+        cache[browser] = {'path': path, 'resolved_at': time.time()}
+        _save_driver_cache(cache)
+    metrics.inc('driver_resolve', browser=browser, source='manager')
+    return path
+
+def create_driver(browser='chrome', headless=True):
+    """
+    Create a configured Selenium WebDriver.
+    
+    Args:
+        browser (str): 'chrome' or 'firefox'
+        headless (bool): Run the browser without a window
+        
+    Returns:
+        WebDriver: Driver with the project's wait and page-load settings applied
+    """
+    with metrics.timer('driver_start', browser=browser.lower()):
+        driver = _start_browser(browser, headless)
+    driver.implicitly_wait(config.IMPLICIT_WAIT)
+    driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
+    return driver
+
+def _start_browser(browser, headless):
+    """Launch the browser with the project's options."""
+    if browser.lower() == 'chrome':
+        options = ChromeOptions()
+        if headless:
+            options.add_argument('--headless=new')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--window-size=1920,1080')
+        options.add_argument('--lang=es-ES')
+        options.add_experimental_option('prefs', {'intl.accept_languages': 'es,es-ES'})
+        
+        try:
+            driver = _launch(webdriver.Chrome, ChromeService, 'chrome', options)
+        except Exception as e:
+            print("ChromeDriver setup failed: " + str(e))
+            print("Trying alternative method...")
+            try:
+                driver = webdriver.Chrome(options=options)
+            except Exception as e2:
+                print("Chrome setup failed completely. Error: " + str(e2))
+                print("Please use Firefox instead by changing browser='firefox' in main.py")
+                raise
+        
+    elif browser.lower() == 'firefox':
+        options = FirefoxOptions()
+        if headless:
+            options.add_argument('--headless')
+        options.add_argument('--width=1920')
+        options.add_argument('--height=1080')
+        options.set_preference('intl.accept_languages', 'es-ES, es')
+        
+        driver = _launch(webdriver.Firefox, FirefoxService, 'firefox', options)
+    
+    else:
+        raise ValueError("Unsupported browser: " + browser)
+    
+    return driver
+
+def _launch(driver_class, service_class, browser, options):
+    """Start a browser with the resolved driver binary, re-resolving once if the cached driver no longer matches."""
+    path = resolve_driver_path(browser)
+    try:
+        return driver_class(service=service_class(path) if path else service_class(), options=options)
+    except SessionNotCreatedException:
+        # Typically a browser update the cached driver does not support yet
+        if config.DRIVER_PATHS.get(browser):
+            raise
+        fresh = resolve_driver_path(browser, refresh=True)
+        if fresh == path:
+            raise
+        return driver_class(service=service_class(fresh) if fresh else service_class(), options=options)
@@ -0,0 +1,410 @@
+"""Record-and-replay fixture server for network-free, repeatable runs."""
+
+import hashlib
+import ipaddress
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+
+import config
+from .http_session import create_http_session
+
+# Bump when the archive layout changes
+ARCHIVE_VERSION = 1
+
+# Local path prefix for origins other than the default one: /_fixture/<scheme>/<host[:port]>/<path>
+HOST_PREFIX = '/_fixture/'
+
+ABSOLUTE_URL_PATTERN = re.compile(r'(https?)://([A-Za-z0-9.-]+(?::\d+)?)')
+
+# Content types whose absolute links are rewritten to point at the fixture server
+REWRITTEN_TYPES = ('text/html', 'text/css', 'javascript', 'xml')
+
+# Request headers that are not forwarded upstream
+HOP_HEADERS = {'host', 'content-length', 'connection', 'keep-alive', 'proxy-connection', 'accept-encoding', 'te', 'upgrade'}
+
+# Upstream answers that would make a replay flaky rather than faithful
+UNRECORDED_STATUSES = {429, 500, 502, 503, 504}
+
+# Cross-run state redirected to a scratch directory in fixture runs: config name -> file or directory name
+ISOLATED_STATE = {
+    'ARTICLE_INDEX_PATH': 'articles.sqlite',
+    'DEDUPE_INDEX_PATH': 'dedupe.sqlite',
+    'TRANSLATION_CACHE_PATH': 'translations.sqlite',
+    'IMAGE_CACHE_DIR': 'images',
+    'CORPUS_HISTORY_PATH': 'corpus_history.json',
+    'SELECTOR_STATS_PATH': 'selector_stats.json',
+}
+
+# Article fields holding URLs that point at the fixture server during a run
+URL_FIELDS = ('url', 'image_url')
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def _site_domain(hostname):
+    """Registrable part of a host name ('imagenes.elpais.com' -> 'elpais.com'); IP addresses as-is."""
+    try:
+        ipaddress.ip_address(hostname)
+        return hostname
+    except ValueError:
+        return '.'.join(hostname.split('.')[-2:])
+
+def _batch_items(method, body):
+    """Per-text bodies of a batch translation request (a JSON object with a list 'q'), or None."""
+    if method != 'POST' or not body:
+        return None
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or not isinstance(payload.get('q'), list):
+        return None
+    return [json.dumps(dict(payload, q=text), ensure_ascii=False).encode('utf-8') for text in payload['q']]
+
+def request_key(method, url, body=b''):
+    """
+    Archive key of a request.
+    
+    Args:
+        method (str): HTTP method
+        url (str): Upstream URL including the query string
+        body (bytes): Request body; JSON bodies are canonicalized so key order does not matter
+    
+    Returns:
+        str: Method and URL, plus a digest of the body when there is one
+    """
+    key = method.upper() + ' ' + url
+    if body:
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, ensure_ascii=False).encode('utf-8')
+        except ValueError:
+            pass
+        key += ' ' + hashlib.sha256(body).hexdigest()[:16]
+    return key
+
+class FixtureArchive:
+    """Recorded responses on disk: an ``index.json`` and content-addressed bodies.
+    
+    Bodies are stored as fetched from upstream; link rewriting happens when they
+    are served, so an archive replays on any port.
+    """
+    
+    def __init__(self, root):
+        """
+        Args:
+            root (str): Archive directory; it is created on the first save
+        """
+        self.root = Path(root)
+        self.origin = None
+        self.entries = {}
+        self._lock = threading.Lock()
+        index_path = self.root / 'index.json'
+        if index_path.exists():
+            with open(index_path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != ARCHIVE_VERSION:
+                raise ValueError(f"Fixture archive at {self.root} has an unsupported version")
+            self.origin = data.get('origin')
+            self.entries = data.get('entries', {})
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def get(self, key):
+        """
+        Look up a recorded response.
+        
+        Returns:
+            tuple: (status, content type, body bytes), or None if the request was not recorded
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is None:
+            return None
+        body = (self.root / 'bodies' / entry['body']).read_bytes()
+        return entry['status'], entry['content_type'], body
+    
+    def put(self, key, status, content_type, body):
+        """Store a response under a request key."""
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = self.root / 'bodies' / digest
+        if not body_path.exists():
+            body_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = body_path.with_name(digest + '.part.' + str(threading.get_ident()))
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, body_path)
+        with self._lock:
+            self.entries[key] = {'status': status, 'content_type': content_type, 'body': digest}
+    
+    def save(self):
+        """Atomically write the index."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {'version': ARCHIVE_VERSION, 'origin': self.origin, 'entries': dict(sorted(self.entries.items()))}
+        index_path = self.root / 'index.json'
+        tmp_path = index_path.with_name('index.json.part')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, ensure_ascii=False)
+        os.replace(tmp_path, index_path)
+
+class FixtureServer:
+    """Local HTTP server that records upstream traffic or replays it.
+    
+    Requests for ``/path`` map to the default origin (El País) and requests for
+    ``/_fixture/<scheme>/<host>/path`` to any other origin, such as the image
+    host or the translation API. Absolute links to the default origin's site
+    in HTML, CSS and scripts are rewritten to the server, so article pages and
+    images are fetched through it too.
+    
+    In 'record' mode, requests missing from the archive are forwarded upstream
+    and stored, so a recording can be resumed. In 'replay' mode nothing leaves
+    the machine: unrecorded requests get a 404. POST bodies are part of the
+    request key, so translations replay only for the same texts. Batch
+    translations are also stored per text, so a replay can answer batches
+    composed differently from the recording; the streaming translate stage
+    batches by arrival time.
+    """
+    
+    def __init__(self, archive, mode='replay', origin=None, port=None):
+        """
+        Args:
+            archive (FixtureArchive): Archive to read from and record into
+            mode (str): 'record' or 'replay'
+            origin (str): Default upstream origin (default: the archive's, else that of config.ELPAIS_OPINION_URL)
+            port (int): Local port, 0 for any free port (default: config.FIXTURE_PORT)
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError("Unsupported fixture mode: " + str(mode))
+        self.archive = archive
+        self.mode = mode
+        self.origin = origin or archive.origin or _origin(config.ELPAIS_OPINION_URL)
+        self.domain = _site_domain(urlsplit(self.origin).hostname)
+        if archive.origin is None:
+            archive.origin = self.origin
+        self.port = config.FIXTURE_PORT if port is None else port
+        self.stats = {'served': 0, 'recorded': 0, 'missing': 0, 'errors': 0}
+        self.session = create_http_session() if mode == 'record' else None
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        self._state_dir = None
+    
+    @property
+    def url(self):
+        """Base URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """Start serving in a background thread; returns the server for chaining."""
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', self.port), _FixtureHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fixtures = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fixture-server', daemon=True)
+        self._thread.start()
+        return self
+    
+    def local_url(self, upstream_url):
+        """Server URL that stands in for an upstream URL."""
+        parts = urlsplit(upstream_url)
+        rest = upstream_url[len(parts.scheme) + 3 + len(parts.netloc):]
+        if _origin(upstream_url) == self.origin:
+            return self.url + (rest or '/')
+        return self.url + HOST_PREFIX + parts.scheme + '/' + parts.netloc + (rest or '/')
+    
+    def upstream_url(self, path):
+        """Upstream URL a request path on the server stands for."""
+        if path.startswith(HOST_PREFIX):
+            scheme, netloc, rest = (path[len(HOST_PREFIX):].split('/', 2) + ['', ''])[:3]
+            return f"{scheme}://{netloc}/{rest}"
+        return self.origin + path
+    
+    def rewrite(self, body, content_type):
+        """Point absolute links to the site's hosts at the server."""
+        if not any(t in content_type for t in REWRITTEN_TYPES):
+            return body
+        
+        def replace(match):
+            hostname = match.group(2).split(':')[0]
+            if hostname != self.domain and not hostname.endswith('.' + self.domain):
+                return match.group(0)
+            return self.local_url(match.group(0)).rstrip('/')
+        
+        text = body.decode('utf-8', errors='surrogateescape')
+        return ABSOLUTE_URL_PATTERN.sub(replace, text).encode('utf-8', errors='surrogateescape')
+    
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+    
+    def _forward(self, method, url, headers, body):
+        forwarded = {k: v for k, v in headers.items() if k.lower() not in HOP_HEADERS}
+        response = self.session.request(method, url, data=body or None, headers=forwarded, timeout=config.HTTP_TIMEOUT)
+        return response.status_code, response.headers.get('Content-Type', 'application/octet-stream'), response.content
+    
+    def _store_batch_items(self, method, url, body, response):
+        """Also file a batch translation response under one key per text."""
+        items = _batch_items(method, body)
+        status, content_type, payload = response
+        if not items or status != 200:
+            return
+        try:
+            translations = json.loads(payload)
+        except ValueError:
+            return
+        if not isinstance(translations, list) or len(translations) != len(items):
+            return
+        for item, translated in zip(items, translations):
+            single = json.dumps([translated], ensure_ascii=False).encode('utf-8')
+            self.archive.put(request_key(method, url, item), status, content_type, single)
+    
+    def _join_batch(self, method, url, body):
+        """Answer an unrecorded batch translation from per-text entries, or None if any is missing."""
+        items = _batch_items(method, body)
+        if not items:
+            return None
+        parts = [self.archive.get(request_key(method, url, item)) for item in items]
+        if any(part is None or part[0] != 200 for part in parts):
+            return None
+        translations = []
+        for _, _, payload in parts:
+            try:
+                value = json.loads(payload)
+            except ValueError:
+                return None
+            if not isinstance(value, list) or len(value) != 1:
+                return None
+            translations.append(value[0])
+        return 200, parts[0][1], json.dumps(translations, ensure_ascii=False).encode('utf-8')
+    
+    def handle(self, method, path, headers, body):
+        """
+        Answer one request from the archive, recording it first in record mode.
+        
+        Returns:
+            tuple: (status, content type, body bytes)
+        """
+        url = self.upstream_url(path)
+        key = request_key(method, url, body)
+        recorded = self.archive.get(key)
+        if recorded is None and self.mode == 'replay':
+            recorded = self._join_batch(method, url, body)
+        if recorded is None and self.mode == 'record':
+            try:
+                recorded = self._forward(method, url, headers, body)
+            except requests.RequestException as e:
+                self._count('errors')
+                print("\u2717 Fixture recording failed for " + url + ": " + str(e))
+                return 502, 'text/plain', str(e).encode('utf-8')
+            if recorded[0] not in UNRECORDED_STATUSES:
+                self.archive.put(key, *recorded)
+                self._store_batch_items(method, url, body, recorded)
+                self._count('recorded')
+        if recorded is None:
+            self._count('missing')
+            return 404, 'text/plain', b'Not in fixture archive: ' + key.encode('utf-8')
+        self._count('served')
+        status, content_type, payload = recorded
+        return status, content_type, self.rewrite(payload, content_type)
+    
+    def original_url(self, url):
+        """Upstream URL for a URL on the server; other URLs are returned unchanged."""
+        if self._httpd is None or not url or not url.startswith(self.url):
+            return url
+        return self.upstream_url(url[len(self.url):] or '/')
+    
+    def restore_urls(self, article):
+        """
+        Point an article's URLs back at the original hosts before it is stored.
+        
+        The server listens on a port that changes between runs, so results and
+        indexes would otherwise differ from one replay to the next.
+        
+        Args:
+            article (dict): Article dictionary, updated in place
+            
+        Returns:
+            dict: The same article
+        """
+        for field in URL_FIELDS:
+            if article.get(field):
+                article[field] = self.original_url(article[field])
+        return article
+    
+    def redirect_config(self):
+        """
+        Point the El País and translation API URLs in config at the server.
+        
+        Indexes and caches that carry state from one run to the next are moved
+        to a scratch directory that is removed on close. A replay then never
+        skips articles or answers from a cache because of an earlier run, and a
+        recording fetches every page instead of reusing cached results. State
+        that is switched off (its path left empty) stays off.
+        """
+        config.ELPAIS_OPINION_URL = self.local_url(config.ELPAIS_OPINION_URL)
+        config.ELPAIS_BASE_URL = self.local_url(config.ELPAIS_BASE_URL)
+        if config.RAPID_TRANSLATE_API_URL:
+            config.RAPID_TRANSLATE_API_URL = self.local_url(config.RAPID_TRANSLATE_API_URL)
+        
+        self._state_dir = Path(tempfile.mkdtemp(prefix='elpais-fixtures-'))
+        for name, target in ISOLATED_STATE.items():
+            if getattr(config, name):
+                setattr(config, name, self._state_dir / target)
+    
+    def summary(self):
+        """One-line served/recorded/missing summary."""
+        return (f"{self.stats['served']} served, {self.stats['recorded']} recorded, "
+                f"{self.stats['missing']} missing, {self.stats['errors']} failed ({len(self.archive)} in archive)")
+    
+    def close(self):
+        """Stop the server and, after recording, save the archive index."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self.session is not None:
+            self.session.close()
+        if self.mode == 'record':
+            self.archive.save()
+        if self._state_dir is not None:
+            shutil.rmtree(self._state_dir, ignore_errors=True)
+            self._state_dir = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Hands every request to the owning FixtureServer."""
+    
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; with Nagle on, keep-alive clients stall on delayed ACKs
+    disable_nagle_algorithm = True
+    
+    def _serve(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status, content_type, payload = self.server.fixtures.handle(self.command, self.path, self.headers, body)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+    
+    do_GET = do_POST = do_HEAD = _serve
+    
+    def log_message(self, format, *args):
+        pass
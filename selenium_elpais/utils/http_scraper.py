@@ -0,0 +1,210 @@
+"""HTTP-first El País scraper that parses server-rendered pages without a browser."""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+import config
+from .http_session import create_http_session
+from .metrics import metrics
+from .scraper import ElPaisScraper
+from .selector_stats import candidates_for, record_probe
+from .selector_tables import ARTICLE_LIST_SELECTORS, ARTICLE_FIELD_SELECTORS, FULL_ARTICLE_CONTENT_SELECTORS
+
+def _node_text(node):
+    """Visible text of a parsed node with whitespace collapsed."""
+    return ' '.join(node.get_text(' ').split())
+
+def parse_article_fields(node, base_url, stats=None):
+    """
+    Extract article fields from a parsed listing element using the shared selector table.
+    
+    Args:
+        node (bs4.Tag): Article container (or link) element
+        base_url (str): URL of the listing page, used to resolve relative links
+        stats (SelectorStats): Selector statistics that order and learn from the probes
+        
+    Returns:
+        dict: Fields in the same shape as the JavaScript extraction engine returns
+    """
+    fields = {'title': '', 'content': '', 'author': '', 'date': '', 'url': '', 'image_url': ''}
+    
+    for field in ('title', 'content', 'author', 'date'):
+        matched = None
+        candidates = candidates_for(stats, field, ARTICLE_FIELD_SELECTORS[field])
+        for selector in candidates:
+            with metrics.timer('selector_probe', field=field):
+                found = node.select_one(selector)
+            if found is not None and _node_text(found):
+                fields[field] = _node_text(found)
+                matched = selector
+                break
+        record_probe(stats, field, candidates, matched)
+    
+    link = node if node.name == 'a' else node.find('a', href=True)
+    if link is not None and link.get('href'):
+        fields['url'] = urljoin(base_url, link['href'])
+    
+    matched = None
+    candidates = candidates_for(stats, 'image', ARTICLE_FIELD_SELECTORS['image'])
+    for selector in candidates:
+        with metrics.timer('selector_probe', field='image'):
+            img = node.select_one(selector)
+        if img is None:
+            continue
+        src = img.get('src') or img.get('data-src')
+        if src and not src.endswith('.svg'):
+            fields['image_url'] = urljoin(base_url, src)
+            matched = selector
+            break
+    record_probe(stats, 'image', candidates, matched)
+    
+    return fields
+
+def parse_article_body(html, stats=None):
+    """Return the non-empty body paragraphs of an article page, probing selectors in the order ``stats`` suggests."""
+    soup = BeautifulSoup(html, 'lxml')
+    candidates = candidates_for(stats, 'body', FULL_ARTICLE_CONTENT_SELECTORS)
+    for selector in candidates:
+        with metrics.timer('selector_probe', field='body'):
+            paragraphs = [_node_text(p) for p in soup.select(selector)]
+        paragraphs = [p for p in paragraphs if p]
+        if paragraphs:
+            record_probe(stats, 'body', candidates, selector)
+            return paragraphs
+    record_probe(stats, 'body', candidates, None)
+    return []
+
+class HttpScraper(ElPaisScraper):
+    """Scraper that fetches pages over pooled HTTP and parses them with lxml.
+    
+    No browser is started unless parsing comes back empty, in which case the
+    inherited Selenium path is used for the listing or for the affected article.
+    """
+    
+    def __init__(self, browser='chrome', headless=True, article_index=None, dedupe_index=None, selector_stats=None):
+        super().__init__(browser=browser, headless=headless, article_index=article_index, dedupe_index=dedupe_index,
+                         selector_stats=selector_stats)
+        self.session = None
+        self.listing_url = config.ELPAIS_OPINION_URL
+        self.listing = None
+    
+    def setup_driver(self):
+        """Set up the pooled HTTP session; the browser is only started on fallback."""
+        self.session = create_http_session()
+        print("\u2713 HTTP session initialized")
+    
+    def _ensure_browser(self):
+        """Start the Selenium driver for fallback scraping, once."""
+        if self.driver is None:
+            print("\u26a0 Falling back to " + self.browser_type.capitalize() + " WebDriver")
+            super().setup_driver()
+    
+    def fetch(self, url):
+        """GET a page and return its HTML, or None on failure."""
+        try:
+            response = self.session.get(url, timeout=config.HTTP_TIMEOUT)
+        except requests.RequestException as e:
+            print("\u2717 HTTP error for " + url + ": " + str(e))
+            return None
+        if response.status_code != 200:
+            print("\u2717 HTTP " + str(response.status_code) + " for " + url)
+            return None
+        return response.text
+    
+    def navigate_to_opinion_section(self):
+        """Fetch and parse the El País Opinion listing page."""
+        print("\nFetching: " + self.listing_url)
+        with metrics.timer('navigation', backend='http'):
+            html = self.fetch(self.listing_url)
+            self.listing = BeautifulSoup(html, 'lxml') if html else None
+        if self.listing is not None and self.listing.title:
+            print("\u2713 Successfully loaded: " + _node_text(self.listing.title))
+    
+    def _find_article_nodes(self, max_articles):
+        """Locate article containers on the parsed listing page."""
+        if self.listing is None:
+            return []
+        candidates = candidates_for(self.selector_stats, 'listing', ARTICLE_LIST_SELECTORS)
+        for selector in candidates:
+            with metrics.timer('selector_probe', field='listing'):
+                nodes = self.listing.select(selector)
+            if nodes and len(nodes) >= max_articles:
+                print("\u2713 Found " + str(len(nodes)) + " articles using selector: " + selector)
+                record_probe(self.selector_stats, 'listing', candidates, selector)
+                return nodes
+        record_probe(self.selector_stats, 'listing', candidates, None)
+        
+        print("\u26a0 Could not find articles with standard selectors, trying alternative approach...")
+        links = [a for a in self.listing.find_all('a', href=True) if '/opinion/' in a['href']]
+        return links[:max_articles]
+    
+    def _iter_scraped(self, max_articles=5):
+        """Yield articles parsed over HTTP as each one's content arrives, falling back to Selenium if nothing parses."""
+        parsed = []
+        for idx, node in enumerate(self._find_article_nodes(max_articles)[:max_articles], 1):
+            print(f"Processing article {idx}...")
+            fields = parse_article_fields(node, self.listing_url, self.selector_stats)
+            article_data = self.complete_article(fields, idx, fetch_content=False)
+            if not article_data:
+                print(f"\u26a0 Article {idx} - no data extracted")
+            elif not article_data.get('duplicate_of'):
+                parsed.append(article_data)
+        
+        if not parsed:
+            print("\u26a0 No articles parsed from static HTML")
+            self._ensure_browser()
+            super().navigate_to_opinion_section()
+            yield from super()._iter_scraped(max_articles=max_articles)
+            return
+        
+        # Article pages are fetched concurrently; each article is yielded, in order, once its content is in
+        with ThreadPoolExecutor(max_workers=config.HTTP_WORKERS) as executor:
+            contents = executor.map(self._listing_or_page_content, parsed)
+            for article_data, content in zip(parsed, contents):
+                article_data['content'] = content or self._browser_content(article_data)
+                print("\u2713 Article " + str(article_data['index']) + " scraped successfully")
+                yield article_data
+    
+    def _listing_or_page_content(self, article):
+        """Content from the listing if present, otherwise from the article page over HTTP."""
+        if article['content'] or not article['url']:
+            return article['content']
+        return self._fetch_article_content(article['url'])
+    
+    def _browser_content(self, article):
+        """Selenium fallback for an article whose page parsed empty."""
+        if not article['url']:
+            return ''
+        self._ensure_browser()
+        return self._scrape_full_article(article['url'])
+    
+    def _fetch_article_content(self, url):
+        """Fetch an article page over HTTP and return its opening paragraphs."""
+        with metrics.timer('article_fetch', backend='http'):
+            html = self.fetch(url)
+        paragraphs = parse_article_body(html, self.selector_stats) if html else []
+        return ' '.join(paragraphs[:3])
+    
+    @contextmanager
+    def _content_fetcher(self):
+        """Fetch article pages of a browser-scraped listing concurrently over the pooled session."""
+        with ThreadPoolExecutor(max_workers=config.HTTP_WORKERS) as executor:
+            yield lambda article: executor.submit(self._fetch_article_content, article['url'])
+    
+    def _missing_content(self, article):
+        return self._browser_content(article)
+    
+    def create_image_downloader(self, session=None):
+        """Create an image downloader sharing the scraper's keep-alive pool."""
+        return super().create_image_downloader(session=session or self.session)
+    
+    def close(self):
+        """Close the HTTP session and any fallback WebDriver."""
+        if self.session:
+            self.session.close()
+            self.session = None
+        super().close()
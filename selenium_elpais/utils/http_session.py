@@ -0,0 +1,29 @@
+"""Pooled keep-alive HTTP session shared by the HTTP scraper and downloaders."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+
+def create_http_session(pool_size=None):
+    """
+    Create a keep-alive HTTP session with a connection pool and retries.
+    
+    Args:
+        pool_size (int): Maximum pooled connections per host (default: config.HTTP_POOL_SIZE)
+        
+    Returns:
+        requests.Session: Configured session
+    """
+    pool_size = pool_size or config.HTTP_POOL_SIZE
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504), allowed_methods=('GET', 'HEAD'))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': config.HTTP_USER_AGENT,
+        'Accept-Language': 'es-ES,es;q=0.9'
+    })
+    return session
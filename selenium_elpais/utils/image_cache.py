@@ -0,0 +1,159 @@
+"""Content-addressed on-disk image cache with conditional revalidation."""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    ext TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_urls_digest ON urls(digest);
+CREATE INDEX IF NOT EXISTS idx_objects_last_access ON objects(last_access);
+"""
+
+class ImageCache:
+    """Image store keyed by URL and by SHA-256 of the content.
+    
+    Each distinct image body is stored once under ``objects/<aa>/<digest><ext>``
+    however many URLs or articles point at it. URL entries keep the validators
+    (ETag, Last-Modified) needed to revalidate with a conditional request, and
+    objects are evicted least-recently-used first once the cache exceeds its
+    size cap.
+    """
+    
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = Path(cache_dir or config.IMAGE_CACHE_DIR)
+        self.objects_dir = self.cache_dir / 'objects'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = config.IMAGE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.cache_dir / 'index.sqlite'), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+    
+    def object_path(self, digest, ext):
+        """Path of the stored object for a content digest."""
+        return self.objects_dir / digest[:2] / (digest + ext)
+    
+    def lookup(self, url):
+        """
+        Find the cached entry for a URL.
+        
+        Args:
+            url (str): Image URL
+            
+        Returns:
+            dict: digest, ext, etag, last_modified and path, or None if not cached
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT u.digest, o.ext, u.etag, u.last_modified FROM urls u "
+                "JOIN objects o ON o.digest = u.digest WHERE u.url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        digest, ext, etag, last_modified = row
+        path = self.object_path(digest, ext)
+        if not path.exists():
+            return None
+        return {'digest': digest, 'ext': ext, 'etag': etag, 'last_modified': last_modified, 'path': path}
+    
+    @staticmethod
+    def conditional_headers(entry):
+        """Request headers that revalidate a cached entry."""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def touch(self, url, digest):
+        """Mark a URL as revalidated and its object as recently used."""
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute("UPDATE urls SET fetched_at = ? WHERE url = ?", (now, url))
+            self._db.execute("UPDATE objects SET last_access = ? WHERE digest = ?", (now, digest))
+    
+    def store(self, url, tmp_path, digest, ext, etag=None, last_modified=None):
+        """
+        Move a freshly downloaded file into the store, deduplicating by digest.
+        
+        Args:
+            url (str): Source URL
+            tmp_path (str): Downloaded file; consumed by this call
+            digest (str): SHA-256 hex digest of the file
+            ext (str): File extension including the dot
+            etag (str): ETag response header, if any
+            last_modified (str): Last-Modified response header, if any
+            
+        Returns:
+            Path: Path of the stored object
+        """
+        path = self.object_path(digest, ext)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+        
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO objects (digest, ext, size, last_access) VALUES (?, ?, ?, ?)",
+                (digest, ext, path.stat().st_size, now)
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO urls (url, digest, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, digest, etag, last_modified, now)
+            )
+        return path
+    
+    def total_bytes(self):
+        """Total size of all stored objects."""
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+    
+    def evict(self):
+        """
+        Remove least-recently-used objects until the cache fits its size cap.
+        
+        Returns:
+            int: Number of objects removed
+        """
+        removed = 0
+        with self._lock, self._db:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            rows = self._db.execute("SELECT digest, ext, size FROM objects ORDER BY last_access").fetchall()
+            for digest, ext, size in rows:
+                if total <= self.max_bytes:
+                    break
+                path = self.object_path(digest, ext)
+                if path.exists():
+                    path.unlink()
+                self._db.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+                self._db.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+                total -= size
+                removed += 1
+        return removed
+    
+    def close(self):
+        """Close the index database."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,165 @@
+"""Process-wide timers and counters with Prometheus text and JSON export."""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Prefix for exported metric names
+NAMESPACE = 'elpais'
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in labels)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + '}'
+
+class MetricsRegistry:
+    """Thread-safe timers and counters keyed by name and labels.
+    
+    Timers keep a count, total and maximum of observed durations; counters
+    keep a running total. Both are cheap enough to wrap every selector probe.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timers = {}
+        self.counters = {}
+    
+    def observe(self, name, seconds, **labels):
+        """Record one duration for a timer."""
+        key = _key(name, labels)
+        with self._lock:
+            stats = self.timers.get(key)
+            if stats is None:
+                stats = self.timers[key] = {'count': 0, 'sum': 0.0, 'max': 0.0}
+            stats['count'] += 1
+            stats['sum'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+    
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time the enclosed block; an exception also counts toward '<name>_errors'."""
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.inc(name + '_errors', **labels)
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    def inc(self, name, amount=1, **labels):
+        """Add to a counter."""
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+    
+    def record_selectors(self, field, candidates, matched):
+        """
+        Count hits and misses for a selector list tried in order.
+        
+        Selectors before the matching one missed; if nothing matched, all of them did.
+        
+        Args:
+            field (str): Field the selectors extract, e.g. 'title'
+            candidates (list): Selectors in the order they were tried
+            matched (str): Selector that matched, or None
+        """
+        for selector in candidates:
+            hit = selector == matched
+            self.inc('selector_probes', field=field, selector=selector, result='hit' if hit else 'miss')
+            if hit:
+                break
+    
+    def selector_miss_rates(self):
+        """Share of probes that missed, per field."""
+        totals = {}
+        with self._lock:
+            for (name, labels), value in self.counters.items():
+                if name != 'selector_probes':
+                    continue
+                labels = dict(labels)
+                hits, probes = totals.get(labels['field'], (0, 0))
+                totals[labels['field']] = (hits + (value if labels['result'] == 'hit' else 0), probes + value)
+        return {field: round(1 - hits / probes, 3) for field, (hits, probes) in sorted(totals.items()) if probes}
+    
+    def slowest(self, k=5):
+        """
+        Timers with the largest total time.
+        
+        Returns:
+            list: (name, labels dict, total seconds, count, max seconds) tuples, slowest first
+        """
+        with self._lock:
+            items = [(name, dict(labels), s['sum'], s['count'], s['max']) for (name, labels), s in self.timers.items()]
+        return sorted(items, key=lambda x: -x[2])[:k]
+    
+    def to_dict(self):
+        """JSON-serializable snapshot of every timer and counter."""
+        with self._lock:
+            return {
+                'timers': [dict(name=name, labels=dict(labels), **stats) for (name, labels), stats in sorted(self.timers.items())],
+                'counters': [{'name': name, 'labels': dict(labels), 'value': value} for (name, labels), value in sorted(self.counters.items())],
+            }
+    
+    def to_prometheus(self):
+        """Snapshot in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            timers = sorted(self.timers.items())
+            counters = sorted(self.counters.items())
+        for name in sorted({name for (name, _), _ in timers}):
+            metric = f"{NAMESPACE}_{name}_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for (timer_name, labels), stats in timers:
+                if timer_name == name:
+                    lines.append(f"{metric}_sum{_format_labels(labels)} {stats['sum']:.6f}")
+                    lines.append(f"{metric}_count{_format_labels(labels)} {stats['count']}")
+            lines.append(f"# TYPE {metric}_max gauge")
+            for (timer_name, labels), stats in timers:
+                if timer_name == name:
+                    lines.append(f"{metric}_max{_format_labels(labels)} {stats['max']:.6f}")
+        for name in sorted({name for (name, _), _ in counters}):
+            metric = f"{NAMESPACE}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for (counter_name, labels), value in counters:
+                if counter_name == name:
+                    lines.append(f"{metric}{_format_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+    
+    def export(self, path):
+        """
+        Atomically write the metrics to a file.
+        
+        Args:
+            path (str): '.json' writes JSON; anything else (e.g. '.prom') writes Prometheus text
+        
+        Returns:
+            Path: The written file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == '.json':
+            body = json.dumps(dict(self.to_dict(), exported_at=time.time()), indent=2)
+        else:
+            body = self.to_prometheus()
+        tmp_path = path.with_name(path.name + '.part')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+        return path
+    
+    def reset(self):
+        """Forget every timer and counter."""
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+
+# Shared registry the scraper, translator, downloader and analyzer report into
+metrics = MetricsRegistry()
@@ -0,0 +1,159 @@
+"""Streaming article pipeline: stages connected by bounded queues, each on its own workers."""
+
+import queue
+import threading
+import time
+
+import config
+
+_DONE = object()
+
+class Stage:
+    """One pipeline step applied to each article.
+    
+    ``fn`` receives an article dict and updates it in place; its return value
+    is ignored. Exceptions are reported and the article is passed on as is, so
+    one failing step never stalls the stream.
+    
+    With ``batch_size``, ``fn`` receives lists of up to that many articles
+    instead, collected for at most ``batch_wait`` seconds after the first one
+    arrives, so steps such as translation can use batch APIs while streaming.
+    """
+    
+    def __init__(self, name, fn, workers=1, batch_size=None, batch_wait=0.0):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size) if batch_size else None
+        self.batch_wait = batch_wait
+        self.processed = 0
+        self.busy_seconds = 0.0
+
+class Pipeline:
+    """Run articles from a source through stages into a sink as soon as each is ready.
+    
+    Stages are linked by queues of at most ``queue_size`` articles, so a slow
+    stage applies back-pressure instead of letting work pile up in memory, and
+    the time to the first result does not depend on the number of articles.
+    """
+    
+    def __init__(self, stages, queue_size=None):
+        self.stages = stages
+        self.queue_size = queue_size or config.PIPELINE_QUEUE_SIZE
+        self.first_result_seconds = None
+        self.errors = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _take(stage, inbox):
+        """
+        Take the next article, or for a batching stage the next batch of articles.
+        
+        Returns:
+            tuple: (list of articles, whether the end-of-stream sentinel was reached)
+        """
+        article = inbox.get()
+        if article is _DONE:
+            return [], True
+        batch = [article]
+        deadline = time.monotonic() + stage.batch_wait
+        while stage.batch_size and len(batch) < stage.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                article = inbox.get(timeout=timeout) if timeout > 0 else inbox.get_nowait()
+            except queue.Empty:
+                break
+            if article is _DONE:
+                return batch, True
+            batch.append(article)
+        return batch, False
+    
+    def _worker(self, stage, inbox, outbox, remaining):
+        while True:
+            batch, done = self._take(stage, inbox)
+            if batch:
+                started = time.perf_counter()
+                try:
+                    stage.fn(batch if stage.batch_size else batch[0])
+                except Exception as e:
+                    indexes = ', '.join(str(article.get('index')) for article in batch)
+                    print("\u2717 Stage '" + stage.name + "' failed for Article " + indexes + ": " + str(e))
+                    with self._lock:
+                        self.errors += 1
+                with self._lock:
+                    stage.processed += len(batch)
+                    stage.busy_seconds += time.perf_counter() - started
+                for article in batch:
+                    outbox.put(article)
+            if done:
+                # Let sibling workers see the sentinel too; the last one out closes the next queue
+                inbox.put(_DONE)
+                with self._lock:
+                    remaining[stage.name] -= 1
+                    last = remaining[stage.name] == 0
+                if last:
+                    outbox.put(_DONE)
+                return
+    
+    def run(self, source, sink):
+        """
+        Stream every article from ``source`` through the stages into ``sink``.
+        
+        Args:
+            source (iterable): Yields article dicts; consumed on the calling thread
+            sink (callable): Called with each finished article, on a single thread
+            
+        Returns:
+            int: Number of articles delivered to the sink
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        remaining = {stage.name: stage.workers for stage in self.stages}
+        threads = []
+        for stage, inbox, outbox in zip(self.stages, queues, queues[1:]):
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker, args=(stage, inbox, outbox, remaining),
+                    name=f"{stage.name}-{n}", daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+        
+        delivered = [0]
+        started = time.perf_counter()
+        
+        def drain():
+            while True:
+                article = queues[-1].get()
+                if article is _DONE:
+                    return
+                if self.first_result_seconds is None:
+                    self.first_result_seconds = time.perf_counter() - started
+                try:
+                    sink(article)
+                except Exception as e:
+                    # Keep draining so upstream stages never block on a full queue
+                    print("\u2717 Sink failed for Article " + str(article.get('index')) + ": " + str(e))
+                    with self._lock:
+                        self.errors += 1
+                    continue
+                delivered[0] += 1
+        
+        sink_thread = threading.Thread(target=drain, name="sink", daemon=True)
+        sink_thread.start()
+        
+        try:
+            for article in source:
+                queues[0].put(article)
+        finally:
+            queues[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+            sink_thread.join()
+        return delivered[0]
+    
+    def print_stats(self):
+        """Print per-stage throughput and time to first result."""
+        for stage in self.stages:
+            print(f"  {stage.name}: {stage.processed} article(s), {stage.busy_seconds:.2f}s busy on {stage.workers} worker(s)")
+        if self.first_result_seconds is not None:
+            print(f"  Time to first result: {self.first_result_seconds:.2f}s")
@@ -0,0 +1,270 @@
+"""Append-only results store: rotating gzip JSONL segments with a URL/time index."""
+
+import gzip
+import json
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    name TEXT PRIMARY KEY,
+    min_ts TEXT,
+    max_ts TEXT,
+    records INTEGER NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    sealed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS records (
+    url TEXT,
+    run_ts TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_records_url ON records(url, run_ts);
+CREATE INDEX IF NOT EXISTS idx_records_run_ts ON records(run_ts);
+CREATE TABLE IF NOT EXISTS runs (
+    run_ts TEXT PRIMARY KEY,
+    total_articles INTEGER NOT NULL,
+    analysis TEXT NOT NULL
+);
+"""
+
+class ResultsStore:
+    """Append-only history of scraped articles across runs.
+    
+    Records are appended as JSON lines to gzip-compressed segment files that
+    rotate once they reach a size or record limit. A SQLite index maps every
+    record to its article URL, run timestamp, segment and line, so range
+    queries only open the segments they need. Segments can be compacted into
+    a single columnar file (Parquet or Feather) for analysis tools.
+    """
+    
+    def __init__(self, root=None, max_segment_bytes=None, max_segment_records=None):
+        self.root = Path(root or config.RESULTS_STORE_DIR)
+        self.segments_dir = self.root / 'segments'
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes or config.RESULTS_SEGMENT_MAX_BYTES
+        self.max_segment_records = max_segment_records or config.RESULTS_SEGMENT_MAX_RECORDS
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.root / 'index.sqlite'), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._segment = None
+        self._handle = None
+        self._recovered = False
+    
+    def _scan_segment(self, name):
+        """
+        Read a segment back as far as it is intact.
+        
+        Returns:
+            tuple: (complete lines, their bytes, whether the gzip stream ended cleanly)
+        """
+        lines = size = 0
+        try:
+            with gzip.open(self.segments_dir / name, 'rt', encoding='utf-8') as f:
+                for text in f:
+                    if not text.endswith('\n'):
+                        return lines, size, False
+                    lines += 1
+                    size += len(text)
+        except FileNotFoundError:
+            return 0, 0, True
+        except (EOFError, OSError, ValueError, zlib.error):
+            # A process that died mid-segment leaves a gzip member without its trailer
+            return lines, size, False
+        return lines, size, True
+    
+    def _recover_segment(self, name, records):
+        """
+        Reconcile an unsealed segment left by an earlier process with its index rows.
+        
+        Index rows past the lines actually on disk are dropped and the record count
+        is set to what the file holds, so new lines get the right line numbers. A
+        segment whose gzip stream was cut off cannot be appended to and is sealed.
+        
+        Returns:
+            bool: True if the segment can take more records
+        """
+        lines, size, intact = self._scan_segment(name)
+        with self._db:
+            if lines != records:
+                print(f"\u26a0 Results segment {name}: index had {records} record(s), file has {lines}; reconciled")
+                self._db.execute("DELETE FROM records WHERE segment = ? AND line >= ?", (name, lines))
+                self._db.execute("UPDATE segments SET records = ?, bytes = ? WHERE name = ?", (lines, size, name))
+            if not intact:
+                self._db.execute("UPDATE segments SET sealed = 1 WHERE name = ?", (name,))
+        return intact
+    
+    def _open_segment(self, run_ts):
+        """Reopen the unsealed segment, or start a new one."""
+        row = self._db.execute(
+            "SELECT name, records, bytes FROM segments WHERE sealed = 0 ORDER BY name DESC LIMIT 1"
+        ).fetchone()
+        if row is not None and not self._recovered:
+            self._recovered = True
+            if not self._recover_segment(row[0], row[1]):
+                return self._open_segment(run_ts)
+            row = self._db.execute("SELECT name, records, bytes FROM segments WHERE name = ?", (row[0],)).fetchone()
+        if row is None:
+            name = 'seg-' + datetime.now().strftime('%Y%m%dT%H%M%S%f') + '.jsonl.gz'
+            with self._db:
+                self._db.execute("INSERT INTO segments (name) VALUES (?)", (name,))
+            row = (name, 0, 0)
+        self._segment = {'name': row[0], 'records': row[1], 'bytes': row[2]}
+        # Appending adds a new gzip member; gzip readers treat the members as one stream
+        self._handle = gzip.open(self.segments_dir / row[0], 'at', encoding='utf-8')
+    
+    def _seal_segment(self):
+        """Close the current segment so the next append starts a new one."""
+        self._handle.close()
+        with self._db:
+            self._db.execute("UPDATE segments SET sealed = 1 WHERE name = ?", (self._segment['name'],))
+        self._handle = None
+        self._segment = None
+    
+    def append(self, article, run_ts):
+        """
+        Append one article record to the store.
+        
+        Args:
+            article (dict): Article dictionary
+            run_ts (str): ISO timestamp of the run the record belongs to
+        """
+        line = json.dumps(dict(article, run_ts=run_ts), ensure_ascii=False)
+        with self._lock:
+            if self._handle is None:
+                self._open_segment(run_ts)
+            segment = self._segment
+            self._handle.write(line + '\n')
+            # The line must be readable from disk before the index points at it
+            self._handle.flush()
+            with self._db:
+                self._db.execute(
+                    "INSERT INTO records (url, run_ts, segment, line) VALUES (?, ?, ?, ?)",
+                    (article.get('url'), run_ts, segment['name'], segment['records'])
+                )
+                self._db.execute(
+                    "UPDATE segments SET records = records + 1, bytes = bytes + ?, "
+                    "min_ts = COALESCE(MIN(min_ts, ?), ?), max_ts = COALESCE(MAX(max_ts, ?), ?) WHERE name = ?",
+                    (len(line) + 1, run_ts, run_ts, run_ts, run_ts, segment['name'])
+                )
+            segment['records'] += 1
+            segment['bytes'] += len(line) + 1
+            if segment['records'] >= self.max_segment_records or segment['bytes'] >= self.max_segment_bytes:
+                self._seal_segment()
+    
+    def append_run(self, run_ts, total_articles, analysis):
+        """Record the run-level summary and analysis."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO runs (run_ts, total_articles, analysis) VALUES (?, ?, ?)",
+                (run_ts, total_articles, json.dumps(analysis, ensure_ascii=False))
+            )
+    
+    def flush(self):
+        """Close the open segment file so everything written so far is on disk."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+                self._segment = None
+    
+    @staticmethod
+    def _range_filter(start=None, end=None, url=None):
+        """SQL WHERE clause and parameters for a run-time range and optional URL."""
+        clauses, params = [], []
+        if start:
+            clauses.append("run_ts >= ?")
+            params.append(start)
+        if end:
+            clauses.append("run_ts <= ?")
+            params.append(end)
+        if url:
+            clauses.append("url = ?")
+            params.append(url)
+        return ((" WHERE " + " AND ".join(clauses)) if clauses else ""), params
+    
+    def query(self, start=None, end=None, url=None):
+        """
+        Iterate stored records in a run-time range, optionally for one URL.
+        
+        Args:
+            start (str): Inclusive lower bound on run timestamp (ISO format)
+            end (str): Inclusive upper bound on run timestamp (ISO format)
+            url (str): Only return records for this article URL
+            
+        Yields:
+            dict: Article records with their 'run_ts'
+        """
+        self.flush()
+        where, params = self._range_filter(start, end, url)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT segment, line FROM records" + where + " ORDER BY segment, line", params
+            ).fetchall()
+        
+        wanted = {}
+        for segment, line in rows:
+            wanted.setdefault(segment, set()).add(line)
+        for segment in sorted(wanted):
+            lines = wanted[segment]
+            last = max(lines)
+            with gzip.open(self.segments_dir / segment, 'rt', encoding='utf-8') as f:
+                try:
+                    for n, text in enumerate(f):
+                        if n in lines:
+                            yield json.loads(text)
+                        if n >= last:
+                            break
+                except EOFError:
+                    # Segment sealed after a crash: every indexed line was flushed before the cut
+                    pass
+    
+    def runs(self, start=None, end=None):
+        """List run summaries (timestamp, article count, analysis) in a time range."""
+        where, params = self._range_filter(start, end)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT run_ts, total_articles, analysis FROM runs" + where + " ORDER BY run_ts", params
+            ).fetchall()
+        return [{'run_ts': r[0], 'total_articles': r[1], 'analysis': json.loads(r[2])} for r in rows]
+    
+    def compact(self, output_path=None, start=None, end=None, fmt='parquet'):
+        """
+        Write records in a time range to one columnar file.
+        
+        Args:
+            output_path (str): Destination file (default: <store>/compacted/articles.<fmt>)
+            start (str): Inclusive lower bound on run timestamp
+            end (str): Inclusive upper bound on run timestamp
+            fmt (str): 'parquet' or 'feather'
+            
+        Returns:
+            Path: Path of the written file
+        """
+        import pandas as pd
+        
+        if fmt not in ('parquet', 'feather'):
+            raise ValueError("Unsupported columnar format: " + fmt)
+        output_path = Path(output_path or self.root / 'compacted' / ('articles.' + fmt))
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        frame = pd.DataFrame.from_records(list(self.query(start=start, end=end)))
+        try:
+            if fmt == 'parquet':
+                frame.to_parquet(output_path, index=False)
+            else:
+                frame.to_feather(output_path)
+        except ImportError as e:
+            raise RuntimeError("Columnar export needs pyarrow (pip install pyarrow): " + str(e))
+        return output_path
+    
+    def close(self):
+        """Flush the open segment and close the index."""
+        self.flush()
+        with self._lock:
+            self._db.close()
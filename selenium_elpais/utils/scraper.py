@@ -1,91 +1,99 @@
 """El País web scraper module using Selenium."""
 
-import time
 import os
-import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.common.exceptions import WebDriverException
 
 import config
+from .driver_pool import DriverPool
+from .warm_pool import warm_pool
+from .downloader import ImageDownloader
+from .image_cache import ImageCache
+from .metrics import metrics
+from .selector_stats import candidates_for, record_probe
+from .waits import WaitPolicy
+from .selector_tables import (
+    ARTICLE_FIELD_SELECTORS,
+    ARTICLE_LIST_SELECTORS,
+    FULL_ARTICLE_CONTENT_SELECTORS,
+)
+
+# Extracts every field of every article element in a single round trip.
+# arguments[0]: list of article elements, arguments[1]: field -> selector list table.
+# Each result's 'matched' maps a field to the selector that supplied it, for hit/miss metrics.
+EXTRACT_ARTICLES_JS = """
+const elements = arguments[0];
+const table = arguments[1];
+const text = (node) => (node.innerText || node.textContent || '').trim();
+return elements.map((element) => {
+    const data = {title: '', content: '', author: '', date: '', url: '', image_url: '', matched: {}};
+    for (const field of ['title', 'content', 'author', 'date']) {
+        for (const selector of table[field]) {
+            const node = element.querySelector(selector);
+            if (node && text(node)) {
+                data[field] = text(node);
+                data.matched[field] = selector;
+                break;
+            }
+        }
+    }
+    const link = element.tagName === 'A' ? element : element.querySelector('a');
+    if (link) {
+        data.url = link.href || '';
+    }
+    for (const selector of table.image) {
+        const img = element.querySelector(selector);
+        if (!img) {
+            continue;
+        }
+        const src = img.src || img.getAttribute('data-src');
+        if (src && !src.endsWith('.svg')) {
+            data.image_url = src;
+            data.matched.image = selector;
+            break;
+        }
+    }
+    return data;
+});
+"""
 
 class ElPaisScraper:
     """Scraper for El País Opinion section."""
     
-    def __init__(self, browser='chrome', headless=True):
+    def __init__(self, browser='chrome', headless=True, article_index=None, dedupe_index=None, selector_stats=None):
         self.browser_type = browser
         self.headless = headless
+        self.article_index = article_index
+        self.dedupe_index = dedupe_index
+        self.selector_stats = selector_stats
         self.driver = None
+        self.waits = None
         self.articles = []
         
     def setup_driver(self):
-        """Set up the Selenium WebDriver."""
-        if self.browser_type.lower() == 'chrome':
-            options = ChromeOptions()
-            if self.headless:
-                options.add_argument('--headless=new')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--window-size=1920,1080')
-            options.add_argument('--lang=es-ES')
-            options.add_experimental_option('prefs', {'intl.accept_languages': 'es,es-ES'})
-            
-            try:
-                service = ChromeService(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=options)
-            except Exception as e:
-                print("ChromeDriver installation failed: " + str(e))
-                print("Trying alternative method...")
-                try:
-                    self.driver = webdriver.Chrome(options=options)
-                except Exception as e2:
-                    print("Chrome setup failed completely. Error: " + str(e2))
-                    print("Please use Firefox instead by changing browser='firefox' in main.py")
-                    raise
-            
-        elif self.browser_type.lower() == 'firefox':
-            options = FirefoxOptions()
-            if self.headless:
-                options.add_argument('--headless')
-            options.add_argument('--width=1920')
-            options.add_argument('--height=1080')
-            options.set_preference('intl.accept_languages', 'es-ES, es')
-            
-            service = FirefoxService(GeckoDriverManager().install())
-            self.driver = webdriver.Firefox(service=service, options=options)
-        
-        else:
-            raise ValueError("Unsupported browser: " + self.browser_type)
-        
-        self.driver.implicitly_wait(config.IMPLICIT_WAIT)
-        self.driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
+        """Set up the Selenium WebDriver, borrowing a warm one when the pool has it."""
+        self.driver = warm_pool.acquire(self.browser_type, self.headless)
+        self.waits = WaitPolicy(self.driver)
         print("✓ " + self.browser_type.capitalize() + " WebDriver initialized")
         
     def navigate_to_opinion_section(self):
         """Navigate to El País Opinion section."""
         print("\nNavigating to: " + config.ELPAIS_OPINION_URL)
-        self.driver.get(config.ELPAIS_OPINION_URL)
-        
-        time.sleep(3)
-        try:
-            accept_button = WebDriverWait(self.driver, 5).until(
-                EC.element_to_be_clickable((By.ID, "didomi-notice-agree-button"))
-            )
-            accept_button.click()
-            print("\u2713 Accepted cookie consent")
-            time.sleep(2)
-        except (TimeoutException, NoSuchElementException):
-            print("\u2713 No cookie consent needed")
+        with metrics.timer('navigation', backend='selenium'):
+            self.driver.get(config.ELPAIS_OPINION_URL)
+            
+            if self.waits.dismiss_consent():
+                print("\u2713 Accepted cookie consent")
+            else:
+                print("\u2713 No cookie consent needed")
+            
+            listing_ready = self.waits.listing_ready()
+        if not listing_ready:
+            print("\u26a0 Article listing not ready after " + str(self.waits.budgets['listing']) + "s")
         
         print("\u2713 Successfully loaded: " + self.driver.title)
         
@@ -95,48 +103,75 @@ class ElPaisScraper:
         print("SCRAPING " + str(max_articles) + " ARTICLES FROM OPINION SECTION")
         print("="*60 + "\n")
         
-        article_selectors = [
-            "article",
-            "article.c",
-            "article.c_a",
-            "div[data-dtm-region='articulo']",
-            "section article",
-            "main article"
-        ]
+        for article_data in self.iter_articles(max_articles):
+            self.articles.append(article_data)
         
+        print("\n\u2713 Total articles scraped: " + str(len(self.articles)))
+        return self.articles
+    
+    def iter_articles(self, max_articles=5):
+        """Yield scraped articles one at a time, as soon as each is complete, skipping near-duplicates."""
+        return self._iter_scraped(max_articles)
+    
+    def _iter_scraped(self, max_articles=5):
+        """Yield every unique article scraped from the listing, in order."""
         articles_elements = []
-        for selector in article_selectors:
+        matched = None
+        candidates = candidates_for(self.selector_stats, 'listing', ARTICLE_LIST_SELECTORS)
+        for selector in candidates:
             try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                with metrics.timer('selector_probe', field='listing'):
+                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                 if elements and len(elements) >= max_articles:
                     articles_elements = elements
+                    matched = selector
                     print("\u2713 Found " + str(len(elements)) + " articles using selector: " + selector)
                     break
             except Exception as e:
                 continue
+        record_probe(self.selector_stats, 'listing', candidates, matched)
         
         if not articles_elements:
             print("\u26a0 Could not find articles with standard selectors, trying alternative approach...")
             all_links = self.driver.find_elements(By.TAG_NAME, "a")
             articles_elements = [link for link in all_links if link.get_attribute('href') and '/opinion/' in link.get_attribute('href')][:max_articles]
         
-        for idx, article_element in enumerate(articles_elements[:max_articles], 1):
-            try:
-                print(f"Processing article {idx}...")
-                article_data = self._extract_article_data(article_element, idx)
-                if article_data:
-                    self.articles.append(article_data)
-                    print("\u2713 Article " + str(idx) + " scraped successfully")
-                else:
-                    print(f"\u26a0 Article {idx} - no data extracted")
-            except Exception as e:
-                print("\u2717 Error scraping article " + str(idx) + ": " + str(e))
-                continue
+        articles_elements = articles_elements[:max_articles]
+        # With a session pool, full-article fetches start during the listing pass and run in parallel
+        use_pool = config.FULL_ARTICLE_WORKERS > 1
+        extracted = None
+        if config.EXTRACTION_ENGINE == 'js':
+            extracted = self._extract_articles_js(articles_elements)
         
-        print("\n\u2713 Total articles scraped: " + str(len(self.articles)))
-        return self.articles
+        with ExitStack() as stack:
+            fetch = stack.enter_context(self._content_fetcher()) if use_pool else None
+            # (article, future or None) in index order; an article waits for every earlier one
+            pending = deque()
+            for idx, article_element in enumerate(articles_elements, 1):
+                try:
+                    print(f"Processing article {idx}...")
+                    if extracted is not None:
+                        article_data = self.complete_article(extracted[idx - 1], idx, fetch_content=not use_pool)
+                    else:
+                        article_data = self._extract_article_data(article_element, idx, fetch_content=not use_pool)
+                except Exception as e:
+                    print("\u2717 Error scraping article " + str(idx) + ": " + str(e))
+                    continue
+                
+                if not article_data:
+                    print(f"\u26a0 Article {idx} - no data extracted")
+                    continue
+                if article_data.get('duplicate_of'):
+                    continue
+                needs_page = use_pool and article_data['url'] and not article_data['content']
+                pending.append((article_data, fetch(article_data) if needs_page else None))
+                while pending and (pending[0][1] is None or pending[0][1].done()):
+                    yield self._finish_article(*pending.popleft())
+            
+            while pending:
+                yield self._finish_article(*pending.popleft())
     
-    def _extract_article_data(self, element, index):
+    def _extract_article_data(self, element, index, fetch_content=True):
         """Extract data from a single article element."""
         article_data = {
             'index': index,
@@ -149,15 +184,7 @@ class ElPaisScraper:
             'image_path': ''
         }
         
-        title_selectors = ['h2', 'h2.c_h', 'h2 a', '.c_h', 'header h2', 'h3']
-        for selector in title_selectors:
-            try:
-                title_elem = element.find_element(By.CSS_SELECTOR, selector)
-                article_data['title'] = title_elem.text.strip()
-                if article_data['title']:
-                    break
-            except:
-                continue
+        article_data['title'] = self._probe_field(element, 'title', lambda e: e.text.strip())
         
         try:
             link = element.find_element(By.TAG_NAME, 'a')
@@ -165,74 +192,123 @@ class ElPaisScraper:
         except:
             pass
         
-        content_selectors = ['p', '.c_d', 'div.c_d', 'header p', 'article p']
-        for selector in content_selectors:
-            try:
-                content_elem = element.find_element(By.CSS_SELECTOR, selector)
-                article_data['content'] = content_elem.text.strip()
-                if article_data['content']:
-                    break
-            except:
-                continue
+        for field in ('content', 'author', 'date'):
+            article_data[field] = self._probe_field(element, field, lambda e: e.text.strip())
         
-        author_selectors = ['.c_a_a', 'span.c_a_a', '.author', 'span.author', '[data-dtm-region="autor"]']
-        for selector in author_selectors:
-            try:
-                author_elem = element.find_element(By.CSS_SELECTOR, selector)
-                article_data['author'] = author_elem.text.strip()
-                if article_data['author']:
-                    break
-            except:
-                continue
+        article_data['image_url'] = self._probe_field(element, 'image', self._image_source)
         
-        date_selectors = ['time', '.c_a_d', 'span.c_a_d', '.date', '[datetime]']
-        for selector in date_selectors:
-            try:
-                date_elem = element.find_element(By.CSS_SELECTOR, selector)
-                article_data['date'] = date_elem.text.strip()
-                if article_data['date']:
-                    break
-            except:
-                continue
+        return self.complete_article(article_data, index, fetch_content)
+    
+    def _probe_field(self, element, field, read):
+        """
+        Try a field's selectors in adaptive order, timing each probe and counting hits and misses.
         
-        image_selectors = ['img', 'figure img', 'picture img', '.c_m img']
-        for selector in image_selectors:
-            try:
-                img_elem = element.find_element(By.CSS_SELECTOR, selector)
-                img_url = img_elem.get_attribute('src') or img_elem.get_attribute('data-src')
-                if img_url and not img_url.endswith('.svg'):
-                    article_data['image_url'] = img_url
-                    break
-            except:
-                continue
+        Args:
+            element (WebElement): Article element to search within
+            field (str): Key of ARTICLE_FIELD_SELECTORS
+            read (callable): Returns the field value of a matched element ('' if unusable)
+            
+        Returns:
+            str: Value from the first selector that yields one, or ''
+        """
+        candidates = candidates_for(self.selector_stats, field, ARTICLE_FIELD_SELECTORS[field])
+        for selector in candidates:
+            with metrics.timer('selector_probe', field=field):
+                try:
+                    value = read(element.find_element(By.CSS_SELECTOR, selector))
+                except Exception:
+                    value = ''
+            if value:
+                record_probe(self.selector_stats, field, candidates, selector)
+                return value
+        record_probe(self.selector_stats, field, candidates, None)
+        return ''
+    
+    @staticmethod
+    def _image_source(img_elem):
+        """Image URL of an <img> element, skipping SVG placeholders."""
+        img_url = img_elem.get_attribute('src') or img_elem.get_attribute('data-src')
+        return img_url if img_url and not img_url.endswith('.svg') else ''
+    
+    def _extract_articles_js(self, elements):
+        """Extract all article fields in one execute_script round trip.
+        
+        Returns a list of field dicts aligned with ``elements``, or None if the
+        script could not run so the caller falls back to per-element extraction.
+        """
+        if not elements:
+            return []
+        table = {field: candidates_for(self.selector_stats, field, candidates)
+                 for field, candidates in ARTICLE_FIELD_SELECTORS.items()}
+        try:
+            with metrics.timer('selector_probe', field='all'):
+                extracted = self.driver.execute_script(EXTRACT_ARTICLES_JS, elements, table)
+        except WebDriverException as e:
+            print("\u26a0 JavaScript extraction failed, falling back to per-element extraction: " + str(e).strip())
+            return None
+        if not isinstance(extracted, list) or len(extracted) != len(elements):
+            print("\u26a0 JavaScript extraction returned unexpected data, falling back to per-element extraction")
+            return None
+        for data in extracted:
+            matched = data.get('matched') or {}
+            for field, candidates in table.items():
+                record_probe(self.selector_stats, field, candidates, matched.get(field))
+        return extracted
+    
+    def complete_article(self, fields, index, fetch_content=True):
+        """
+        Build the article record from listing fields and fill in missing content.
+        
+        Near-duplicates are detected on the listing title and teaser, before
+        any page is fetched, and come back marked with 'duplicate_of' and
+        without content. Unchanged articles get their stored record from the
+        article index.
+        
+        Args:
+            fields (dict): Listing fields (title, content, author, date, url, image_url)
+            index (int): Article number in this run
+            fetch_content (bool): Load the article page when the listing has no content
+            
+        Returns:
+            dict: Article dictionary, or None if the fields have no title
+        """
+        article_data = {
+            'index': index,
+            'title': fields.get('title') or '',
+            'content': fields.get('content') or '',
+            'author': fields.get('author') or '',
+            'date': fields.get('date') or '',
+            'url': fields.get('url') or '',
+            'image_url': fields.get('image_url') or '',
+            'image_path': fields.get('image_path') or ''
+        }
+        
+        if not article_data['title']:
+            return None
+        
+        if self.dedupe_index:
+            original = self.dedupe_index.check(article_data)
+            if original:
+                print(f"\u26a0 Article {index} is a near-duplicate of {original}, skipping")
+                return article_data
+        
+        if self.article_index and self.article_index.check(article_data):
+            print("\u2713 Article " + str(index) + " unchanged since last run, reusing stored data")
+            return article_data
         
-        if article_data['url'] and not article_data['content']:
+        if fetch_content and article_data['url'] and not article_data['content']:
             article_data['content'] = self._scrape_full_article(article_data['url'])
         
-        return article_data if article_data['title'] else None
+        return article_data
     
     def _scrape_full_article(self, url):
         """Scrape the full article content from its page."""
         try:
-            self.driver.execute_script("window.open('" + url + "', '_blank');")
-            self.driver.switch_to.window(self.driver.window_handles[-1])
-            time.sleep(2)
-            content_selectors = [
-                'article p',
-                '.a_c p',
-                '.article-body p',
-                '[data-dtm-region="articulo_cuerpo"] p'
-            ]
-            
-            content_paragraphs = []
-            for selector in content_selectors:
-                try:
-                    paragraphs = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    content_paragraphs = [p.text.strip() for p in paragraphs if p.text.strip()]
-                    if content_paragraphs:
-                        break
-                except:
-                    continue
+            with metrics.timer('article_fetch', backend='selenium'):
+                self.driver.execute_script("window.open('" + url + "', '_blank');")
+                self.driver.switch_to.window(self.driver.window_handles[-1])
+                self.waits.article_body_ready()
+            content_paragraphs = self._read_article_body(self.driver)
             
             self.driver.close()
             self.driver.switch_to.window(self.driver.window_handles[0])
@@ -248,30 +324,74 @@ class ElPaisScraper:
                 pass
             return ''
     
+    def _read_article_body(self, driver):
+        """Return the non-empty body paragraphs of the article page loaded in the driver."""
+        candidates = candidates_for(self.selector_stats, 'body', FULL_ARTICLE_CONTENT_SELECTORS)
+        for selector in candidates:
+            try:
+                with metrics.timer('selector_probe', field='body'):
+                    paragraphs = driver.find_elements(By.CSS_SELECTOR, selector)
+                    content_paragraphs = [p.text.strip() for p in paragraphs if p.text.strip()]
+                if content_paragraphs:
+                    record_probe(self.selector_stats, 'body', candidates, selector)
+                    return content_paragraphs
+            except:
+                continue
+        record_probe(self.selector_stats, 'body', candidates, None)
+        return []
+    
+    def _load_full_article(self, session, url):
+        """Load an article page in a pooled session and return its opening paragraphs."""
+        with metrics.timer('article_fetch', backend='pool'):
+            session.driver.get(url)
+            session.waits.article_body_ready()
+        content_paragraphs = self._read_article_body(session.driver)
+        return ' '.join(content_paragraphs[:3])
+    
+    @contextmanager
+    def _content_fetcher(self):
+        """
+        Parallel full-article fetching over a driver session pool.
+        
+        Yields:
+            callable: Takes an article and returns a future for its page content
+        """
+        print(f"Fetching full articles with {config.FULL_ARTICLE_WORKERS} parallel sessions...")
+        with DriverPool(browser=self.browser_type) as pool, ThreadPoolExecutor(max_workers=pool.workers) as executor:
+            yield lambda article: executor.submit(pool.run, self._load_full_article, article['url'])
+    
+    def _missing_content(self, article):
+        """Content for an article whose page fetch came back empty."""
+        return ''
+    
+    def _finish_article(self, article, future):
+        """Fill in fetched content, if any was pending, and report the article as done."""
+        if future is not None:
+            article['content'] = future.result() or self._missing_content(article)
+        print("\u2713 Article " + str(article['index']) + " scraped successfully")
+        return article
+    
+    def create_image_downloader(self, session=None):
+        """
+        Create an image downloader with the configured image cache.
+        
+        Args:
+            session (requests.Session): HTTP pool to share (default: the downloader opens and closes its own)
+        """
+        cache = ImageCache() if config.IMAGE_CACHE_ENABLED else None
+        return ImageDownloader(session=session, cache=cache)
+    
     def download_images(self):
         """Download images for scraped articles."""
         print("\n" + "="*60)
         print("DOWNLOADING ARTICLE IMAGES")
         print("="*60 + "\n")
         
-        for article in self.articles:
-            if article['image_url']:
-                try:
-                    filename = "article_" + str(article['index']) + ".jpg"
-                    filepath = config.IMAGES_DIR / filename
-                    
-                    response = requests.get(article['image_url'], timeout=10)
-                    if response.status_code == 200:
-                        with open(filepath, 'wb') as f:
-                            f.write(response.content)
-                        article['image_path'] = str(filepath)
-                        print("\u2713 Downloaded image for Article " + str(article['index']) + ": " + filename)
-                    else:
-                        print("\u2717 Failed to download image for Article " + str(article['index']) + " (Status: " + str(response.status_code) + ")")
-                except Exception as e:
-                    print("\u2717 Error downloading image for Article " + str(article['index']) + ": " + str(e))
-            else:
-                print("\u26a0 No image available for Article " + str(article['index']))
+        downloader = self.create_image_downloader()
+        try:
+            downloader.download_all(self.articles)
+        finally:
+            downloader.close()
     
     def print_articles(self):
         """Print scraped articles in Spanish."""
@@ -280,29 +400,35 @@ class ElPaisScraper:
         print("="*60 + "\n")
         
         for article in self.articles:
-            separator = '\u2501' * 60
-            print(separator)
-            print("Artículo " + str(article['index']) + ":")
-            print(separator)
-            print("Título: " + article['title'])
-            if article['author']:
-                print("Autor: " + article['author'])
-            if article['date']:
-                print("Fecha: " + article['date'])
-            if article['content']:
-                content_preview = article['content'][:300]
-                if len(article['content']) > 300:
-                    content_preview += '...'
-                print("Contenido: " + content_preview)
-            if article['url']:
-                print("URL: " + article['url'])
-            print()
+            self.print_article(article)
+    
+    @staticmethod
+    def print_article(article):
+        """Print one scraped article in Spanish."""
+        separator = '\u2501' * 60
+        print(separator)
+        print("Artículo " + str(article['index']) + ":")
+        print(separator)
+        print("Título: " + article['title'])
+        if article['author']:
+            print("Autor: " + article['author'])
+        if article['date']:
+            print("Fecha: " + article['date'])
+        if article['content']:
+            content_preview = article['content'][:300]
+            if len(article['content']) > 300:
+                content_preview += '...'
+            print("Contenido: " + content_preview)
+        if article['url']:
+            print("URL: " + article['url'])
+        print()
     
     def close(self):
-        """Close the WebDriver."""
+        """Hand the WebDriver back to the warm pool, which quits it if it is not kept."""
         if self.driver:
-            self.driver.quit()
-            print("\n\u2713 WebDriver closed")
+            kept = warm_pool.release(self.driver)
+            self.driver = None
+            print("\n\u2713 WebDriver returned to warm pool" if kept else "\n\u2713 WebDriver closed")
     
     def __enter__(self):
         """Context manager entry."""
@@ -0,0 +1,153 @@
+"""Persistent selector hit statistics that adapt the order selectors are tried in."""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import config
+from .metrics import metrics
+
+# Bump when the stored layout changes; other versions are discarded on load
+STATS_VERSION = 1
+
+class SelectorStats:
+    """Learns which fallback selectors match on the current site layout.
+    
+    For every field (an ARTICLE_FIELD_SELECTORS key, 'listing' or 'body') each
+    tried selector keeps exponentially decayed hit and try counts, so recent
+    probes weigh more than old ones. ``order`` returns the candidates by
+    smoothed hit rate (the table order breaks ties, so a fresh store changes
+    nothing) and drops selectors that missed ``skip_after`` times in a row.
+    Every ``reprobe_every``-th ordering of a field keeps them, so a selector
+    that starts matching after a layout change is picked up again. Selectors
+    that were never tried are not penalized.
+    """
+    
+    def __init__(self, path=None, decay=None, skip_after=None, reprobe_every=None):
+        """
+        Args:
+            path (str): JSON file the statistics persist in; None keeps them in memory only
+            decay (float): Weight kept by past probes each time a selector is tried again
+            skip_after (int): Consecutive misses after which a selector is skipped (0 never skips)
+            reprobe_every (int): Every n-th ordering of a field also tries skipped selectors
+        """
+        self.path = Path(path) if path else None
+        self.decay = config.SELECTOR_STATS_DECAY if decay is None else decay
+        self.skip_after = config.SELECTOR_SKIP_AFTER if skip_after is None else skip_after
+        self.reprobe_every = max(1, reprobe_every or config.SELECTOR_REPROBE_EVERY)
+        self.fields = {}
+        self.skipped = 0
+        self._orderings = {}
+        self._lock = threading.Lock()
+        if self.path and self.path.exists():
+            self._load()
+    
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"\u26a0 Could not read selector statistics at {self.path}, starting fresh: {e}")
+            return
+        if data.get('version') == STATS_VERSION:
+            self.fields = data.get('fields', {})
+    
+    @staticmethod
+    def _score(entry):
+        """Hit rate with add-one smoothing; an untried selector scores 0.5."""
+        return (entry['hits'] + 1) / (entry['tries'] + 2)
+    
+    def order(self, field, candidates):
+        """
+        Candidate selectors for a field in the order they should be tried.
+        
+        Args:
+            field (str): Field the selectors extract
+            candidates (list): Selectors in table order
+        
+        Returns:
+            list: Reordered candidates, without consistently missing ones unless a reprobe is due
+        """
+        with self._lock:
+            stats = self.fields.get(field)
+            if not stats:
+                return list(candidates)
+            count = self._orderings[field] = self._orderings.get(field, 0) + 1
+            empty = {'hits': 0.0, 'tries': 0.0, 'streak': 0}
+            entries = [(selector, stats.get(selector, empty)) for selector in candidates]
+        
+        if self.skip_after and count % self.reprobe_every:
+            kept = [(s, e) for s, e in entries if e['streak'] < self.skip_after]
+            # Never skip everything: a field that is simply absent misses on every selector
+            if kept and len(kept) < len(entries):
+                with self._lock:
+                    self.skipped += len(entries) - len(kept)
+                entries = kept
+        ranked = sorted(enumerate(entries), key=lambda x: (-self._score(x[1][1]), x[0]))
+        return [selector for _, (selector, _) in ranked]
+    
+    def record(self, field, candidates, matched):
+        """
+        Update statistics after trying candidates in order.
+        
+        Args:
+            field (str): Field the selectors extract
+            candidates (list): Selectors in the order they were tried
+            matched (str): Selector that matched, or None if none did
+        """
+        with self._lock:
+            stats = self.fields.setdefault(field, {})
+            for selector in candidates:
+                hit = selector == matched
+                entry = stats.get(selector)
+                if entry is None:
+                    entry = stats[selector] = {'hits': 0.0, 'tries': 0.0, 'streak': 0}
+                entry['hits'] = entry['hits'] * self.decay + hit
+                entry['tries'] = entry['tries'] * self.decay + 1
+                entry['streak'] = 0 if hit else entry['streak'] + 1
+                if hit:
+                    break
+    
+    def hit_rates(self, field):
+        """Smoothed hit rate of every tried selector of a field, best first."""
+        with self._lock:
+            stats = dict(self.fields.get(field, {}))
+        rates = {selector: round(self._score(entry), 3) for selector, entry in stats.items()}
+        return dict(sorted(rates.items(), key=lambda x: -x[1]))
+    
+    def save(self):
+        """Atomically write the statistics to the JSON file, if there is one."""
+        if not self.path:
+            return
+        with self._lock:
+            body = json.dumps({'version': STATS_VERSION, 'fields': self.fields}, indent=2)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.part')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+        os.replace(tmp_path, self.path)
+    
+    def summary(self):
+        """One-line summary of the best selector per field."""
+        best = []
+        for field in sorted(self.fields):
+            rates = self.hit_rates(field)
+            if rates:
+                selector, rate = next(iter(rates.items()))
+                best.append(f"{field} '{selector}' {rate:.0%}")
+        return f"{self.skipped} probe(s) skipped; best: " + (', '.join(best) or 'none yet')
+    
+    def close(self):
+        """Persist the statistics."""
+        self.save()
+
+def candidates_for(stats, field, table):
+    """Selectors to try for a field: adaptive order with statistics, table order without."""
+    return stats.order(field, table) if stats is not None else list(table)
+
+def record_probe(stats, field, candidates, matched):
+    """Count a probe sequence in the run metrics and, if given, in the selector statistics."""
+    metrics.record_selectors(field, candidates, matched)
+    if stats is not None:
+        stats.record(field, candidates, matched)
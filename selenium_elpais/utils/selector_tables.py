@@ -0,0 +1,37 @@
+"""CSS selector tables shared by the scraping engines."""
+
+# Candidate selectors for article containers on the listing page
+ARTICLE_LIST_SELECTORS = [
+    "article",
+    "article.c",
+    "article.c_a",
+    "div[data-dtm-region='articulo']",
+    "section article",
+    "main article"
+]
+
+# Candidate selectors for each field inside an article container, tried in order
+ARTICLE_FIELD_SELECTORS = {
+    'title': ['h2', 'h2.c_h', 'h2 a', '.c_h', 'header h2', 'h3'],
+    'content': ['p', '.c_d', 'div.c_d', 'header p', 'article p'],
+    'author': ['.c_a_a', 'span.c_a_a', '.author', 'span.author', '[data-dtm-region="autor"]'],
+    'date': ['time', '.c_a_d', 'span.c_a_d', '.date', '[datetime]'],
+    'image': ['img', 'figure img', 'picture img', '.c_m img']
+}
+
+# Candidate selectors for body paragraphs on a full article page
+FULL_ARTICLE_CONTENT_SELECTORS = [
+    'article p',
+    '.a_c p',
+    '.article-body p',
+    '[data-dtm-region="articulo_cuerpo"] p'
+]
+
+# Candidate selectors for the next-page link on a section listing
+PAGINATION_SELECTORS = [
+    'a[rel="next"]',
+    'link[rel="next"]',
+    'a.pagination-next',
+    'nav[aria-label*="aginac"] a[aria-label*="iguiente"]',
+    'a[aria-label*="iguiente"]'
+]
@@ -0,0 +1,143 @@
+"""Bounded-memory frequency counting: Count-Min Sketch and Space-Saving heavy hitters."""
+
+import heapq
+import math
+from array import array
+
+class CountMinSketch:
+    """Fixed-size frequency sketch whose estimates never undercount.
+    
+    With width ceil(e / epsilon) and depth ceil(ln(1 / delta)), an estimate
+    exceeds the true count by more than epsilon * total with probability at
+    most delta. Memory is width * depth integers regardless of the vocabulary.
+    """
+    
+    def __init__(self, width, depth):
+        self.width = width
+        self.depth = depth
+        self.rows = [array('q', bytes(8 * width)) for _ in range(depth)]
+        self.total = 0
+    
+    @classmethod
+    def from_error(cls, epsilon, delta=0.01):
+        """Size a sketch for an additive error of epsilon * total with confidence 1 - delta."""
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)))
+    
+    def add(self, item, n=1):
+        """Count an item n more times."""
+        self.total += n
+        # Double hashing: row i uses h1 + i * h2 (Kirsch-Mitzenmacher)
+        h = hash(item) & 0xFFFFFFFFFFFFFFFF
+        index, step, width = h & 0xFFFFFFFF, (h >> 32) | 1, self.width
+        for row in self.rows:
+            row[index % width] += n
+            index += step
+    
+    def __getitem__(self, item):
+        h = hash(item) & 0xFFFFFFFFFFFFFFFF
+        index, step, width = h & 0xFFFFFFFF, (h >> 32) | 1, self.width
+        estimate = None
+        for row in self.rows:
+            count = row[index % width]
+            if estimate is None or count < estimate:
+                estimate = count
+            index += step
+        return estimate
+
+class SpaceSaving:
+    """Top-k tracker that keeps at most ``capacity`` counters (Metwally et al.).
+    
+    When a new item arrives and all counters are taken, it replaces the item
+    with the smallest count and inherits that count as its error bound. Any
+    item seen more than total / capacity times is guaranteed to be tracked,
+    and no tracked count is more than total / capacity too high.
+    """
+    
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        # (count, item) entries; counts only grow, so stale entries are lower bounds
+        self._heap = []
+    
+    def _pop_min(self):
+        while True:
+            count, item = heapq.heappop(self._heap)
+            current = self.counts.get(item)
+            if current is None:
+                continue
+            if current != count:
+                heapq.heappush(self._heap, (current, item))
+                continue
+            return item, count
+    
+    def add(self, item, n=1):
+        """Count an item n more times."""
+        self.total += n
+        if item in self.counts:
+            self.counts[item] += n
+            return
+        floor = 0
+        if len(self.counts) >= self.capacity:
+            evicted, floor = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+        self.counts[item] = floor + n
+        self.errors[item] = floor
+        heapq.heappush(self._heap, (floor + n, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i) for i, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+class HeavyHitters:
+    """Approximate word counter with flat memory, shaped like a Counter.
+    
+    Space-Saving decides which words are tracked and a Count-Min Sketch
+    tightens their counts; both only ever overestimate, so the reported
+    count is the smaller of the two. Smaller epsilon means more memory and
+    counts closer to exact.
+    """
+    
+    def __init__(self, epsilon=0.001, delta=0.01):
+        """
+        Args:
+            epsilon (float): Error bound as a fraction of all counted words
+            delta (float): Probability that a sketch estimate exceeds that bound
+        """
+        self.epsilon = epsilon
+        self.summary = SpaceSaving(math.ceil(1 / epsilon))
+        self.sketch = CountMinSketch.from_error(epsilon, delta)
+    
+    @property
+    def total(self):
+        """Number of words counted so far."""
+        return self.summary.total
+    
+    def update(self, items):
+        """Count every item of an iterable once, like Counter.update."""
+        add_summary, add_sketch = self.summary.add, self.sketch.add
+        for item in items:
+            add_summary(item)
+            add_sketch(item)
+    
+    def __getitem__(self, item):
+        tracked = self.summary.counts.get(item)
+        estimate = self.sketch[item]
+        return estimate if tracked is None else min(tracked, estimate)
+    
+    def __len__(self):
+        return len(self.summary.counts)
+    
+    def items(self):
+        """(word, estimated count) pairs for every tracked word."""
+        return [(item, self[item]) for item in self.summary.counts]
+    
+    def most_common(self, k=None):
+        """Tracked words with the highest estimated counts, like Counter.most_common."""
+        ranked = sorted(self.items(), key=lambda x: (-x[1], x[0]))
+        return ranked if k is None else ranked[:k]
+    
+    def error_bound(self):
+        """Largest amount any reported count may exceed the true count by."""
+        return math.ceil(self.epsilon * self.total)
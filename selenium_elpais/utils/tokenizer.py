@@ -0,0 +1,133 @@
+"""Precompiled, batched word tokenizer with optional accent folding."""
+
+import re
+import unicodedata
+from collections import Counter
+
+# A word is a run of letters, digits or underscores; everything else separates words.
+# Equivalent to replacing [^\w\s] with spaces and splitting on whitespace.
+WORD_PATTERN = re.compile(r'\w+')
+
+def _build_fold_table():
+    """str.translate table mapping accented letters and ligatures to ASCII and dropping combining marks."""
+    table = {}
+    for code in range(0xC0, 0x250):
+        char = chr(code)
+        # Keep every base letter, so ligatures like 'ĳ' and 'ǆ' fold to 'ij' and 'dz'
+        folded = ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c))
+        if folded != char and folded.isascii():
+            table[code] = folded
+    for code in range(0x300, 0x370):
+        table[code] = None
+    return table
+
+FOLD_TABLE = _build_fold_table()
+
+# Distinct tokens remembered by Tokenizer.fold_token before the memo is reset
+FOLD_MEMO_SIZE = 100000
+
+def fold_accents(text):
+    """
+    Strip diacritics, e.g. 'opinión' -> 'opinion' and 'España' -> 'Espana'.
+    
+    Precomposed Latin letters go through a translate table; any other
+    non-ASCII text falls back to NFKD decomposition.
+    
+    Args:
+        text (str): Input text
+    
+    Returns:
+        str: Text without combining accents
+    """
+    if text.isascii():
+        return text
+    text = text.translate(FOLD_TABLE)
+    if text.isascii():
+        return text
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+class Tokenizer:
+    """Lowercasing word tokenizer that works on single texts or whole batches."""
+    
+    def __init__(self, fold=False, stopwords=None):
+        """
+        Args:
+            fold (bool): Fold accents so 'política' and 'politica' are one token
+            stopwords (iterable): Tokens to drop (compared after folding)
+        """
+        self.fold = fold
+        self._folded = {}
+        stopwords = stopwords or ()
+        self.stopwords = frozenset(fold_accents(w) for w in stopwords) if fold else frozenset(stopwords)
+    
+    def normalize(self, text):
+        """Lowercase a text before matching words; with folding, compose accents first so they stay inside words."""
+        text = text.lower()
+        if self.fold and not text.isascii():
+            text = unicodedata.normalize('NFC', text)
+        return text
+    
+    def fold_token(self, token):
+        """Fold one token, memoized since vocabularies are far smaller than token streams."""
+        folded = self._folded.get(token)
+        if folded is None:
+            if len(self._folded) >= FOLD_MEMO_SIZE:
+                self._folded.clear()
+            folded = self._folded[token] = fold_accents(token)
+        return folded
+    
+    def tokenize(self, text):
+        """
+        Split one text into tokens.
+        
+        Args:
+            text (str): Input text
+        
+        Returns:
+            list: List of tokens
+        """
+        tokens = WORD_PATTERN.findall(self.normalize(text))
+        if self.fold:
+            tokens = [self.fold_token(t) for t in tokens]
+        if self.stopwords:
+            tokens = [t for t in tokens if t not in self.stopwords]
+        return tokens
+    
+    def tokenize_many(self, texts):
+        """
+        Tokenize a batch of texts.
+        
+        Args:
+            texts (iterable): Input texts; None or empty entries give empty lists
+        
+        Returns:
+            list: One token list per text
+        """
+        return [self.tokenize(text) if text else [] for text in texts]
+    
+    def count(self, texts):
+        """
+        Count tokens across a batch of texts in a single pass.
+        
+        The texts are joined and normalized together, so the regex and the
+        lowercasing run once over the whole batch instead of once per text.
+        Accent folding is applied to the distinct words afterwards.
+        
+        Args:
+            texts (iterable): Input texts
+        
+        Returns:
+            Counter: Token counts
+        """
+        counts = Counter(WORD_PATTERN.findall(self.normalize('\n'.join(t for t in texts if t))))
+        if self.fold:
+            folded = Counter()
+            for word, n in counts.items():
+                folded[self.fold_token(word)] += n
+            counts = folded
+        for word in self.stopwords & counts.keys():
+            del counts[word]
+        return counts
+
+# Shared tokenizer matching TextAnalyzer's historic behaviour (no folding, no stopwords)
+DEFAULT_TOKENIZER = Tokenizer()
@@ -0,0 +1,146 @@
+"""Persistent translation memory with an in-process LRU in front of SQLite."""
+
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source_lang TEXT NOT NULL,
+    target_lang TEXT NOT NULL,
+    text TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (source_lang, target_lang, text)
+);
+CREATE INDEX IF NOT EXISTS idx_translations_last_access ON translations(last_access);
+"""
+
+def normalize_text(text):
+    """Normalize text for cache keys: Unicode NFC with whitespace collapsed."""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+class TranslationCache:
+    """Translation memory keyed by (source_lang, target_lang, normalized text).
+    
+    Lookups go to a bounded in-process LRU first, then to the on-disk store.
+    Entries older than the TTL are treated as misses, and ``evict`` trims the
+    store to its size cap by least recent access.
+    """
+    
+    def __init__(self, path=None, ttl=None, max_entries=None, memory_size=None):
+        self.path = Path(path or config.TRANSLATION_CACHE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = config.TRANSLATION_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or config.TRANSLATION_CACHE_MAX_ENTRIES
+        self.memory_size = memory_size or config.TRANSLATION_MEMORY_SIZE
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+    
+    def _remember(self, key, translation, created_at):
+        """Insert into the in-process LRU, dropping the least recently used entry when full."""
+        self._memory[key] = (translation, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+    
+    def _expired(self, created_at, now):
+        return self.ttl > 0 and now - created_at > self.ttl
+    
+    def get(self, text, source_lang='es', target_lang='en'):
+        """
+        Look up a cached translation.
+        
+        Args:
+            text (str): Source text
+            source_lang (str): Source language code
+            target_lang (str): Target language code
+            
+        Returns:
+            str: Cached translation, or None on a miss
+        """
+        key = (source_lang, target_lang, normalize_text(text))
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached and not self._expired(cached[1], now):
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return cached[0]
+            
+            row = self._db.execute(
+                "SELECT translation, created_at FROM translations WHERE source_lang = ? AND target_lang = ? AND text = ?",
+                key
+            ).fetchone()
+            if row and not self._expired(row[1], now):
+                with self._db:
+                    self._db.execute(
+                        "UPDATE translations SET last_access = ? WHERE source_lang = ? AND target_lang = ? AND text = ?",
+                        (now,) + key
+                    )
+                self._remember(key, row[0], row[1])
+                self.stats['disk_hits'] += 1
+                return row[0]
+            
+            self._memory.pop(key, None)
+            self.stats['misses'] += 1
+            return None
+    
+    def put(self, text, translation, source_lang='es', target_lang='en'):
+        """Store a translation in both the LRU and the on-disk store."""
+        key = (source_lang, target_lang, normalize_text(text))
+        now = time.time()
+        with self._lock:
+            self._remember(key, translation, now)
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations "
+                    "(source_lang, target_lang, text, translation, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                    key + (translation, now, now)
+                )
+    
+    def evict(self):
+        """
+        Drop expired entries, then the least recently used ones above the size cap.
+        
+        Returns:
+            int: Number of entries removed from the on-disk store
+        """
+        now = time.time()
+        with self._lock, self._db:
+            removed = 0
+            if self.ttl > 0:
+                removed += self._db.execute(
+                    "DELETE FROM translations WHERE created_at < ?", (now - self.ttl,)
+                ).rowcount
+            count = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            if count > self.max_entries:
+                removed += self._db.execute(
+                    "DELETE FROM translations WHERE rowid IN "
+                    "(SELECT rowid FROM translations ORDER BY last_access LIMIT ?)",
+                    (count - self.max_entries,)
+                ).rowcount
+            self._memory.clear()
+        return removed
+    
+    def summary(self):
+        """One-line hit/miss summary."""
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['misses']
+        rate = (hits / total * 100) if total else 0.0
+        return (f"{hits} hit(s) ({self.stats['memory_hits']} memory, {self.stats['disk_hits']} disk), "
+                f"{self.stats['misses']} miss(es), {rate:.0f}% hit rate")
+    
+    def close(self):
+        """Close the on-disk store."""
+        with self._lock:
+            self._db.close()
@@ -1,14 +1,17 @@
 """Rapid Translate API integration module."""
 
+import json
 import requests
 import time
 import config
+from .metrics import metrics
+from .translation_cache import TranslationCache
 
 class RapidTranslator:
     """Translator using Rapid Translate Multi Traduction API."""
     
-    def __init__(self):
-        """Initialize the translator with API credentials."""
+    def __init__(self, cache=None):
+        """Initialize the translator with API credentials and an optional translation cache."""
         self.api_url = config.RAPID_TRANSLATE_API_URL
         self.api_key = config.RAPID_TRANSLATE_API_KEY
         self.api_host = config.RAPID_TRANSLATE_API_HOST
@@ -18,6 +21,10 @@ class RapidTranslator:
             'x-rapidapi-host': self.api_host,
             'x-rapidapi-key': self.api_key
         }
+        
+        if cache is None and config.TRANSLATION_CACHE_ENABLED:
+            cache = TranslationCache()
+        self.cache = cache
     
     def translate_text(self, text, source_lang='es', target_lang='en'):
         """
@@ -31,6 +38,23 @@ class RapidTranslator:
         Returns:
             str: Translated text or original text if translation fails
         """
+        if self.cache:
+            cached = self.cache.get(text, source_lang, target_lang)
+            if cached is not None:
+                return cached
+        return self._translate_uncached(text, source_lang, target_lang)
+    
+    def _translate_uncached(self, text, source_lang, target_lang):
+        """Translate a known cache miss with the API and cache the result; the original text if it fails."""
+        translated = self._request_translation(text, source_lang, target_lang)
+        if translated is None:
+            return text
+        if self.cache:
+            self.cache.put(text, translated, source_lang, target_lang)
+        return translated
+    
+    def _request_translation(self, text, source_lang, target_lang):
+        """Translate one text with the API; returns None if the request fails."""
         try:
             payload = {
                 "from": source_lang,
@@ -38,52 +62,165 @@ class RapidTranslator:
                 "q": text
             }
             
-            response = requests.post(
-                self.api_url,
-                json=payload,
-                headers=self.headers,
-                timeout=10
-            )
+            with metrics.timer('translation_call', mode='single'):
+                response = requests.post(
+                    self.api_url,
+                    json=payload,
+                    headers=self.headers,
+                    timeout=10
+                )
             
             if response.status_code == 200:
-                result = response.json()
-                # The API returns the translated text in different formats
-                # Try to extract it
-                if isinstance(result, list) and len(result) > 0:
-                    return result[0]
-                elif isinstance(result, dict):
-                    # Try common keys
-                    for key in ['translatedText', 'translated', 'translation', 'data', 'result']:
-                        if key in result:
-                            translated = result[key]
-                            if isinstance(translated, list) and translated:
-                                return translated[0]
-                            return str(translated)
-                return str(result)
+                return self._extract_translation(response.json())
             else:
                 print(f"\u2717 Translation API error: {response.status_code}")
-                return text
+                return None
                 
         except Exception as e:
             print(f"\u2717 Translation error: {str(e)}")
-            return text
+            return None
+    
+    @staticmethod
+    def _extract_translation(result):
+        """Pull the translated string out of one of the API's response shapes."""
+        # The API returns the translated text in different formats
+        # Try to extract it
+        if isinstance(result, list) and len(result) > 0:
+            return result[0]
+        elif isinstance(result, dict):
+            # Try common keys
+            for key in ['translatedText', 'translated', 'translation', 'data', 'result']:
+                if key in result:
+                    translated = result[key]
+                    if isinstance(translated, list) and translated:
+                        return translated[0]
+                    return str(translated)
+        return str(result)
+    
+    @staticmethod
+    def _extract_batch_translations(result, expected):
+        """Pull a list of translations out of a batch response, or None if the shape is wrong."""
+        if isinstance(result, dict):
+            for key in ['translatedText', 'translated', 'translation', 'data', 'result']:
+                if key in result:
+                    result = result[key]
+                    break
+        if isinstance(result, list) and len(result) == expected and all(isinstance(r, str) for r in result):
+            return result
+        return None
+    
+    @staticmethod
+    def plan_batches(texts, max_items=None, max_bytes=None):
+        """
+        Split texts into batches bounded by item count and JSON payload size.
+        
+        Args:
+            texts (list): Texts to translate
+            max_items (int): Maximum texts per request (default: config.TRANSLATE_BATCH_SIZE)
+            max_bytes (int): Maximum encoded size of the texts per request (default: config.TRANSLATE_MAX_PAYLOAD_BYTES)
+            
+        Returns:
+            list: Lists of indexes into ``texts``; an oversized text gets a batch of its own
+        """
+        max_items = max_items or config.TRANSLATE_BATCH_SIZE
+        max_bytes = max_bytes or config.TRANSLATE_MAX_PAYLOAD_BYTES
+        batches, current, current_bytes = [], [], 0
+        for i, text in enumerate(texts):
+            size = len(json.dumps(text, ensure_ascii=False).encode('utf-8')) + 1
+            if current and (len(current) >= max_items or current_bytes + size > max_bytes):
+                batches.append(current)
+                current, current_bytes = [], 0
+            current.append(i)
+            current_bytes += size
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _post_batch(self, texts, source_lang, target_lang):
+        """Translate several texts in one request; returns None if the request or response is unusable."""
+        payload = {
+            "from": source_lang,
+            "to": target_lang,
+            "q": texts
+        }
+        try:
+            with metrics.timer('translation_call', mode='batch'):
+                response = requests.post(self.api_url, json=payload, headers=self.headers, timeout=10)
+        except Exception as e:
+            print(f"\u2717 Batch translation error: {str(e)}")
+            return None
+        if response.status_code != 200:
+            print(f"\u2717 Batch translation API error: {response.status_code}")
+            return None
+        try:
+            return self._extract_batch_translations(response.json(), len(texts))
+        except ValueError:
+            return None
+    
+    def translate_batch(self, texts, source_lang='es', target_lang='en'):
+        """
+        Translate many texts in as few API calls as the batch limits allow.
+        
+        Items from a failed or malformed batch are retried one by one, without
+        a second cache lookup, so every text gets a result.
+        
+        Args:
+            texts (list): Texts to translate
+            source_lang (str): Source language code (default: 'es' for Spanish)
+            target_lang (str): Target language code (default: 'en' for English)
+            
+        Returns:
+            list: Translations aligned with ``texts``
+        """
+        translations = [None] * len(texts)
+        if self.cache:
+            translations = [self.cache.get(t, source_lang, target_lang) for t in texts]
+        
+        # Only cache misses go over the wire
+        pending = [i for i, t in enumerate(translations) if t is None]
+        batches = self.plan_batches([texts[i] for i in pending])
+        for n, batch in enumerate(batches):
+            if n > 0:
+                time.sleep(config.TRANSLATE_BATCH_DELAY)
+            batch = [pending[j] for j in batch]
+            results = self._post_batch([texts[i] for i in batch], source_lang, target_lang)
+            if results is None:
+                continue
+            for i, translated in zip(batch, results):
+                translations[i] = translated
+                if self.cache:
+                    self.cache.put(texts[i], translated, source_lang, target_lang)
+        
+        failed = [i for i, t in enumerate(translations) if t is None]
+        if failed:
+            print(f"\u26a0 Retrying {len(failed)} item(s) individually")
+        for i in failed:
+            translations[i] = self._translate_uncached(texts[i], source_lang, target_lang)
+        return translations
     
-    def translate_articles(self, articles):
+    def translate_articles(self, articles, batch=None, include_content=False):
         """
         Translate article titles from Spanish to English.
         
         Args:
             articles (list): List of article dictionaries
+            batch (bool): Pack titles into batch requests (default: config.TRANSLATE_BATCH_MODE)
+            include_content (bool): Also translate content snippets into 'content_english'
             
         Returns:
             list: Articles with translated titles
         """
+        if batch is None:
+            batch = config.TRANSLATE_BATCH_MODE
+        if batch:
+            return self._translate_articles_batched(articles, include_content)
+        
         print(f"\n{'='*60}")
         print("TRANSLATING ARTICLE TITLES (Spanish to English)")
         print(f"{'='*60}\n")
         
         for article in articles:
-            if article['title']:
+            if self.needs_translation(article):
                 print(f"Translating Article {article['index']}...")
                 print(f"  Original (ES): {article['title']}")
                 
@@ -93,12 +230,90 @@ class RapidTranslator:
                 print(f"  Translated (EN): {translated_title}")
                 print()
                 
+                if include_content and article.get('content'):
+                    article['content_english'] = self.translate_text(article['content'][:config.TRANSLATE_CONTENT_SNIPPET])
+                
                 # Small delay to avoid rate limiting
                 time.sleep(0.5)
         
         print("\u2713 All titles translated")
+        self.report_cache()
+        return articles
+    
+    @staticmethod
+    def needs_translation(article):
+        """True if the article has a title and no translation carried over from an unchanged previous run."""
+        return bool(article['title']) and not (article.get('unchanged') and article.get('title_english'))
+    
+    def translate_article(self, article):
+        """
+        Translate one article's title in place, for use as a streaming pipeline stage.
+        
+        Args:
+            article (dict): Article dictionary
+            
+        Returns:
+            dict: The same article with 'title_english' set
+        """
+        if self.needs_translation(article):
+            article['title_english'] = self.translate_text(article['title'])
+            print(f"\u2713 Translated Article {article['index']}: {article['title_english']}")
+        return article
+    
+    def translate_article_batch(self, articles):
+        """
+        Translate the titles of a micro-batch of articles in place, for a batching pipeline stage.
+        
+        In batch mode the titles go out through translate_batch, otherwise one
+        request per title.
+        
+        Args:
+            articles (list): Article dictionaries collected by the stage
+            
+        Returns:
+            list: The same articles with 'title_english' set
+        """
+        titled = [a for a in articles if self.needs_translation(a)]
+        if config.TRANSLATE_BATCH_MODE:
+            translations = self.translate_batch([a['title'] for a in titled])
+        else:
+            translations = [self.translate_text(a['title']) for a in titled]
+        for article, translated in zip(titled, translations):
+            article['title_english'] = translated
+            print(f"\u2713 Translated Article {article['index']}: {translated}")
+        return articles
+    
+    def _translate_articles_batched(self, articles, include_content):
+        """Translate titles (and optionally content snippets) with batch requests."""
+        titled = [a for a in articles if self.needs_translation(a)]
+        texts = [a['title'] for a in titled]
+        if include_content:
+            with_content = [a for a in titled if a.get('content')]
+            texts += [a['content'][:config.TRANSLATE_CONTENT_SNIPPET] for a in with_content]
+        
+        print(f"Translating {len(texts)} text(s) in batch mode...\n")
+        translations = self.translate_batch(texts)
+        
+        for article, translated_title in zip(titled, translations):
+            article['title_english'] = translated_title
+            print(f"Article {article['index']}:")
+            print(f"  Original (ES): {article['title']}")
+            print(f"  Translated (EN): {translated_title}")
+            print()
+        if include_content:
+            for article, translated_content in zip(with_content, translations[len(titled):]):
+                article['content_english'] = translated_content
+        
+        print("\u2713 All titles translated")
+        self.report_cache()
         return articles
     
+    def report_cache(self):
+        """Print cache statistics and trim the cache to its limits."""
+        if self.cache:
+            print("\u2713 Translation cache: " + self.cache.summary())
+            self.cache.evict()
+    
     def print_translated_titles(self, articles):
         """Print translated article titles."""
         print(f"\n{'='*60}")
@@ -106,6 +321,16 @@ class RapidTranslator:
         print(f"{'='*60}\n")
         
         for article in articles:
-            print(f"Article {article['index']}:")
-            print(f"  English: {article.get('title_english', 'N/A')}")
-            print()
\ No newline at end of file
+            self.print_translated_title(article)
+    
+    @staticmethod
+    def print_translated_title(article):
+        """Print one article's translated title."""
+        print(f"Article {article['index']}:")
+        print(f"  English: {article.get('title_english', 'N/A')}")
+        print()
+    
+    def close(self):
+        """Close the translation cache."""
+        if self.cache:
+            self.cache.close()
@@ -0,0 +1,82 @@
+"""Explicit, per-phase wait policy for the Selenium scraper."""
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+import config
+from .selector_tables import ARTICLE_LIST_SELECTORS, FULL_ARTICLE_CONTENT_SELECTORS
+
+CONSENT_BUTTON = (By.ID, "didomi-notice-agree-button")
+
+class WaitPolicy:
+    """Readiness conditions for each scraping phase, bounded by a per-phase deadline.
+    
+    The driver runs with no implicit wait, so selector probes fail immediately and
+    all waiting happens here, against a condition and a budget in seconds.
+    """
+    
+    POLL_FREQUENCY = 0.2
+    
+    def __init__(self, driver, budgets=None):
+        self.driver = driver
+        self.budgets = dict(config.WAIT_BUDGETS)
+        if budgets:
+            self.budgets.update(budgets)
+    
+    def wait_for(self, phase, condition):
+        """
+        Wait until a condition is truthy within the phase budget.
+        
+        Args:
+            phase (str): Phase name used to look up the deadline budget
+            condition (callable): Called with the driver until it returns a truthy value
+            
+        Returns:
+            The condition's value, or None if the budget ran out
+        """
+        deadline = self.budgets.get(phase, config.EXPLICIT_WAIT)
+        try:
+            return WebDriverWait(self.driver, deadline, poll_frequency=self.POLL_FREQUENCY).until(condition)
+        except TimeoutException:
+            return None
+    
+    @staticmethod
+    def _any_present(selectors, with_text=False):
+        """Condition that holds once any of the selectors matches an element."""
+        combined = ", ".join(selectors)
+        
+        def condition(driver):
+            if driver.execute_script("return document.readyState") == 'loading':
+                return False
+            elements = driver.find_elements(By.CSS_SELECTOR, combined)
+            if with_text:
+                elements = [e for e in elements if e.text.strip()]
+            return elements or False
+        return condition
+    
+    def listing_ready(self):
+        """Wait until the listing page shows at least one article container."""
+        return bool(self.wait_for('listing', self._any_present(ARTICLE_LIST_SELECTORS)))
+    
+    def article_body_ready(self):
+        """Wait until an article page shows at least one non-empty body paragraph."""
+        return bool(self.wait_for('article', self._any_present(FULL_ARTICLE_CONTENT_SELECTORS, with_text=True)))
+    
+    def dismiss_consent(self):
+        """
+        Accept the cookie consent dialog if it appears within the consent budget.
+        
+        Returns:
+            bool: True if the dialog was shown and dismissed
+        """
+        button = self.wait_for('consent', EC.element_to_be_clickable(CONSENT_BUTTON))
+        if not button:
+            return False
+        try:
+            button.click()
+        except WebDriverException:
+            return False
+        self.wait_for('consent', EC.invisibility_of_element_located(CONSENT_BUTTON))
+        return True
@@ -0,0 +1,235 @@
+"""Process-wide pool of warm browsers reused by scraper runs within one process."""
+
+import multiprocessing.util
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from .drivers import create_driver
+from .metrics import metrics
+
+CLEAR_STORAGE_SCRIPT = "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+
+def reset_driver(driver):
+    """
+    Clear a browser's state so the next run starts like a fresh session.
+    
+    Extra windows are closed and cookies and web storage cleared before the
+    browser parks on about:blank with the project's timeouts restored.
+    Chromium clears every origin it visited; other browsers clear cookies and
+    storage of the page they were left on.
+    
+    Args:
+        driver (WebDriver): Browser to reset
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    driver.execute_script(CLEAR_STORAGE_SCRIPT)
+    driver.delete_all_cookies()
+    if hasattr(driver, 'execute_cdp_cmd'):
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': '*', 'storageTypes': 'all'})
+    driver.get('about:blank')
+    driver.implicitly_wait(config.IMPLICIT_WAIT)
+    driver.set_page_load_timeout(config.PAGE_LOAD_TIMEOUT)
+
+class WarmPool:
+    """Idle browsers kept alive between runs in the same process, keyed by browser and headless mode.
+    
+    ``acquire`` hands out an idle browser, one started earlier by ``prelaunch``,
+    or a newly created one. ``release`` resets the browser and parks it for the
+    next run instead of quitting it; browsers that fail the reset, have served
+    ``max_uses`` runs or do not fit in the pool are quit. Idle browsers are
+    quit when the process exits, so nothing carries over between processes;
+    one-shot callers use ``drain`` to skip the reset of a browser that would
+    only be quit at exit.
+    """
+    
+    def __init__(self, size=None, max_uses=None):
+        """
+        Args:
+            size (int): Idle browsers kept per browser/mode (default: config.WARM_POOL_SIZE, 0 when disabled)
+            max_uses (int): Runs a browser serves before it is replaced (default: config.WARM_POOL_MAX_USES)
+        """
+        self._size = size
+        self._max_uses = max_uses
+        self._lock = threading.Lock()
+        self._pid = None
+        self._reset_state()
+    
+    def _reset_state(self):
+        self._idle = {}
+        self._pending = {}
+        self._owned = {}
+        self._executor = None
+        self._draining = False
+    
+    @property
+    def size(self):
+        if self._size is not None:
+            return self._size
+        return config.WARM_POOL_SIZE if config.WARM_POOL_ENABLED else 0
+    
+    @property
+    def max_uses(self):
+        return self._max_uses if self._max_uses is not None else config.WARM_POOL_MAX_USES
+    
+    def _check_process(self):
+        """Start empty in a forked child (the browsers belong to the parent) and quit idle browsers at exit."""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._reset_state()
+        # multiprocessing's exit hook also runs in pool worker processes, which skip atexit handlers
+        multiprocessing.util.Finalize(self, self.close, exitpriority=10)
+    
+    def _launch(self, key):
+        driver = create_driver(*key)
+        with self._lock:
+            self._owned[driver] = {'key': key, 'uses': 0}
+        return driver
+    
+    def prelaunch(self, browser, headless=True, count=1):
+        """
+        Start browsers in the background so a later ``acquire`` finds them ready.
+        
+        Args:
+            browser (str): 'chrome' or 'firefox'
+            headless (bool): Run the browsers without a window
+            count (int): Browsers to start, capped at the pool size
+        
+        Returns:
+            int: Number of launches started
+        """
+        key = (browser.lower(), headless)
+        with self._lock:
+            self._check_process()
+            pending = self._pending.setdefault(key, [])
+            count = min(count, self.size - len(self._idle.get(key, [])) - len(pending))
+            if count <= 0:
+                return 0
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='warm-pool')
+            for _ in range(count):
+                pending.append(self._executor.submit(self._launch, key))
+        return count
+    
+    @staticmethod
+    def _alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    def acquire(self, browser, headless=True):
+        """
+        Borrow a browser: an idle one, a pre-launched one, or a new one.
+        
+        Args:
+            browser (str): 'chrome' or 'firefox'
+            headless (bool): Run the browser without a window
+        
+        Returns:
+            WebDriver: Browser to hand back with ``release``
+        """
+        key = (browser.lower(), headless)
+        while True:
+            with self._lock:
+                self._check_process()
+                idle, pending = self._idle.get(key), self._pending.get(key)
+                driver = idle.pop() if idle else None
+                future = pending.pop(0) if driver is None and pending else None
+            if driver is None and future is None:
+                break
+            if future is not None:
+                try:
+                    driver = future.result()
+                except Exception as e:
+                    print("\u26a0 Pre-launched " + key[0] + " failed to start: " + str(e))
+                    continue
+                metrics.inc('warm_pool', browser=key[0], outcome='prelaunched')
+                return driver
+            if self._alive(driver):
+                metrics.inc('warm_pool', browser=key[0], outcome='reused')
+                return driver
+            self.discard(driver)
+        
+        metrics.inc('warm_pool', browser=key[0], outcome='cold')
+        return self._launch(key)
+    
+    def release(self, driver):
+        """
+        Hand a browser back after a run.
+        
+        Args:
+            driver (WebDriver): Browser from ``acquire``
+        
+        Returns:
+            bool: True if the browser was kept warm, False if it was quit
+        """
+        with self._lock:
+            entry = self._owned.get(driver)
+            if entry is not None:
+                entry['uses'] += 1
+            keep = (entry is not None and not self._draining and entry['uses'] < self.max_uses
+                    and len(self._idle.get(entry['key'], [])) < self.size)
+        if keep:
+            try:
+                reset_driver(driver)
+            except Exception as e:
+                print("\u26a0 Could not reset browser for reuse: " + (str(e).strip() or type(e).__name__).splitlines()[0])
+                keep = False
+        if keep:
+            with self._lock:
+                idle = self._idle.setdefault(entry['key'], [])
+                keep = len(idle) < self.size
+                if keep:
+                    idle.append(driver)
+        if not keep:
+            self.discard(driver)
+        return keep
+    
+    def drain(self):
+        """Stop parking browsers: later releases quit them instead of resetting them for a next run."""
+        with self._lock:
+            self._check_process()
+            self._draining = True
+    
+    def discard(self, driver):
+        """Quit a browser for good instead of returning it, ignoring errors from dead sessions."""
+        with self._lock:
+            self._owned.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def idle_count(self, browser=None):
+        """Number of idle browsers, optionally for one browser only."""
+        with self._lock:
+            return sum(len(drivers) for key, drivers in self._idle.items() if browser is None or key[0] == browser.lower())
+    
+    def close(self):
+        """Quit every idle and pre-launched browser."""
+        with self._lock:
+            idle = [driver for drivers in self._idle.values() for driver in drivers]
+            pending = [future for futures in self._pending.values() for future in futures]
+            executor = self._executor
+            self._idle, self._pending, self._executor = {}, {}, None
+        for future in pending:
+            if not future.cancel():
+                try:
+                    idle.append(future.result())
+                except Exception:
+                    pass
+        for driver in idle:
+            self.discard(driver)
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+warm_pool = WarmPool()
@@ -0,0 +1,78 @@
+"""Incremental JSON and CSV result writers with atomic publish."""
+
+import csv
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+CSV_FIELDNAMES = ['index', 'title', 'title_english', 'author', 'date', 'content', 'url', 'image_url', 'image_path']
+
+class _AtomicWriter:
+    """Writes to ``<name>.part`` and renames onto the final path when finished.
+    
+    Every record is flushed as it is written, so an interrupted run leaves the
+    records produced so far in the ``.part`` file; ``abort`` keeps them under
+    ``<name>.partial``.
+    """
+    
+    def __init__(self, path, newline=None):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + '.part')
+        self.count = 0
+        self._file = open(self.tmp_path, 'w', encoding='utf-8', newline=newline)
+    
+    def _publish(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+    
+    def abort(self):
+        """Close without publishing, keeping what was written as ``<name>.partial``."""
+        if not self._file.closed:
+            self._file.flush()
+            self._file.close()
+            os.replace(self.tmp_path, self.path.with_name(self.path.name + '.partial'))
+
+class StreamingJSONWriter(_AtomicWriter):
+    """Emit the results document one article at a time, with the analysis appended last."""
+    
+    def __init__(self, path, timestamp=None):
+        super().__init__(path)
+        self._file.write('{\n  "timestamp": ' + json.dumps(timestamp or datetime.now().isoformat()) + ',\n  "articles": [')
+        self._file.flush()
+    
+    def write_article(self, article):
+        """Append one article to the 'articles' array."""
+        body = json.dumps(article, ensure_ascii=False, indent=2).replace('\n', '\n    ')
+        self._file.write((',' if self.count else '') + '\n    ' + body)
+        self._file.flush()
+        self.count += 1
+    
+    def finish(self, analysis):
+        """Close the array, append the totals and analysis, and publish the file."""
+        body = json.dumps(analysis, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+        self._file.write(('\n  ' if self.count else '') + '],\n  "total_articles": ' + str(self.count)
+                         + ',\n  "analysis": ' + body + '\n}\n')
+        self._publish()
+        return self.path
+
+class StreamingCSVWriter(_AtomicWriter):
+    """Emit one CSV row per article as it is produced."""
+    
+    def __init__(self, path, fieldnames=None):
+        super().__init__(path, newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames or CSV_FIELDNAMES)
+        self._writer.writeheader()
+    
+    def write_article(self, article):
+        """Append one article row."""
+        self._writer.writerow({k: article.get(k, '') for k in self._writer.fieldnames})
+        self._file.flush()
+        self.count += 1
+    
+    def finish(self):
+        """Publish the file."""
+        self._publish()
+        return self.path